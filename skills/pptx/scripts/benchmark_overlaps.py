@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark overlap detection on synthetic dense slides.
+
+Each synthetic slide is a grid of small cells (like the grids and table
+overlays of generated market decks), plus randomly placed text boxes and
+a few large background shapes. The sweep-line detect_overlaps() from
+inventory.py is timed against the pairwise comparison it replaced, and
+both must produce identical overlapping_shapes dictionaries (same keys,
+areas and order).
+
+Usage:
+    python benchmark_overlaps.py
+    python benchmark_overlaps.py --sizes 100 400 1600 --repeat 5 --seed 1
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from inventory import calculate_overlap, detect_overlaps
+
+
+@dataclass
+class Box:
+    """The ShapeData attributes overlap detection uses."""
+
+    shape_id: str
+    left: float
+    top: float
+    width: float
+    height: float
+    overlapping_shapes: Dict[str, float] = field(default_factory=dict)
+
+
+def synthetic_slide(n_shapes: int, seed: int) -> List[Box]:
+    """A 13.33" x 7.5" slide with about n_shapes shapes, mostly grid cells."""
+    rng = random.Random(seed)
+    boxes = []
+    cols = max(1, int((n_shapes * 0.8 * 13.33 / 7.5) ** 0.5))
+    rows = max(1, int(n_shapes * 0.8) // cols)
+    cell_w, cell_h = 12.0 / cols, 6.5 / rows
+    for r in range(rows):
+        for c in range(cols):
+            # Grid cells touch their neighbours; rounding jitter makes some overlap slightly
+            jitter = rng.choice([0.0, 0.0, 0.0, 0.03, 0.08])
+            boxes.append(Box("", 0.6 + c * cell_w, 0.8 + r * cell_h, cell_w + jitter, cell_h + jitter))
+    for _ in range(max(0, n_shapes - len(boxes) - 3)):
+        w, h = rng.uniform(0.3, 2.5), rng.uniform(0.2, 1.2)
+        boxes.append(Box("", rng.uniform(0, 13.33 - w), rng.uniform(0, 7.5 - h), w, h))
+    boxes += [Box("", 0, 0, 13.33, 1.2), Box("", 0, 6.86, 13.33, 0.64), Box("", 0.5, 0.7, 12.3, 6.6)]
+    rng.shuffle(boxes)
+    for i, box in enumerate(boxes):
+        box.shape_id = f"shape-{i}"
+    return boxes
+
+
+def detect_overlaps_pairwise(shapes: List[Box]) -> None:
+    """The previous O(n^2) implementation, kept as the reference."""
+    for i in range(len(shapes)):
+        for j in range(i + 1, len(shapes)):
+            shape1, shape2 = shapes[i], shapes[j]
+            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
+            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+            if overlaps:
+                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
+                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+
+
+def time_detector(detector, n_shapes: int, seed: int, repeat: int):
+    times, boxes = [], []
+    for _ in range(repeat):
+        boxes = synthetic_slide(n_shapes, seed)
+        start = time.perf_counter()
+        detector(boxes)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), boxes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inventory overlap detection on dense slides.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 800, 2000], help="Shapes per slide")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (median is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'shapes':>8} {'pairs':>8} {'pairwise (ms)':>14} {'sweep (ms)':>11} {'speedup':>8}")
+    mismatches = 0
+    for n_shapes in args.sizes:
+        pairwise, expected = time_detector(detect_overlaps_pairwise, n_shapes, args.seed, args.repeat)
+        sweep, actual = time_detector(detect_overlaps, n_shapes, args.seed, args.repeat)
+        same = [list(a.overlapping_shapes.items()) == list(b.overlapping_shapes.items())
+                for a, b in zip(expected, actual)]
+        mismatches += same.count(False)
+        pairs = sum(len(b.overlapping_shapes) for b in actual) // 2
+        print(f"{len(actual):>8} {pairs:>8} {pairwise * 1000:>14.1f} {sweep * 1000:>11.1f} "
+              f"{pairwise / sweep if sweep else float('inf'):>7.1f}x")
+
+    if mismatches:
+        print(f"ERROR: {mismatches} shapes differ from the pairwise result")
+        sys.exit(1)
+    print("Results identical to the pairwise comparison.")
+
+
+if __name__ == "__main__":
+    main()
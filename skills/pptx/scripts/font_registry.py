@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Process-wide registry of the installed fonts.
+
+Looking a font up by the name a presentation uses (Arial, Calibri, 微软雅黑,
+Microsoft YaHei Bold, ...) goes through one index. It maps the file name, the
+full name, the PostScript name and the family name of every face in every font
+file to (path, face index). All languages of the name table are read, so
+Chinese family names resolve directly. Faces inside .ttc collections keep
+their face index.
+
+Reading the name tables of all installed fonts is the expensive part. The
+index is therefore built once and persisted as JSON (default
+``~/.cache/pptx-skill/font_index.json``, override with ``FONT_INDEX_PATH``).
+The file is keyed by the modification times of the font directories and all
+their subdirectories. It is rebuilt only when a font is added or removed.
+Within a process the index is loaded once.
+
+``load_image_font`` keeps an LRU of loaded PIL ImageFont objects per
+(path, size, face index).
+
+Usage:
+    from font_registry import find_face, load_image_font
+
+    face = find_face(["微软雅黑", "Microsoft YaHei"])   # ("/.../msyh.ttc", 0) or None
+    font = load_image_font(face[0], 24, face[1])
+"""
+
+import json
+import os
+import platform
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+INDEX_VERSION = 1
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+DEFAULT_INDEX_PATH = Path("~/.cache/pptx-skill/font_index.json").expanduser()
+
+# Name table records indexed, with their priority when two faces claim the same name
+_NAME_IDS = {4: 1, 6: 2, 1: 3, 16: 3}  # full name, PostScript name, (typographic) family
+_FILE_NAME = 0
+_NON_REGULAR_FAMILY = 4  # family name of a bold / italic face: only if no regular face has it
+
+Face = Tuple[str, int]  # (font file path, face index within a collection)
+
+_lock = threading.Lock()
+_index: Optional[Dict[str, Face]] = None
+
+
+def font_dirs() -> List[Path]:
+    """System and user font directories for this platform."""
+    system = platform.system()
+    if system == "Darwin":
+        dirs = ["/System/Library/Fonts/", "/Library/Fonts/", "~/Library/Fonts/"]
+    elif system == "Windows":
+        dirs = [os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+                os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts")]
+    else:
+        dirs = ["/usr/share/fonts/", "/usr/local/share/fonts/", "~/.fonts/", "~/.local/share/fonts/"]
+    return [Path(d).expanduser() for d in dirs]
+
+
+def normalize(name: str) -> str:
+    """Lookup key of a font name: case, spaces, dashes and underscores ignored."""
+    return name.lower().replace(" ", "").replace("-", "").replace("_", "")
+
+
+def _scan(dirs: Iterable[Path]) -> Tuple[Dict[str, int], List[str]]:
+    """(directory -> mtime_ns, font files) under dirs."""
+    mtimes: Dict[str, int] = {}
+    files: List[str] = []
+    for font_dir in dirs:
+        if not font_dir.is_dir():
+            continue
+        for root, _, names in os.walk(font_dir):
+            try:
+                mtimes[root] = os.stat(root).st_mtime_ns
+            except OSError:
+                continue
+            files.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith(FONT_EXTENSIONS))
+    return mtimes, files
+
+
+def _face_names(path: str) -> List[Tuple[int, List[Tuple[str, int]]]]:
+    """[(face index, [(name, priority), ...])] from the name tables (empty without fontTools)."""
+    try:
+        from fontTools.ttLib import TTCollection, TTFont
+    except ImportError:
+        return []
+    try:
+        if path.lower().endswith(".ttc"):
+            fonts = list(TTCollection(path, lazy=True).fonts)
+        else:
+            fonts = [TTFont(path, lazy=True)]
+    except Exception:
+        return []
+    faces = []
+    for face_index, font in enumerate(fonts):
+        try:
+            records = font["name"].names
+            subfamily = (font["name"].getDebugName(2) or "").lower()
+        except Exception:
+            continue
+        regular = subfamily in ("regular", "normal", "book", "roman", "")
+        names = []
+        for record in records:
+            priority = _NAME_IDS.get(record.nameID)
+            if priority is None:
+                continue
+            if priority == 3 and not regular:
+                priority = _NON_REGULAR_FAMILY
+            try:
+                names.append((record.toUnicode(), priority))
+            except Exception:
+                continue
+        faces.append((face_index, names))
+    if fonts:
+        fonts[0].close()  # the faces of a collection share one file
+    return faces
+
+
+def build_index(files: Iterable[str]) -> Dict[str, Face]:
+    """Lookup key -> (path, face index) for the given font files."""
+    best: Dict[str, Tuple[int, str, int]] = {}
+
+    def add(name: str, priority: int, path: str, face_index: int) -> None:
+        key = normalize(name)
+        if key and (key not in best or priority < best[key][0]):
+            best[key] = (priority, path, face_index)
+
+    for path in files:
+        add(os.path.splitext(os.path.basename(path))[0], _FILE_NAME, path, 0)
+        for face_index, names in _face_names(path):
+            for name, priority in names:
+                add(name, priority, path, face_index)
+    return {key: (path, face_index) for key, (_, path, face_index) in best.items()}
+
+
+def _index_path() -> Path:
+    return Path(os.environ.get("FONT_INDEX_PATH") or DEFAULT_INDEX_PATH)
+
+
+def font_index() -> Dict[str, Face]:
+    """The registry, loaded from the persisted index when the font directories are unchanged."""
+    global _index
+    with _lock:
+        if _index is not None:
+            return _index
+        mtimes, files = _scan(font_dirs())
+        index_path = _index_path()
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("version") == INDEX_VERSION and stored.get("dirs") == mtimes:
+                _index = {key: (path, face_index) for key, (path, face_index) in stored["fonts"].items()}
+                return _index
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        _index = build_index(files)
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "dirs": mtimes, "fonts": _index}, f, ensure_ascii=False)
+            os.replace(tmp, index_path)
+        except OSError:
+            pass  # read-only home: the index is rebuilt per process
+        return _index
+
+
+def find_face(candidates: Iterable[str], fuzzy: bool = True) -> Optional[Face]:
+    """First face whose name matches a candidate exactly, then one whose name contains it.
+
+    Args:
+        candidates: Font names to try in order (e.g. ['微软雅黑', 'Microsoft YaHei'])
+        fuzzy: Also accept names that merely contain a candidate
+
+    Returns:
+        (path, face index), or None if no installed font matches
+    """
+    index = font_index()
+    keys = [normalize(c) for c in candidates if c]
+    for key in keys:
+        if key in index:
+            return index[key]
+    if fuzzy:
+        for key in keys:
+            for name in sorted(index):
+                if key in name:
+                    return index[name]
+    return None
+
+
+@lru_cache(maxsize=128)
+def load_image_font(path: str, size: int, index: int = 0):
+    """PIL ImageFont for (path, size, face index), loaded once per process."""
+    from PIL import ImageFont
+
+    return ImageFont.truetype(path, size=size, index=index)
+
+
+def reset() -> None:
+    """Forget the in-process index (the next lookup reloads or rebuilds it)."""
+    global _index
+    with _lock:
+        _index = None
+    load_image_font.cache_clear()
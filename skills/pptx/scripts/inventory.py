@@ -23,18 +23,19 @@ Usage:
 """
 
 import argparse
+import heapq
 import json
-import platform
 import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
 
+from text_metrics import find_font, get_measurer
+
 # Type aliases for cleaner signatures
 JsonValue = Union[str, int, float, bool, None]
 ParagraphDict = Dict[str, JsonValue]
@@ -60,6 +61,12 @@ Examples:
   python inventory.py presentation.pptx inventory.json --issues-only
     Extracts only text shapes that have overflow or overlap issues
 
+  python inventory.py presentation.pptx inventory.json --workers 4
+    Slides that changed since the last run are processed in 4 processes
+
+  python inventory.py presentation.pptx inventory.json --engine pptx
+    Same output from python-pptx objects, without the slide cache
+
 The output JSON includes:
   - All text content organized by slide and shape
   - Correct absolute positions for shapes in groups
@@ -76,6 +83,23 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "--engine",
+        choices=["pptx", "lxml"],
+        default="lxml",
+        help="lxml: read-only XML engine with a per-slide cache (default); pptx: python-pptx objects, same output",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for the slides (lxml engine only)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute every slide instead of reusing cached slides (lxml engine only)",
+    )
 
     args = parser.parse_args()
 
@@ -94,7 +118,17 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
+        if args.engine == "lxml":
+            from inventory_fast import extract_text_inventory_fast
+
+            inventory = extract_text_inventory_fast(
+                input_path,
+                issues_only=args.issues_only,
+                workers=args.workers,
+                use_cache=not args.no_cache,
+            )
+        else:
+            inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
 
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -286,61 +320,7 @@ class ShapeData:
         Returns:
             Path to the font file, or None if not found
         """
-        system = platform.system()
-
-        # Common font file variations to try
-        font_variations = [
-            font_name,
-            font_name.lower(),
-            font_name.replace(" ", ""),
-            font_name.replace(" ", "-"),
-        ]
-
-        # Define font directories and extensions by platform
-        if system == "Darwin":  # macOS
-            font_dirs = [
-                "/System/Library/Fonts/",
-                "/Library/Fonts/",
-                "~/Library/Fonts/",
-            ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
-        else:  # Linux
-            font_dirs = [
-                "/usr/share/fonts/truetype/",
-                "/usr/local/share/fonts/",
-                "~/.fonts/",
-            ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
-
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
-
-            # First try exact matches
-            for variant in font_variations:
-                for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
-
-            # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
-
-        return None
+        return find_font(font_name)
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -531,36 +511,8 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
-        if not line:
-            return [""]
-
-        # Use textlength for efficient width calculation
-        if draw.textlength(line, font=font) <= max_width_px:
-            return [line]
-
-        # Need to wrap - split into words
-        wrapped = []
-        words = line.split(" ")
-        current_line = ""
-
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
-                current_line = test_line
-            else:
-                if current_line:
-                    wrapped.append(current_line)
-                current_line = word
-
-        if current_line:
-            wrapped.append(current_line)
-
-        return wrapped
-
     def _estimate_frame_overflow(self) -> None:
-        """Estimate if text overflows the shape bounds using PIL text measurement."""
+        """Estimate if text overflows the shape bounds using font advance tables (text_metrics)."""
         if not self.shape or not hasattr(self.shape, "text_frame"):
             return
 
@@ -568,14 +520,29 @@ class ShapeData:
         if not text_frame or not text_frame.paragraphs:
             return
 
+        paragraphs = [
+            (para_idx, paragraph.text, ParagraphData(paragraph))
+            for para_idx, paragraph in enumerate(text_frame.paragraphs)
+            if paragraph.text.strip()
+        ]
+        self._estimate_overflow_of(text_frame, paragraphs)
+
+    def _estimate_overflow_of(
+        self, text_frame: Any, paragraphs: List[Tuple[int, str, ParagraphData]]
+    ) -> None:
+        """Set frame_overflow_bottom from the wrapped height of the non-empty paragraphs.
+
+        Args:
+            text_frame: Object with the text frame margin_* attributes (EMUs)
+            paragraphs: (index in the text frame, raw text, ParagraphData) per non-empty paragraph
+        """
         # Get usable dimensions after accounting for margins
         usable_width_px, usable_height_px = self._get_usable_dimensions(text_frame)
         if usable_width_px <= 0 or usable_height_px <= 0:
             return
 
-        # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
+        # Text widths are measured in points
+        usable_width_pt = usable_width_px * 72 / 96
 
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
@@ -583,31 +550,17 @@ class ShapeData:
         # Calculate total height of all paragraphs
         total_height_px = 0
 
-        for para_idx, paragraph in enumerate(text_frame.paragraphs):
-            if not paragraph.text.strip():
-                continue
-
-            para_data = ParagraphData(paragraph)
-
+        for para_idx, text, para_data in paragraphs:
             # Load font for this paragraph
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
 
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            measurer = get_measurer(font_name, font_size)
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
-            for line in paragraph.text.split("\n"):
-                wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
-                all_wrapped_lines.extend(wrapped)
+            for line in text.split("\n"):
+                all_wrapped_lines.extend(measurer.wrap(line, usable_width_pt))
 
             if all_wrapped_lines:
                 # Calculate line height
@@ -879,36 +832,56 @@ def calculate_overlap(
     return False, 0
 
 
-def detect_overlaps(shapes: List[ShapeData]) -> None:
+def detect_overlaps(shapes: List[ShapeData], tolerance: float = 0.05) -> None:
     """Detect overlapping shapes and update their overlapping_shapes dictionaries.
 
     This function requires each ShapeData to have its shape_id already set.
     It modifies the shapes in-place, adding shape IDs with overlap areas in square inches.
 
+    Shapes are swept left to right; only shapes whose horizontal extent still
+    reaches past the current left edge (by more than the tolerance) are compared,
+    so dense slides cost O(n log n + k * active) instead of O(n^2). Each pair
+    found is checked with calculate_overlap, and the dictionaries are filled in
+    the same order as a pairwise comparison would.
+
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
+        tolerance: Minimum overlap in inches on both axes (default: 0.05")
     """
     n = len(shapes)
-
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
-
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
-
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
-
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
-
-            if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+    if n < 2:
+        return
+
+    # Ensure shape IDs are set
+    for i, shape in enumerate(shapes):
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
+
+    rects = [(s.left, s.top, s.width, s.height) for s in shapes]
+    order = sorted(range(n), key=lambda i: rects[i][0])
+
+    pairs = []
+    active: Dict[int, float] = {}  # index -> right edge
+    ends: List[Tuple[float, int]] = []  # min-heap of (right edge, index)
+    for j in order:
+        left, top, width, height = rects[j]
+        # Drop shapes that end before this one starts (plus tolerance)
+        while ends and ends[0][0] - left <= tolerance:
+            active.pop(heapq.heappop(ends)[1], None)
+        bottom = top + height
+        for i in active:
+            other_top = rects[i][1]
+            if other_top < bottom and other_top + rects[i][3] > top:
+                overlaps, overlap_area = calculate_overlap(rects[min(i, j)], rects[max(i, j)], tolerance)
+                if overlaps:
+                    pairs.append((min(i, j), max(i, j), overlap_area))
+        right = left + width
+        active[j] = right
+        heapq.heappush(ends, (right, j))
+
+    # Same insertion order as comparing every pair (i < j) in list order
+    for i, j, overlap_area in sorted(pairs):
+        shapes[i].overlapping_shapes[shapes[j].shape_id] = overlap_area
+        shapes[j].overlapping_shapes[shapes[i].shape_id] = overlap_area
 
 
 def extract_text_inventory(
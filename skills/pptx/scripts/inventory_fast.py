@@ -0,0 +1,815 @@
+#!/usr/bin/env python3
+"""
+Read-only text inventory engine working on the slide XML directly.
+
+extract_text_inventory() in inventory.py walks every slide through
+python-pptx proxies. Reading run colors through those proxies also modifies
+the tree: it adds empty <a:solidFill/> elements. This module produces the same
+inventory from the package parts with lxml and never modifies the file:
+
+- The package is read with zipfile; each slide, layout and master part is
+  parsed once.
+- Placeholder geometry inherited from layouts and masters, the layout default
+  font sizes and the master title/body text sizes are resolved once per
+  layout. They are not resolved again for every shape.
+- Slides are independent work units, so they can be processed in parallel
+  worker processes (--workers).
+- Many decks (a template library) can be inventoried in one run. Each deck is
+  one work unit, and its JSON is written next to the others.
+- Slide results are cached. The key is a hash of the slide XML, its layout
+  and master parts, the slide size, the installed fonts and the source of the
+  measuring modules (this file, inventory.py, text_metrics.py and
+  font_registry.py), so editing them invalidates the cache. Re-inventorying
+  a deck after editing two slides recomputes only those two. The cache is
+  kept in memory and under ``~/.cache/pptx-skill/inventory``; override the
+  location with ``INVENTORY_CACHE_DIR`` or disable it with
+  ``INVENTORY_CACHE=off``.
+
+The result uses the ShapeData / ParagraphData serialization from inventory.py,
+so save_inventory() writes the same JSON as the python-pptx engine. Shapes
+carry no python-pptx object; bind_shapes() attaches them when a caller
+edits the presentation (replace.py).
+
+Usage:
+    python inventory_fast.py input.pptx output.json [--workers 4]
+    python inventory_fast.py templates/ inventories/ [--workers 8]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import posixpath
+import sys
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from lxml import etree
+
+from font_registry import font_index
+from inventory import (
+    InventoryData,
+    ParagraphData,
+    ShapeData,
+    detect_overlaps,
+    save_inventory,
+    sort_shapes_by_position,
+)
+
+# Bump when the cache entry format changes (code changes are covered by SOURCE_MODULES)
+CACHE_VERSION = 1
+# Modules whose code determines the cached ShapeData (their source is part of every key)
+SOURCE_MODULES = ("inventory_fast.py", "inventory.py", "text_metrics.py", "font_registry.py")
+DEFAULT_CACHE_DIR = Path("~/.cache/pptx-skill/inventory").expanduser()
+MEMORY_CACHE_SLIDES = 4096
+
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+A = "{%s}" % NS["a"]
+P = "{%s}" % NS["p"]
+R_ID = "{%s}id" % NS["r"]
+
+RT_SLIDE_LAYOUT = "/slideLayout"
+RT_SLIDE_MASTER = "/slideMaster"
+
+# Shape elements of a shape tree, as python-pptx iterates them
+SHAPE_TAGS = {P + t for t in ("sp", "grpSp", "graphicFrame", "cxnSp", "pic", "contentPart")}
+
+# ST_PlaceholderType -> PP_PLACEHOLDER member name
+PLACEHOLDER_TYPES = {
+    "clipArt": "BITMAP", "body": "BODY", "ctrTitle": "CENTER_TITLE", "chart": "CHART",
+    "dt": "DATE", "ftr": "FOOTER", "hdr": "HEADER", "media": "MEDIA_CLIP", "obj": "OBJECT",
+    "dgm": "ORG_CHART", "pic": "PICTURE", "sldImg": "SLIDE_IMAGE", "sldNum": "SLIDE_NUMBER",
+    "subTitle": "SUBTITLE", "tbl": "TABLE", "title": "TITLE",
+}
+# Layout placeholder type -> master placeholder type it inherits its position from
+MASTER_PLACEHOLDER_TYPES = {
+    "body": "body", "chart": "body", "clipArt": "body", "ctrTitle": "title", "dgm": "body",
+    "dt": "dt", "ftr": "ftr", "media": "body", "obj": "body", "pic": "body", "sldNum": "sldNum",
+    "subTitle": "body", "tbl": "body", "title": "title",
+}
+ALIGNMENTS = {"ctr": "CENTER", "r": "RIGHT", "just": "JUSTIFY"}
+# ST_TextUnderlineType -> MSO_UNDERLINE value ("sng" and "none" are True / False)
+UNDERLINES = {
+    "words": 1, "dbl": 3, "heavy": 4, "dotted": 5, "dottedHeavy": 6, "dash": 7, "dashHeavy": 8,
+    "dashLong": 9, "dashLongHeavy": 10, "dotDash": 11, "dotDashHeavy": 12, "dotDotDash": 13,
+    "dotDotDashHeavy": 14, "wavy": 15, "wavyHeavy": 16, "wavyDbl": 17,
+}
+# ST_SchemeColorVal -> MSO_THEME_COLOR member name
+THEME_COLORS = {
+    "accent1": "ACCENT_1", "accent2": "ACCENT_2", "accent3": "ACCENT_3", "accent4": "ACCENT_4",
+    "accent5": "ACCENT_5", "accent6": "ACCENT_6", "bg1": "BACKGROUND_1", "bg2": "BACKGROUND_2",
+    "dk1": "DARK_1", "dk2": "DARK_2", "folHlink": "FOLLOWED_HYPERLINK", "hlink": "HYPERLINK",
+    "lt1": "LIGHT_1", "lt2": "LIGHT_2", "tx1": "TEXT_1", "tx2": "TEXT_2",
+}
+FILL_TAGS = {A + t for t in ("noFill", "solidFill", "gradFill", "blipFill", "pattFill", "grpFill")}
+UNIVERSAL_UNITS = {"cm": 360000, "in": 914400, "mm": 36000, "pc": 152400, "pi": 152400, "pt": 12700}
+
+Geometry = Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]  # left, top, width, height
+
+
+class BodyMargins(NamedTuple):
+    """Text frame insets (EMUs) in the shape of python-pptx's TextFrame margin_* properties."""
+
+    margin_left: int
+    margin_right: int
+    margin_top: int
+    margin_bottom: int
+
+
+class LayoutContext(NamedTuple):
+    """What shapes on slides using one layout inherit, resolved once per layout."""
+
+    placeholder_geometry: Dict[int, Geometry]  # layout placeholder idx -> effective geometry
+    default_font_sizes: Dict[str, Optional[float]]  # placeholder type -> first defRPr size
+    master_font_sizes: Dict[str, int]  # "titleStyle" / "bodyStyle" -> size (pt)
+    slide_width: Optional[int]
+    slide_height: Optional[int]
+
+
+def _emu(value: Optional[str]) -> Optional[int]:
+    """ST_Coordinate value (EMUs, or a universal measure such as '0.1in') as EMUs."""
+    if value is None:
+        return None
+    unit = value[-2:]
+    if unit in UNIVERSAL_UNITS:
+        return int(float(value[:-2]) * UNIVERSAL_UNITS[unit])
+    return int(value)
+
+
+def _centipoints_pt(value: str) -> float:
+    """Centipoints attribute as points, rounded the way python-pptx's Length does."""
+    return int(int(value) * 127) / 12700.0
+
+
+def _xml_bool(value: Optional[str]) -> Optional[bool]:
+    return None if value is None else value in ("1", "true")
+
+
+def _placeholder(shape: Any) -> Optional[Any]:
+    """The p:ph element of a shape element, or None if it is not a placeholder."""
+    if len(shape) == 0:
+        return None
+    nv_pr = shape[0].find(P + "nvPr")
+    return None if nv_pr is None else nv_pr.find(P + "ph")
+
+
+def _geometry(shape: Any) -> Geometry:
+    """(left, top, width, height) set directly on a shape element; None where not set."""
+    properties = shape.find(P + ("grpSpPr" if shape.tag == P + "grpSp" else "spPr"))
+    xfrm = properties.find(A + "xfrm") if properties is not None else None
+    if xfrm is None:
+        return None, None, None, None
+    off, ext = xfrm.find(A + "off"), xfrm.find(A + "ext")
+    left, top = (_emu(off.get("x")), _emu(off.get("y"))) if off is not None else (None, None)
+    width, height = (_emu(ext.get("cx")), _emu(ext.get("cy"))) if ext is not None else (None, None)
+    return left, top, width, height
+
+
+def _inherit(geometry: Geometry, base: Optional[Geometry]) -> Geometry:
+    if base is None:
+        return geometry
+    return tuple(value if value is not None else inherited for value, inherited in zip(geometry, base))  # type: ignore
+
+
+class _Package:
+    """Read-only access to the parts of a .pptx package."""
+
+    def __init__(self, path: Path):
+        self.zip = zipfile.ZipFile(path)
+        self._xml: Dict[str, Any] = {}
+
+    def close(self) -> None:
+        self.zip.close()
+
+    def read(self, part: str) -> bytes:
+        return self.zip.read(part)
+
+    def xml(self, part: str) -> Any:
+        if part not in self._xml:
+            self._xml[part] = etree.fromstring(self.read(part))
+        return self._xml[part]
+
+    def rels(self, part: str) -> Dict[str, Tuple[str, str]]:
+        """rId -> (relationship type, target part name) of a part."""
+        directory, name = posixpath.split(part)
+        rels_part = posixpath.join(directory, "_rels", name + ".rels")
+        try:
+            root = self.xml(rels_part)
+        except KeyError:
+            return {}
+        rels = {}
+        for rel in root.iter("{%s}Relationship" % NS["rel"]):
+            if rel.get("TargetMode") == "External":
+                continue
+            target = rel.get("Target")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(directory, target))
+            rels[rel.get("Id")] = (rel.get("Type"), target)
+        return rels
+
+    def related(self, part: str, rel_type: str) -> Optional[str]:
+        for rtype, target in self.rels(part).values():
+            if rtype.endswith(rel_type):
+                return target
+        return None
+
+
+def _master_font_sizes(master: Any) -> Dict[str, int]:
+    """First sz in the master's titleStyle and bodyStyle (14 pt when absent)."""
+    sizes = {}
+    for style_name in ("titleStyle", "bodyStyle"):
+        sizes[style_name] = 14
+        style = next(master.iter(P + style_name), None)
+        if style is None:
+            continue
+        for elem in style.iter():
+            if "sz" in elem.attrib:
+                sizes[style_name] = int(elem.attrib["sz"]) // 100
+                break
+    return sizes
+
+
+def layout_context(layout: Any, master: Optional[Any], slide_size: Tuple[Optional[int], Optional[int]]) -> LayoutContext:
+    """Placeholder geometry and default font sizes of a slide layout and its master.
+
+    Args:
+        layout: Root element of the slide layout XML
+        master: Root element of the slide master XML, or None
+        slide_size: (width, height) of the slides in EMU
+
+    Returns:
+        LayoutContext shared by all slides using the layout
+    """
+    master_geometry: Dict[str, Geometry] = {}
+    if master is not None:
+        for shape in _placeholder_shapes(master):
+            master_geometry.setdefault(_placeholder(shape).get("type", "obj"), _geometry(shape))
+
+    placeholder_geometry: Dict[int, Geometry] = {}
+    default_font_sizes: Dict[str, Optional[float]] = {}
+    for shape in _placeholder_shapes(layout):
+        ph = _placeholder(shape)
+        ph_type = ph.get("type", "obj")
+        base = master_geometry.get(MASTER_PLACEHOLDER_TYPES.get(ph_type, ""))
+        placeholder_geometry.setdefault(int(ph.get("idx", "0")), _inherit(_geometry(shape), base))
+        if ph_type not in default_font_sizes:
+            default_font_sizes[ph_type] = next(
+                (float(elem.get("sz")) / 100.0 for elem in shape.iter(A + "defRPr") if elem.get("sz")), None
+            )
+
+    return LayoutContext(
+        placeholder_geometry,
+        default_font_sizes,
+        _master_font_sizes(master) if master is not None else {"titleStyle": 14, "bodyStyle": 14},
+        *slide_size,
+    )
+
+
+def _placeholder_shapes(root: Any) -> List[Any]:
+    """Placeholder shape elements directly in a part's shape tree, in document order."""
+    sp_tree = root.find(f"{P}cSld/{P}spTree")
+    if sp_tree is None:
+        return []
+    return [shape for shape in sp_tree if shape.tag in SHAPE_TAGS and _placeholder(shape) is not None]
+
+
+def _paragraph_text(p: Any) -> str:
+    """Paragraph text the way python-pptx reports it (line breaks as vertical tabs)."""
+    parts = []
+    for child in p:
+        if child.tag == A + "br":
+            parts.append("\v")
+        elif child.tag in (A + "r", A + "fld"):
+            t = child.find(A + "t")
+            parts.append((t.text or "") if t is not None else "")
+    return "".join(parts)
+
+
+class XmlParagraphData(ParagraphData):
+    """ParagraphData read from an a:p element."""
+
+    def __init__(self, p: Any, text: str):
+        """Initialize from an a:p element and its text (see _paragraph_text)."""
+        self.text = text.strip()
+        self.bullet = False
+        self.level = None
+        self.alignment = None
+        self.space_before = None
+        self.space_after = None
+        self.font_name = None
+        self.font_size = None
+        self.bold = None
+        self.italic = None
+        self.underline = None
+        self.color = None
+        self.theme_color = None
+        self.line_spacing = None
+
+        pPr = p.find(A + "pPr")
+        if pPr is not None:
+            if pPr.find(A + "buChar") is not None or pPr.find(A + "buAutoNum") is not None:
+                self.bullet = True
+                self.level = int(pPr.get("lvl", "0"))
+            self.alignment = ALIGNMENTS.get(pPr.get("algn"))
+            for attr, tag in (("space_before", "spcBef"), ("space_after", "spcAft")):
+                spc_pts = pPr.find(f"{A}{tag}/{A}spcPts")
+                if spc_pts is not None and int(spc_pts.get("val")):
+                    setattr(self, attr, _centipoints_pt(spc_pts.get("val")))
+
+        run = p.find(A + "r")
+        rPr = run.find(A + "rPr") if run is not None else None
+        if rPr is not None:
+            latin = rPr.find(A + "latin")
+            if latin is not None and latin.get("typeface"):
+                self.font_name = latin.get("typeface")
+            if rPr.get("sz"):
+                self.font_size = _centipoints_pt(rPr.get("sz"))
+            self.bold = _xml_bool(rPr.get("b"))
+            self.italic = _xml_bool(rPr.get("i"))
+            underline = rPr.get("u")
+            if underline is not None:
+                self.underline = {"sng": True, "none": False}.get(underline, UNDERLINES.get(underline))
+            self._read_color(rPr)
+
+        lnSpc = pPr.find(A + "lnSpc") if pPr is not None else None
+        if lnSpc is not None:
+            spc_pts, spc_pct = lnSpc.find(A + "spcPts"), lnSpc.find(A + "spcPct")
+            if spc_pts is not None:
+                self.line_spacing = round(_centipoints_pt(spc_pts.get("val")), 2)
+            elif spc_pct is not None:
+                val = spc_pct.get("val")
+                lines = float(val[:-1]) / 100.0 if val.endswith("%") else int(val) / 100000.0
+                font_size = self.font_size if self.font_size else 12.0
+                self.line_spacing = round(lines * font_size, 2)
+
+    def _read_color(self, rPr: Any) -> None:
+        """RGB or theme color of a solid run fill (other fills report no color)."""
+        fill = next((child for child in rPr if child.tag in FILL_TAGS), None)
+        if fill is None or fill.tag != A + "solidFill" or len(fill) == 0:
+            return
+        color = fill[0]
+        if color.tag == A + "srgbClr":
+            self.color = color.get("val", "").upper()
+        elif color.tag == A + "schemeClr":
+            self.theme_color = THEME_COLORS.get(color.get("val"))
+
+
+class XmlShapeData(ShapeData):
+    """ShapeData read from a p:sp element, with layout information from a LayoutContext."""
+
+    def __init__(
+        self,
+        sp: Any,
+        paragraphs: List[Tuple[str, Any]],
+        geometry: Geometry,
+        placeholder_type: Optional[str],
+        context: LayoutContext,
+        element_path: Tuple[int, ...],
+    ):
+        """Initialize from a shape element.
+
+        Args:
+            sp: The p:sp element
+            paragraphs: (text, a:p element) of every paragraph of its text body
+            geometry: Absolute (left, top) and (width, height) in EMUs
+            placeholder_type: ST_PlaceholderType of a placeholder shape, else None
+            context: Inherited values of the slide's layout
+            element_path: Child indices leading from p:spTree to the element (through groups)
+        """
+        self.shape = None
+        self.shape_id = ""
+        self.element_path = element_path
+        self.slide_width_emu = context.slide_width
+        self.slide_height_emu = context.slide_height
+
+        self.placeholder_type = None
+        self.default_font_size = None
+        self._master_font_size = context.master_font_sizes["bodyStyle"]
+        if placeholder_type in PLACEHOLDER_TYPES:
+            self.placeholder_type = PLACEHOLDER_TYPES[placeholder_type]
+            self.default_font_size = context.default_font_sizes.get(placeholder_type)
+            if "TITLE" in self.placeholder_type:
+                self._master_font_size = context.master_font_sizes["titleStyle"]
+
+        left_emu, top_emu, width_emu, height_emu = (value or 0 for value in geometry)
+        self.left = round(self.emu_to_inches(left_emu), 2)
+        self.top = round(self.emu_to_inches(top_emu), 2)
+        self.width = round(self.emu_to_inches(width_emu), 2)
+        self.height = round(self.emu_to_inches(height_emu), 2)
+        self.left_emu, self.top_emu = left_emu, top_emu
+        self.width_emu, self.height_emu = width_emu, height_emu
+
+        self.frame_overflow_bottom = None
+        self.slide_overflow_right = None
+        self.slide_overflow_bottom = None
+        self.overlapping_shapes = {}
+        self.warnings = []
+
+        items = [
+            (para_idx, text, XmlParagraphData(p, text))
+            for para_idx, (text, p) in enumerate(paragraphs)
+            if text.strip()
+        ]
+        self._paragraphs = [para_data for _, _, para_data in items]
+        if paragraphs:
+            self._estimate_overflow_of(_body_margins(sp), items)
+        self._calculate_slide_overflow()
+        self._detect_bullet_issues_in([text for text, _ in paragraphs])
+
+    @property
+    def paragraphs(self) -> List[ParagraphData]:
+        return self._paragraphs
+
+    def _get_default_font_size(self) -> int:
+        return self._master_font_size
+
+    def _detect_bullet_issues_in(self, texts: List[str]) -> None:
+        bullet_symbols = ["•", "●", "○"]
+        for text in texts:
+            text = text.strip()
+            if text and any(text.startswith(symbol + " ") for symbol in bullet_symbols):
+                self.warnings.append("manual_bullet_symbol: use proper bullet formatting")
+                break
+
+
+def _body_margins(sp: Any) -> BodyMargins:
+    """Insets of a shape's a:bodyPr, with the OOXML defaults (0.1" sides, 0.05" top and bottom)."""
+    body_pr = sp.find(f"{P}txBody/{A}bodyPr")
+    insets = []
+    for name, default in (("lIns", 91440), ("rIns", 91440), ("tIns", 45720), ("bIns", 45720)):
+        value = body_pr.get(name) if body_pr is not None else None
+        insets.append(default if value is None else _emu(value))
+    return BodyMargins(*insets)
+
+
+def _collect_shapes(
+    container: Any,
+    context: LayoutContext,
+    parent_left: int = 0,
+    parent_top: int = 0,
+    path: Tuple[int, ...] = (),
+) -> List[XmlShapeData]:
+    """Text shapes of a shape tree or group, with absolute positions (see collect_shapes_with_absolute_positions)."""
+    shapes = []
+    for index, shape in enumerate(container):
+        if shape.tag not in SHAPE_TAGS:
+            continue
+        if shape.tag == P + "grpSp":
+            left, top, _, _ = _geometry(shape)
+            shapes.extend(_collect_shapes(shape, context, parent_left + (left or 0),
+                                          parent_top + (top or 0), path + (index,)))
+            continue
+        if shape.tag != P + "sp":
+            continue
+
+        geometry = _geometry(shape)
+        ph = _placeholder(shape)
+        if ph is not None and not path:
+            # Slide placeholders inherit unset position and size from their layout placeholder
+            geometry = _inherit(geometry, context.placeholder_geometry.get(int(ph.get("idx", "0"))))
+        left, top, width, height = geometry
+        absolute = (parent_left + (left or 0), parent_top + (top or 0), width, height)
+        shape_data = measure_shape(shape, absolute, context, path + (index,))
+        if shape_data is not None:
+            shapes.append(shape_data)
+    return shapes
+
+
+def measure_shape(
+    sp: Any, geometry: Geometry, context: LayoutContext, element_path: Tuple[int, ...] = ()
+) -> Optional[XmlShapeData]:
+    """Inventory entry of one p:sp element from its current text, without touching the element.
+
+    Args:
+        sp: The p:sp element (from a parsed slide or a python-pptx shape's _element)
+        geometry: Absolute (left, top, width, height) of the shape in EMU
+        context: LayoutContext of the slide's layout
+        element_path: Position of the shape in the slide's shape tree
+
+    Returns:
+        XmlShapeData, or None if the shape has no meaningful text (as the inventory skips it)
+    """
+    tx_body = sp.find(P + "txBody")
+    if tx_body is None:
+        return None
+    paragraphs = [(_paragraph_text(p), p) for p in tx_body.findall(A + "p")]
+    text = "\n".join(t for t, _ in paragraphs).strip()
+    if not text:
+        return None
+
+    ph = _placeholder(sp)
+    ph_type = ph.get("type", "obj") if ph is not None else None
+    if ph_type == "sldNum" or (ph_type == "ftr" and text.isdigit()):
+        return None
+    return XmlShapeData(sp, paragraphs, geometry, ph_type, context, element_path)
+
+
+def inventory_slide(slide_xml: bytes, context: LayoutContext, issues_only: bool = False) -> List[XmlShapeData]:
+    """Sorted text shapes of one slide with stable IDs and overlaps (the unit of parallel work)."""
+    root = etree.fromstring(slide_xml)
+    sp_tree = root.find(f"{P}cSld/{P}spTree")
+    shapes = _collect_shapes(sp_tree, context) if sp_tree is not None else []
+    shapes = sort_shapes_by_position(shapes)
+    for idx, shape_data in enumerate(shapes):
+        shape_data.shape_id = f"shape-{idx}"
+    if len(shapes) > 1:
+        detect_overlaps(shapes)
+    if issues_only:
+        shapes = [sd for sd in shapes if sd.has_any_issues]
+    return shapes
+
+
+def _slide_job(job: Tuple[str, bytes, LayoutContext, bool]) -> List[XmlShapeData]:
+    return inventory_slide(*job[1:])
+
+
+def cache_dir() -> Optional[Path]:
+    """Directory of the on-disk slide cache, or None when caching is disabled."""
+    if os.environ.get("INVENTORY_CACHE", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    return Path(os.environ.get("INVENTORY_CACHE_DIR") or DEFAULT_CACHE_DIR)
+
+
+_memory_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_cache_lock = threading.Lock()
+_environment: Optional[str] = None
+cache_stats = {"hits": 0, "misses": 0}  # slides reused / computed in this process
+
+
+def _environment_digest() -> str:
+    """What cached results depend on besides the parts: cache version, measuring code and installed fonts."""
+    global _environment
+    if _environment is None:
+        digest = hashlib.sha256(f"{CACHE_VERSION}|".encode("utf-8"))
+        for module in SOURCE_MODULES:
+            digest.update(module.encode("utf-8"))
+            digest.update((Path(__file__).parent / module).read_bytes())
+        digest.update(json.dumps(sorted(font_index().items()), ensure_ascii=False).encode("utf-8"))
+        _environment = digest.hexdigest()
+    return _environment
+
+
+def _cache_get(key: str, directory: Optional[Path]) -> Optional[List[XmlShapeData]]:
+    with _cache_lock:
+        data = _memory_cache.get(key)
+        if data is not None:
+            _memory_cache.move_to_end(key)
+    if data is None and directory is not None:
+        try:
+            data = (directory / key[:2] / f"{key}.pickle").read_bytes()
+        except OSError:
+            return None
+    if data is None:
+        return None
+    try:
+        shapes = pickle.loads(data)  # a fresh copy: callers may attach shapes or modify results
+    except Exception:
+        return None
+    _cache_put(key, data, None)
+    return shapes
+
+
+def _cache_put(key: str, data: bytes, directory: Optional[Path]) -> None:
+    with _cache_lock:
+        _memory_cache[key] = data
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_SLIDES:
+            _memory_cache.popitem(last=False)
+    if directory is None:
+        return
+    path = directory / key[:2] / f"{key}.pickle"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # read-only cache directory: results stay in memory only
+
+
+def _canonical(root: Any) -> bytes:
+    """Canonical XML (C14N) of a part: equal for equal content however it was serialized.
+
+    python-pptx rewrites every slide it saves (e.g. <a:t></a:t> becomes <a:t/>),
+    so hashing the raw bytes would miss slides a load/save cycle left unchanged.
+    """
+    return etree.tostring(root, method="c14n")
+
+
+def _slide_jobs(package: _Package, issues_only: bool) -> List[Tuple[str, bytes, LayoutContext, bool]]:
+    """(cache key, canonical slide XML, layout context, issues_only) per slide in presentation order."""
+    presentation_part = package.related("", "/officeDocument") or "ppt/presentation.xml"
+    presentation = package.xml(presentation_part)
+    sld_sz = presentation.find(P + "sldSz")
+    slide_size = (_emu(sld_sz.get("cx")), _emu(sld_sz.get("cy"))) if sld_sz is not None else (None, None)
+
+    rels = package.rels(presentation_part)
+    contexts: Dict[Optional[str], Tuple[LayoutContext, bytes]] = {}
+    jobs = []
+    for sld_id in presentation.iterfind(f"{P}sldIdLst/{P}sldId"):
+        slide_part = rels[sld_id.get(R_ID)][1]
+        layout_part = package.related(slide_part, RT_SLIDE_LAYOUT)
+        if layout_part not in contexts:
+            if layout_part:
+                master_part = package.related(layout_part, RT_SLIDE_MASTER)
+                inherited = hashlib.sha256(_canonical(package.xml(layout_part)))
+                if master_part:
+                    inherited.update(_canonical(package.xml(master_part)))
+                master = package.xml(master_part) if master_part else None
+                context = layout_context(package.xml(layout_part), master, slide_size)
+            else:
+                inherited = hashlib.sha256()
+                context = LayoutContext({}, {}, {"titleStyle": 14, "bodyStyle": 14}, *slide_size)
+            inherited.update(f"|{slide_size}|{issues_only}".encode("utf-8"))
+            contexts[layout_part] = (context, inherited.digest())
+        context, inherited = contexts[layout_part]
+        slide_xml = _canonical(etree.fromstring(package.read(slide_part)))
+        key = hashlib.sha256(_environment_digest().encode("utf-8") + inherited + slide_xml).hexdigest()
+        jobs.append((key, slide_xml, context, issues_only))
+    return jobs
+
+
+def _slide_results(
+    jobs: List[Tuple[str, bytes, LayoutContext, bool]], workers: int, use_cache: bool
+) -> List[List[XmlShapeData]]:
+    """Shapes per job: cached slides are reused, the others computed (in parallel when workers > 1)."""
+    directory = cache_dir() if use_cache else None
+    use_cache = directory is not None
+    results: List[Optional[List[XmlShapeData]]] = [
+        _cache_get(job[0], directory) if use_cache else None for job in jobs
+    ]
+    missing = [i for i, shapes in enumerate(results) if shapes is None]
+    cache_stats["hits"] += len(jobs) - len(missing)
+    cache_stats["misses"] += len(missing)
+
+    todo = [jobs[i] for i in missing]
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as executor:
+            computed = list(executor.map(_slide_job, todo, chunksize=max(1, len(todo) // (workers * 4))))
+    else:
+        computed = [_slide_job(job) for job in todo]
+
+    for i, shapes in zip(missing, computed):
+        results[i] = shapes
+        if use_cache:
+            _cache_put(jobs[i][0], pickle.dumps(shapes, protocol=pickle.HIGHEST_PROTOCOL), directory)
+    return results  # type: ignore
+
+
+def extract_text_inventory_fast(
+    pptx_path: Path, issues_only: bool = False, workers: int = 1, use_cache: bool = True
+) -> InventoryData:
+    """Extract text content from all slides without python-pptx; same result as extract_text_inventory().
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        issues_only: If True, only include shapes that have overflow or overlap issues
+        workers: Worker processes for the slides that are not cached (1 processes them in this process)
+        use_cache: Reuse and store per-slide results (see cache_dir())
+
+    Returns a nested dictionary: {slide-N: {shape-N: XmlShapeData}}. The shape
+    objects have no python-pptx shape (shape is None) until bind_shapes().
+    """
+    package = _Package(Path(pptx_path))
+    try:
+        jobs = _slide_jobs(package, issues_only)
+    finally:
+        package.close()
+
+    results = _slide_results(jobs, workers, use_cache)
+
+    return {
+        f"slide-{slide_idx}": {shape_data.shape_id: shape_data for shape_data in shapes}
+        for slide_idx, shapes in enumerate(results)
+        if shapes
+    }
+
+
+def bind_shapes(inventory: InventoryData, prs: Any) -> None:
+    """Attach the python-pptx shape of every inventoried shape (shape_data.shape).
+
+    prs must be the presentation the inventory was extracted from, loaded and
+    not yet modified, so that element paths still point at the same shapes.
+    """
+    for slide_key, shapes in inventory.items():
+        slide = prs.slides[int(slide_key.split("-")[1])]
+        proxies = {}
+        pending = list(slide.shapes)
+        while pending:
+            shape = pending.pop()
+            proxies[shape._element] = shape
+            if hasattr(shape, "shapes"):  # GroupShape
+                pending.extend(shape.shapes)
+        sp_tree = slide.shapes._spTree
+        for shape_data in shapes.values():
+            element = sp_tree
+            for index in shape_data.element_path:  # type: ignore
+                element = element[index]
+            shape_data.shape = proxies[element]
+
+
+def _deck_job(job: Tuple[str, str, bool]) -> Tuple[str, int, int, Optional[str]]:
+    """Inventory one deck into its JSON file; (input, slides, shapes, error)."""
+    input_path, output_path, issues_only = job
+    try:
+        inventory = extract_text_inventory_fast(Path(input_path), issues_only)
+        save_inventory(inventory, Path(output_path))
+        return input_path, len(inventory), sum(len(shapes) for shapes in inventory.values()), None
+    except Exception as e:
+        return input_path, 0, 0, f"{type(e).__name__}: {e}"
+
+
+def inventory_decks(
+    pptx_paths: List[Path], output_dir: Path, issues_only: bool = False, workers: int = 1
+) -> List[Tuple[str, int, int, Optional[str]]]:
+    """Inventory many decks, one deck per worker process, writing <output_dir>/<deck>.json.
+
+    Returns:
+        (input path, slides with text, text shapes, error or None) per deck
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(str(p), str(output_dir / f"{p.stem}.json"), issues_only) for p in pptx_paths]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            return list(executor.map(_deck_job, jobs))
+    return [_deck_job(job) for job in jobs]
+
+
+def main():
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(
+        description="Extract text inventories with the read-only lxml engine.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python inventory_fast.py presentation.pptx inventory.json --workers 4
+    One deck, slides processed in 4 worker processes
+
+  python inventory_fast.py templates/ inventories/ --workers 8
+    Every .pptx under templates/, one JSON per deck in inventories/
+        """,
+    )
+    parser.add_argument("input", help="Input .pptx file, or a directory of .pptx files")
+    parser.add_argument("output", help="Output JSON file, or a directory for a directory input")
+    parser.add_argument(
+        "--issues-only",
+        action="store_true",
+        help="Include only text shapes that have overflow or overlap issues",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every slide (ignore the slide cache)")
+    args = parser.parse_args()
+    if args.no_cache:
+        os.environ["INVENTORY_CACHE"] = "off"  # also seen by the worker processes
+
+    input_path = Path(args.input)
+    if input_path.is_dir():
+        decks = sorted(p for p in input_path.rglob("*.pptx") if not p.name.startswith("~$"))
+        if not decks:
+            print(f"Error: No .pptx files found in: {args.input}")
+            sys.exit(1)
+        results = inventory_decks(decks, Path(args.output), args.issues_only, args.workers)
+        failed = [(path, error) for path, _, _, error in results if error]
+        for path, error in failed:
+            print(f"Error processing {path}: {error}")
+        print(f"Inventoried {len(results) - len(failed)} of {len(results)} decks into: {args.output}")
+        sys.exit(1 if failed else 0)
+
+    if not input_path.exists():
+        print(f"Error: Input file not found: {args.input}")
+        sys.exit(1)
+    if not input_path.suffix.lower() == ".pptx":
+        print("Error: Input must be a PowerPoint file (.pptx)")
+        sys.exit(1)
+
+    print(f"Extracting text inventory from: {args.input}")
+    inventory = extract_text_inventory_fast(input_path, args.issues_only, args.workers)
+    if cache_stats["hits"]:
+        print(f"Reused {cache_stats['hits']} of {cache_stats['hits'] + cache_stats['misses']} slides from the cache")
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    save_inventory(inventory, output_path)
+    print(f"Output saved to: {args.output}")
+    total_shapes = sum(len(shapes) for shapes in inventory.values())
+    print(f"Found text in {len(inventory)} slides with {total_shapes} text elements")
+
+
+if __name__ == "__main__":
+    # Run through the imported module so cached slides pickle as inventory_fast.XmlShapeData
+    import inventory_fast
+
+    inventory_fast.main()
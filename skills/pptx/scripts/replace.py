@@ -14,7 +14,8 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
-from inventory import InventoryData, extract_text_inventory
+from inventory import InventoryData
+from inventory_fast import bind_shapes, extract_text_inventory_fast, layout_context, measure_shape
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.dml import MSO_THEME_COLOR
@@ -159,6 +160,41 @@ def detect_frame_overflow(inventory: InventoryData) -> Dict[str, Dict[str, float
     return overflow_map
 
 
+def measure_replaced_shapes(prs, inventory: InventoryData, replaced: List[tuple]) -> InventoryData:
+    """Re-measure the replaced shapes on their edited XML, without saving the presentation.
+
+    Only the text changed; position, size and layout are those of the original
+    inventory entries. Shapes left without text drop out, as in a fresh inventory.
+
+    Returns:
+        Inventory of the replaced shapes, keyed by their original slide and shape keys
+    """
+    contexts = {}
+    slide_size = (prs.slide_width, prs.slide_height)
+    updated_inventory: InventoryData = {}
+
+    for slide_key, shape_key in replaced:
+        shape_data = inventory[slide_key][shape_key]
+        layout = prs.slides[int(slide_key.split("-")[1])].slide_layout
+        if layout.part.partname not in contexts:
+            contexts[layout.part.partname] = layout_context(
+                layout._element, layout.slide_master._element, slide_size
+            )
+
+        geometry = (shape_data.left_emu, shape_data.top_emu, shape_data.width_emu, shape_data.height_emu)
+        updated = measure_shape(
+            shape_data.shape._element,  # type: ignore
+            geometry,
+            contexts[layout.part.partname],
+            getattr(shape_data, "element_path", ()),
+        )
+        if updated is not None:
+            updated.shape_id = shape_key
+            updated_inventory.setdefault(slide_key, {})[shape_key] = updated
+
+    return updated_inventory
+
+
 def validate_replacements(inventory: InventoryData, replacements: Dict) -> List[str]:
     """Validate that all shapes in replacements exist in inventory.
 
@@ -217,9 +253,10 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
     # Load presentation
     prs = Presentation(pptx_file)
 
-    # Get inventory of all text shapes (returns ShapeData objects)
-    # Pass prs to use same Presentation instance
-    inventory = extract_text_inventory(Path(pptx_file), prs)
+    # Get inventory of all text shapes (reused per slide from the inventory cache)
+    # and attach the shapes of this Presentation instance for editing
+    inventory = extract_text_inventory_fast(Path(pptx_file))
+    bind_shapes(inventory, prs)
 
     # Detect text overflow in original presentation
     original_overflow = detect_frame_overflow(inventory)
@@ -244,6 +281,7 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
     shapes_processed = 0
     shapes_cleared = 0
     shapes_replaced = 0
+    replaced = []
 
     # Process each slide from inventory
     for slide_key, shapes_dict in inventory.items():
@@ -278,6 +316,7 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
                 continue
 
             shapes_replaced += 1
+            replaced.append((slide_key, shape_key))
 
             # Add replacement paragraphs
             for i, para_data in enumerate(replacement_shape_data["paragraphs"]):
@@ -289,19 +328,9 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
                 apply_paragraph_properties(p, para_data)
 
     # Check for issues after replacements
-    # Save to a temporary file and reload to avoid modifying the presentation during inventory
-    # (extract_text_inventory accesses font.color which adds empty <a:solidFill/> elements)
-    import tempfile
-
-    with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-        prs.save(str(tmp_path))
-
-    try:
-        updated_inventory = extract_text_inventory(tmp_path)
-        updated_overflow = detect_frame_overflow(updated_inventory)
-    finally:
-        tmp_path.unlink()  # Clean up temp file
+    # Measure the replaced shapes in memory; cleared shapes have no text left to check
+    updated_inventory = measure_replaced_shapes(prs, inventory, replaced)
+    updated_overflow = detect_frame_overflow(updated_inventory)
 
     # Check if any text overflow got worse
     overflow_errors = []
@@ -46,7 +46,7 @@ import sys
 import tempfile
 from pathlib import Path
 
-from inventory import extract_text_inventory
+from inventory_fast import extract_text_inventory_fast
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 
@@ -165,7 +165,7 @@ def get_placeholder_regions(pptx_path):
     slide_dimensions is a tuple of (width_inches, height_inches).
     """
     prs = Presentation(str(pptx_path))
-    inventory = extract_text_inventory(pptx_path, prs)
+    inventory = extract_text_inventory_fast(pptx_path)
     placeholder_regions = {}
 
     # Get actual slide dimensions in inches (EMU to inches conversion)
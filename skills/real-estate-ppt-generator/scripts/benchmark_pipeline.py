@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark of main_pipeline.
+
+Runs the full pipeline with the LLM backend in mock (default) or replay mode,
+so no network access is needed, and reports the wall time of every run.
+With --baseline the median is compared against an earlier result file and
+the script exits with status 1 when it is slower than the allowed tolerance.
+
+    python scripts/benchmark_pipeline.py 华发四季半岛 --repeat 3 --output bench.json
+    python scripts/benchmark_pipeline.py 华发四季半岛 --baseline bench.json --tolerance 0.15
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from main_pipeline import environment_overrides, main_pipeline
+
+
+def benchmark(project_name: str, timestamp: str = None, repeat: int = 3, llm_mode: str = "mock",
+              latency_scale: float = None, parallel: bool = True):
+    """Return {"runs": [seconds, ...], "median": seconds, "failed_stages": [...]}."""
+    from real_estate_ppt_utils.pipeline_scheduler import is_failed_result
+
+    # 延迟缩放只作用于本次计时，结束后恢复原值
+    overrides = {"LLM_LATENCY_SCALE": str(latency_scale)} if latency_scale is not None else {}
+    runs, failed = [], set()
+    with environment_overrides(overrides):
+        for i in range(repeat):
+            start = time.time()
+            # 阶段缓存关闭，每次都完整执行
+            results = main_pipeline(project_name, timestamp, parallel=parallel, use_cache=False,
+                                    deal_classification="户型", llm_mode=llm_mode)
+            runs.append(time.time() - start)
+            if is_failed_result(results):  # 模块导入失败等整体错误
+                failed.add("main_pipeline")
+            else:
+                failed.update(name for name, r in results.items() if is_failed_result(r))
+            print(f"[INFO] 第 {i + 1}/{repeat} 次运行耗时 {runs[-1]:.2f}s")
+    return {"project_name": project_name, "llm_mode": llm_mode, "runs": runs,
+            "median": statistics.median(runs), "failed_stages": sorted(failed)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="离线计时 main_pipeline")
+    parser.add_argument("project_name")
+    parser.add_argument("--timestamp")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--llm-mode", choices=["mock", "replay"], default="mock")
+    parser.add_argument("--latency-scale", type=float, help="模拟/回放延迟的缩放系数（0 表示不等待）")
+    parser.add_argument("--sequential", action="store_true")
+    parser.add_argument("--output", help="结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="与之前的 JSON 结果比较中位数")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="允许的变慢比例")
+    args = parser.parse_args()
+
+    result = benchmark(args.project_name, args.timestamp, args.repeat, args.llm_mode,
+                       args.latency_scale, parallel=not args.sequential)
+    print(f"\n[INFO] 中位耗时 {result['median']:.2f}s（{', '.join(f'{t:.2f}' for t in result['runs'])}）")
+    if result["failed_stages"]:
+        print(f"[WARN] 失败的阶段: {', '.join(result['failed_stages'])}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        ratio = result["median"] / baseline["median"] if baseline["median"] else 1.0
+        print(f"[INFO] 相对基线 {baseline['median']:.2f}s: {ratio:.2f}x")
+        if ratio > 1 + args.tolerance:
+            print(f"[ERROR] 性能回退超过 {args.tolerance:.0%}")
+            sys.exit(1)
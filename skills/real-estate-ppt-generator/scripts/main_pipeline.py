@@ -8,235 +8,349 @@ and Surrounding Summary Insertion
 请确保 utils/ 目录下存在对应模块并导出 run(...) 接口（或至少可用单参/双参回退）。
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List
 import os
 import sys
+from contextlib import contextmanager
 from datetime import datetime
+from functools import partial
 
 # 添加项目路径到Python路径
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-def main_pipeline(project_name: str = None, timestamp: str = None) -> Dict[str, Dict[str, Any]]:
-    """Main pipeline function to execute data processing modules."""
+UTILS = "real_estate_ppt_utils"
+
+
+@contextmanager
+def environment_overrides(values: Dict[str, str]):
+    """Set environment variables for the duration of a run, then restore the previous values."""
+    previous = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _deck_stage(deck, target: str, *args, **kwargs):
+    """Call a pptx_gen_* run() with the shared Presentation when the deck session holds one."""
+    from real_estate_ppt_utils.pipeline_scheduler import resolve_target
+
+    if deck is not None and deck.is_open:
+        kwargs["prs"] = deck.prs
+    return resolve_target(target)(*args, **kwargs)
+
+
+def build_stages(project_name: str, timestamp: str, deck=None, deal_classification: str = "户型",
+                 native_charts: bool = False, llm_cache: bool = True) -> List[Any]:
+    """
+    Declare the pipeline as stages with file inputs/outputs.
+
+    数据处理阶段按读写的文件自动推导依赖；所有修改 PPTX 的阶段放在 serial 通道，
+    并按原有顺序串成一条链，保证形状的叠放顺序与串行版本一致。
+    deal_classification 决定成交分析结果第一个工作表（幻灯片使用）的分类方式。
+    native_charts=True 时成交走势图和地域来源饼图以 PowerPoint 原生图表写入，不再渲染 PNG。
+    llm_cache=False 时调用模型的阶段不使用阶段缓存，每次都重新请求。
+    """
+    from real_estate_ppt_utils.pipeline_scheduler import Stage
+
+    p = project_name
+    wd = f"resources/working_data/{p}_{timestamp}"
+    pd_dir = f"{wd}/processed_data"
+    housing_json = f"{pd_dir}/{p}_房子基本信息.json"
+    land_json = f"{pd_dir}/{p}_土地基本信息.json"
+    deal_xlsx = f"{pd_dir}/{p}_成交分析结果.xlsx"
+    kaipan_xlsx = f"{pd_dir}/{p}_开盘信息.xlsx"
+    deal_png = f"{pd_dir}/{p}_成交结果分析混合图与表.png"
+    floor_plan_txt = f"{pd_dir}/{p}_户型分析.txt"
+    customer_txt = f"{pd_dir}/{p}_客户分析.txt"
+    pie_png = f"{pd_dir}/{p}_地域来源饼图.png"
+    surrounding_txt = f"{pd_dir}/{p}_llm_周边信息.txt"
+    room_images = [f"resources/images/room_style{i}.jpg" for i in range(1, 6)]
+
+    stages = [
+        # 数据处理阶段：pandas/matplotlib 走进程池，LLM 走线程池
+        Stage("housing_data", f"{UTILS}.data_processor_cric_housing_parser:run",
+              args=(p, f"{wd}/{p}_基本信息.txt"), inputs=[f"{wd}/{p}_基本信息.txt"],
+              outputs=[housing_json], lane="process", label="住房数据解析"),
+        Stage("land_data", f"{UTILS}.data_processor_cric_land_parser:run",
+              args=(p, f"{wd}/{p}_土地信息.txt"), inputs=[f"{wd}/{p}_土地信息.txt"],
+              outputs=[land_json], lane="process", label="土地数据解析"),
+        Stage("supply_data", f"{UTILS}.data_processor_analyze_real_estate_supply:run",
+              args=(p, f"{wd}/{p}_供应明细底表.xlsx"),
+              inputs=[f"{wd}/{p}_供应明细底表.xlsx", "resources/config/area_bands.json"],
+              outputs=[f"{pd_dir}/{p}_供应明细表.xlsx"], lane="process", label="供应数据分析"),
+        Stage("deal_data", f"{UTILS}.data_processor_extract_all_deal_table_style:run",
+              args=(p, f"{wd}/{p}_成交分析结果.xlsx"), kwargs={"classification": deal_classification},
+              inputs=[f"{wd}/{p}_成交分析结果.xlsx"], outputs=[deal_xlsx], lane="process",
+              label="成交数据分析"),
+        Stage("kaipan_analysis_data", f"{UTILS}.data_processor_analyze_kaipan:run",
+              args=(p, f"{wd}/{p}_开盘信息.xlsx"), fallback_args=(p,),
+              inputs=[f"{wd}/{p}_基本信息.txt", "resources/config/kaipan_products.json"],
+              outputs=[kaipan_xlsx], lane="process", label="开盘（Kaipan）数据分析"),
+        Stage("visualization_data", f"{UTILS}.data_processor_draw_table_picture:run",
+              args=(p,), inputs=[deal_xlsx], outputs=[deal_png], lane="process", label="成交数据可视化"),
+        Stage("floor_plan_data", f"{UTILS}.data_processor_picture_to_llm:run",
+              args=(p,), inputs=room_images, outputs=[floor_plan_txt], lane="thread", label="户型图分析",
+              cache=llm_cache),
+        Stage("table_data", f"{UTILS}.data_processor_extract_table_data:run",
+              args=(p,), inputs=[housing_json, land_json], lane="thread", label="表格数据提取"),
+        Stage("customer_analysis_data", f"{UTILS}.data_processor_analyze_customer:run",
+              args=(p,), outputs=[customer_txt], lane="thread", label="客户分析", cache=llm_cache),
+        Stage("kehu_pie_picture_data", f"{UTILS}.data_process_kehu_pie_picture:run",
+              args=(p, timestamp), fallback_args=(p,), inputs=[customer_txt], outputs=[pie_png],
+              lane="process", label="客户地域来源饼图生成"),
+        Stage("surrounding_summary_data", f"{UTILS}.data_process_analyze_housing_around_llm:run",
+              args=(p,), inputs=[f"{wd}/{p}_周边信息.txt"], outputs=[surrounding_txt],
+              lane="thread", label="周边信息总结生成", cache=llm_cache),
+        Stage("slide_master_data", f"{UTILS}.pptx_gen_create_gemdale_slide_master:run",
+              args=(p,), kwargs={"session": deck}, lane="serial", label="幻灯片模板生成", cache=False),
+    ]
+
+    if native_charts:
+        # 原生图表不需要预先渲染的图片
+        stages = [stage for stage in stages if stage.name not in ("visualization_data", "kehu_pie_picture_data")]
+
+    # PPTX 阶段：(results key, module[:function], args, kwargs, fallback_args, inputs, label)
+    deck_steps = [
+        ("table_add_data", "pptx_gen_add_data_table_to_slide", (p,), {"left_position": 7.5}, None,
+         [housing_json, land_json], "项目数据表格添加到幻灯片"),
+        ("analysis_table_data", "pptx_gen_add_analysis_table_to_slide", (p,),
+         {"left_position": 1.0, "top_position": 4.0}, None, [deal_xlsx], "分析表格添加到幻灯片"),
+        ("ppt_gen_add_kaipan_llm_to_page2_data", "ppt_gen_add_kaipan_llm_to_page2", (p, timestamp), {}, (p,),
+         [f"{wd}/{p}_基本信息.txt"], "开盘LLM文字添加到幻灯片（第2页）"),
+        ("image_page2_data", "pptx_gen_add_picture_to_page2_lyf", (p,), {}, None,
+         [deal_png], "图片和标题添加到幻灯片（第2页）"),
+        ("kaipan_table_page2_data", "pptx_gen_add_kaipan_table_to_page2", (p,), {}, (p, timestamp),
+         [kaipan_xlsx], "开盘表格添加到幻灯片（第2页）"),
+        ("picture_page3_data", "pptx_gen_add_picture_page3_lyf", (p,), {}, None,
+         room_images, "户型图片添加到幻灯片（第3页）"),
+        ("text_page3_data", "pptx_gen_add_txt_page3_lyf", (p,), {}, None,
+         [floor_plan_txt], "户型分析文本添加到幻灯片（第3页）"),
+        ("page4_table_data", "pptx_gen_add_table_to_page4_lyf", (p,), {}, None,
+         [f"{wd}/{p}_基本信息.txt"], "装修表格添加到幻灯片（第4页）"),
+        ("surrounding_summary_page4_data", "pptx_gen_add_surrounding_summary_to_page4", (p,), {}, None,
+         [surrounding_txt], "周边信息总结插入到幻灯片（第4页）"),
+        ("customer_analysis_page5_data", "pptx_gen_add_txt_page5_lyf", (p, timestamp), {}, None,
+         [customer_txt], "客户分析文本添加到幻灯片（第5页）"),
+        ("pptx_gen_add_pie_picture_to_page5_data", "pptx_gen_add_pie_picture_to_page5", (p, timestamp), {}, (p,),
+         [pie_png], "将地域来源饼图插入到幻灯片（第5页）"),
+    ]
+    if native_charts:
+        # 原生图表直接读取成交分析结果 / 客户分析文本，替换两张图片
+        native = {
+            "image_page2_data": ("pptx_gen_add_native_charts:run_deal_chart", (p, timestamp), {}, None,
+                                 [deal_xlsx], "成交走势原生图表添加到幻灯片（第2页）"),
+            "pptx_gen_add_pie_picture_to_page5_data": ("pptx_gen_add_native_charts:run_pie_chart", (p, timestamp),
+                                                       {}, None, [customer_txt], "地域来源原生饼图添加到幻灯片（第5页）"),
+        }
+        deck_steps = [(step[0],) + native[step[0]] if step[0] in native else step for step in deck_steps]
+
+    previous = "slide_master_data"
+    for name, module, args, kwargs, fallback_args, inputs, label in deck_steps:
+        target = f"{UTILS}.{module}" if ":" in module else f"{UTILS}.{module}:run"
+        stages.append(Stage(
+            name, partial(_deck_stage, deck, target),
+            args=args, kwargs=kwargs, fallback_args=fallback_args, inputs=inputs,
+            after=[previous], lane="serial", label=label,
+        ))
+        previous = name
+
+    if deck is not None:
+        stages.append(Stage("deck_save_data", deck.save, after=[previous], lane="serial", label=" PPTX 保存"))
+    return stages
+
+
+def stage_modules(stages: List[Any]) -> List[str]:
+    """Modules the stages import when they first run, in declaration order."""
+    modules = []
+    for stage in stages:
+        target = stage.target
+        if isinstance(target, partial):  # deck steps: partial(_deck_stage, deck, target)
+            target = target.args[-1]
+        if isinstance(target, str):
+            module = target.partition(":")[0]
+            if module not in modules:
+                modules.append(module)
+    return modules
+
+
+def profile_startup(project_name: str = "项目", only_stages: List[str] = None, native_charts: bool = False) -> None:
+    """Print the cold import cost of the pipeline itself and of every (selected) stage module."""
+    from real_estate_ppt_utils.pipeline_import_profile import import_times, print_import_report
+    from real_estate_ppt_utils.pipeline_scheduler import select_stages
+
+    stages = build_stages(project_name, datetime.now().strftime("%Y%m%d"), native_charts=native_charts)
+    if only_stages:
+        stages = select_stages(stages, only_stages)
+    modules = [f"{UTILS}.pipeline_scheduler", f"{UTILS}.pipeline_stage_cache",
+               f"{UTILS}.pptx_gen_deck_session"] + stage_modules(stages)
+    print_import_report(modules, import_times(modules))
+
+
+def main_pipeline(project_name: str = None, timestamp: str = None, deck_session: bool = True,
+                  parallel: bool = True, max_workers: int = None, use_cache: bool = True,
+                  deal_classification: str = "户型", use_processes: bool = True,
+                  use_llm_cache: bool = True, llm_mode: str = None,
+                  native_charts: bool = False, only_stages: List[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Main pipeline function to execute data processing modules.
+
+    deck_session=True 时幻灯片模板只在内存中构建一次，所有 pptx_gen_* 步骤共享同一个
+    Presentation 对象，最后统一保存一次；False 时保持逐步读写 PPTX 文件的旧行为。
+    parallel=True 时按依赖图并发执行相互独立的阶段，结束后打印关键路径报告；
+    False 时按声明顺序逐个执行。
+    use_cache=True 时输入文件、参数和代码都未变化的阶段直接从
+    resources/working_data/.cache 恢复结果与输出文件；PPTX 各步骤总是重新生成。
+    deal_classification: "户型" 或 "物业类型"，成交分析幻灯片使用的分类方式（两种分类都会汇总）。
+    use_processes=False 时 pandas/matplotlib 阶段也在线程池中执行（批量模式的工作进程内使用）。
+    use_llm_cache=False 时 LLM 调用不读取 resources/working_data/.cache/llm_responses.sqlite，
+    调用模型的阶段也不从阶段缓存恢复（等同于设置环境变量 LLM_CACHE=off）。
+    llm_mode: "live" / "record" / "replay" / "mock"（等同于 LLM_PROVIDER_MODE），
+    replay 和 mock 不访问网络，用于离线计时与回归测试。
+    native_charts=True 时第2页成交走势和第5页地域来源写成 PowerPoint 原生图表（数据内嵌），
+    跳过 matplotlib 出图阶段。
+    only_stages: 只执行这些阶段（名称见 build_stages），其余阶段不运行，所选阶段直接读取已有文件，
+    例如 ["page4_table_data"] 只重新生成第4页表格。各阶段模块在首次执行时才导入。
+    """
     if project_name is None:
         project_name = input("请输入项目名称: ")
     
     if timestamp is None:
         timestamp = datetime.now().strftime("%Y%m%d")
     
-    # 动态导入utils模块
-    try:
-        from real_estate_ppt_utils.data_processor_cric_housing_parser import run as data_processor_cric_housing_parser
-        from real_estate_ppt_utils.data_processor_cric_land_parser import run as data_processor_cric_land_parser
-        from real_estate_ppt_utils.data_processor_analyze_real_estate_supply import run as data_processor_analyze_real_estate_supply
-        from real_estate_ppt_utils.data_processor_extract_all_deal_table_style import run as data_processor_extract_all_deal_table_style
-        from real_estate_ppt_utils.data_processor_draw_table_picture import run as data_processor_draw_table_picture
-        from real_estate_ppt_utils.data_processor_picture_to_llm import run as data_processor_picture_to_llm
-        from real_estate_ppt_utils.data_processor_extract_table_data import run as data_processor_extract_table_data
-        from real_estate_ppt_utils.pptx_gen_create_gemdale_slide_master import run as pptx_gen_create_gemdale_slide_master
-        from real_estate_ppt_utils.pptx_gen_add_data_table_to_slide import run as pptx_gen_add_data_table_to_slide
-        from real_estate_ppt_utils.pptx_gen_add_analysis_table_to_slide import run as pptx_gen_add_analysis_table_to_slide
-        from real_estate_ppt_utils.pptx_gen_add_picture_to_page2_lyf import run as pptx_gen_add_picture_to_page2_lyf
-        from real_estate_ppt_utils.pptx_gen_add_picture_page3_lyf import run as pptx_gen_add_picture_page3_lyf
-        from real_estate_ppt_utils.pptx_gen_add_txt_page3_lyf import run as pptx_gen_add_txt_page3_lyf
-        from real_estate_ppt_utils.pptx_gen_add_table_to_page4_lyf import run as pptx_gen_add_table_to_page4_lyf
-        from real_estate_ppt_utils.data_process_analyze_housing_around_llm import run as data_process_analyze_housing_around_llm
-        from real_estate_ppt_utils.data_processor_analyze_customer import run as data_processor_analyze_customer
-        from real_estate_ppt_utils.pptx_gen_add_txt_page5_lyf import run as pptx_gen_add_txt_page5_lyf
-        from real_estate_ppt_utils.pptx_gen_add_surrounding_summary_to_page4 import run as pptx_gen_add_surrounding_summary_to_page4
-        from real_estate_ppt_utils.data_processor_analyze_kaipan import run as data_processor_analyze_kaipan
-        from real_estate_ppt_utils.pptx_gen_add_kaipan_table_to_page2 import run as pptx_gen_add_kaipan_table_to_page2
-        from real_estate_ppt_utils.ppt_gen_add_kaipan_llm_to_page2 import run as ppt_gen_add_kaipan_llm_to_page2
-        from real_estate_ppt_utils.data_process_kehu_pie_picture import run as data_process_kehu_pie_picture
-        from real_estate_ppt_utils.pptx_gen_add_pie_picture_to_page5 import run as pptx_gen_add_pie_picture_to_page5
-    except ImportError as e:
-        print(f"导入模块失败: {e}")
-        return {"error": f"模块导入失败: {str(e)}"}
-    
-    print(f"\n开始处理项目: {project_name}")
-    print(f"时间戳: {timestamp}")
-    
-    # 创建工作目录
-    working_dir = f"resources/working_data/{project_name}_{timestamp}"
-    os.makedirs(working_dir, exist_ok=True)
-    
-    results = {}
-    
-    # 1. 住房数据解析
-    print("\n执行住房数据解析...")
-    housing_result = data_processor_cric_housing_parser(project_name, f"{working_dir}/{project_name}_基本信息.txt")
-    results["housing_data"] = housing_result
-    
-    # 2. 土地数据解析
-    print("\n执行土地数据解析...")
-    land_result = data_processor_cric_land_parser(project_name, f"{working_dir}/{project_name}_土地信息.txt")
-    results["land_data"] = land_result
-    
-    # 3. 供应数据分析
-    print("\n执行供应数据分析...")
-    supply_result = data_processor_analyze_real_estate_supply(project_name, f"{working_dir}/{project_name}_供应明细底表.xlsx")
-    results["supply_data"] = supply_result
-    
-    # 4. 成交数据分析
-    print("\n执行成交数据分析...")
-    deal_result = data_processor_extract_all_deal_table_style(project_name, f"{working_dir}/{project_name}_成交分析结果.xlsx")
-    results["deal_data"] = deal_result
-    
-    # 5. 开盘（Kaipan）数据分析
-    print("\n执行开盘（Kaipan）数据分析...")
-    kaipan_analysis_result = None
-    try:
-        kaipan_analysis_result = data_processor_analyze_kaipan(
-            project_name, f"{working_dir}/{project_name}_开盘信息.xlsx"
-        )
-    except TypeError:
-        try:
-            kaipan_analysis_result = data_processor_analyze_kaipan(project_name)
-        except Exception as e:
-            print(f"[WARN] data_processor_analyze_kaipan 调用失败: {e}")
-            kaipan_analysis_result = {"success": False, "error": str(e)}
-    except Exception as e:
-        print(f"[WARN] data_processor_analyze_kaipan 调用异常: {e}")
-        kaipan_analysis_result = {"success": False, "error": str(e)}
-    results["kaipan_analysis_data"] = kaipan_analysis_result
-    
-    # 6. 成交数据可视化
-    print("\n执行成交数据可视化...")
-    visualization_result = data_processor_draw_table_picture(project_name)
-    results["visualization_data"] = visualization_result
-    
-    # 7. 户型图分析
-    print("\n执行户型图分析...")
-    floor_plan_result = data_processor_picture_to_llm(project_name)
-    results["floor_plan_data"] = floor_plan_result
+    # 通过环境变量传递，进程池中的阶段同样生效；运行结束后恢复，不影响同一进程中的后续调用
+    overrides = {}
+    if not use_llm_cache:
+        overrides["LLM_CACHE"] = "off"
+    if llm_mode:
+        overrides["LLM_PROVIDER_MODE"] = llm_mode
     
-    # 8. 表格数据提取
-    print("\n执行表格数据提取...")
-    table_data_result = data_processor_extract_table_data(project_name)
-    results["table_data"] = table_data_result
-    
-    # 9. 客户地域来源饼图生成
-    print("\n执行客户地域来源饼图生成...")
-    data_process_kehu_pie_picture_result = None
-    try:
-        data_process_kehu_pie_picture_result = data_process_kehu_pie_picture(project_name, timestamp)
-    except TypeError:
+    with environment_overrides(overrides):
+        # 各阶段模块在首次执行时才导入
         try:
-            data_process_kehu_pie_picture_result = data_process_kehu_pie_picture(project_name)
-        except Exception as e:
-            print(f"[WARN] data_process_kehu_pie_picture 调用失败: {e}")
-            data_process_kehu_pie_picture_result = {"success": False, "error": str(e)}
-    except Exception as e:
-        print(f"[WARN] data_process_kehu_pie_picture 调用异常: {e}")
-        data_process_kehu_pie_picture_result = {"success": False, "error": str(e)}
-    results["kehu_pie_picture_data"] = data_process_kehu_pie_picture_result
-    
-    # 10. 幻灯片模板生成
-    print("\n执行幻灯片模板生成...")
-    slide_master_result = pptx_gen_create_gemdale_slide_master(project_name)
-    results["slide_master_data"] = slide_master_result
-    
-    # 11. 项目数据表格添加到幻灯片
-    print("\n执行项目数据表格添加到幻灯片...")
-    table_add_result = pptx_gen_add_data_table_to_slide(project_name, left_position=7.5)
-    results["table_add_data"] = table_add_result
-    
-    # 12. 分析表格添加到幻灯片
-    print("\n执行分析表格添加到幻灯片...")
-    analysis_table_result = pptx_gen_add_analysis_table_to_slide(project_name, left_position=1.0, top_position=4.0)
-    results["analysis_table_data"] = analysis_table_result
-    
-    # 13. 开盘LLM文字添加到幻灯片（第2页）
-    print("\n执行开盘LLM文字添加到幻灯片（第2页）...")
-    ppt_gen_add_kaipan_llm_to_page2_result = None
-    try:
-        ppt_gen_add_kaipan_llm_to_page2_result = ppt_gen_add_kaipan_llm_to_page2(project_name, timestamp)
-    except TypeError:
-        try:
-            ppt_gen_add_kaipan_llm_to_page2_result = ppt_gen_add_kaipan_llm_to_page2(project_name)
-        except Exception as e:
-            print(f"[WARN] ppt_gen_add_kaipan_llm_to_page2 调用失败: {e}")
-            ppt_gen_add_kaipan_llm_to_page2_result = {"success": False, "error": str(e)}
-    except Exception as e:
-        print(f"[WARN] ppt_gen_add_kaipan_llm_to_page2 调用异常: {e}")
-        ppt_gen_add_kaipan_llm_to_page2_result = {"success": False, "error": str(e)}
-    results["ppt_gen_add_kaipan_llm_to_page2_data"] = ppt_gen_add_kaipan_llm_to_page2_result
-    
-    # 14. 图片和标题添加到幻灯片（第2页）
-    print("\n执行图片和标题添加到幻灯片（第2页）...")
-    image_page2_result = pptx_gen_add_picture_to_page2_lyf(project_name)
-    results["image_page2_data"] = image_page2_result
-    
-    # 15. 开盘表格添加到幻灯片（第2页）
-    print("\n执行开盘表格添加到幻灯片（第2页）...")
-    kaipan_table_page2_result = None
-    try:
-        kaipan_table_page2_result = pptx_gen_add_kaipan_table_to_page2(project_name)
-    except TypeError:
-        try:
-            kaipan_table_page2_result = pptx_gen_add_kaipan_table_to_page2(project_name, timestamp)
-        except Exception as e:
-            print(f"[WARN] pptx_gen_add_kaipan_table_to_page2 调用失败: {e}")
-            kaipan_table_page2_result = {"success": False, "error": str(e)}
-    except Exception as e:
-        print(f"[WARN] pptx_gen_add_kaipan_table_to_page2 调用异常: {e}")
-        kaipan_table_page2_result = {"success": False, "error": str(e)}
-    results["kaipan_table_page2_data"] = kaipan_table_page2_result
-    
-    # 16. 户型分析文本和图片添加到幻灯片（第3页）
-    print("\n执行户型分析文本和图片添加到幻灯片（第3页）...")
-    picture_page3_result = pptx_gen_add_picture_page3_lyf(project_name)
-    text_page3_result = pptx_gen_add_txt_page3_lyf(project_name)
-    results["picture_page3_data"] = picture_page3_result
-    results["text_page3_data"] = text_page3_result
-    
-    # 17. 客户分析
-    print("\n执行客户分析...")
-    customer_analysis_result = data_processor_analyze_customer(project_name)
-    results["customer_analysis_data"] = customer_analysis_result
+            from real_estate_ppt_utils.pipeline_scheduler import run_stages, select_stages
+            from real_estate_ppt_utils.pptx_gen_deck_session import DeckSession
+            from real_estate_ppt_utils.pipeline_stage_cache import StageCache
+            from real_estate_ppt_utils.llm_response_cache import cache_enabled
+        except ImportError as e:
+            print(f"导入模块失败: {e}")
+            return {"error": f"模块导入失败: {str(e)}"}
     
-    # 18. 周边信息总结生成
-    print("\n执行周边信息总结生成...")
-    surrounding_summary_result = data_process_analyze_housing_around_llm(project_name)
-    results["surrounding_summary_data"] = surrounding_summary_result
+        print(f"\n开始处理项目: {project_name}")
+        print(f"时间戳: {timestamp}")
     
-    # 19. 装修表格添加到幻灯片（第4页）
-    print("\n执行装修表格添加到幻灯片（第4页）...")
-    page4_table_result = pptx_gen_add_table_to_page4_lyf(project_name)
-    results["page4_table_data"] = page4_table_result
+        # 创建工作目录
+        working_dir = f"resources/working_data/{project_name}_{timestamp}"
+        os.makedirs(working_dir, exist_ok=True)
     
-    # 20. 周边信息总结插入到幻灯片（第4页）
-    print("\n执行周边信息总结插入到幻灯片（第4页）...")
-    surrounding_summary_page4_result = pptx_gen_add_surrounding_summary_to_page4(project_name)
-    results["surrounding_summary_page4_data"] = surrounding_summary_page4_result
+        deck = DeckSession() if deck_session else None
+        # LLM_CACHE=off 也跳过 LLM 阶段的阶段缓存，否则上次的模型输出会被直接恢复
+        stages = build_stages(project_name, timestamp, deck, deal_classification, native_charts,
+                              llm_cache=cache_enabled())
+        if only_stages:
+            names = list(only_stages)
+            if deck is not None and "slide_master_data" in names:
+                names.append("deck_save_data")  # 新模板只在 deck session 保存时写盘
+            # 未生成新模板时 deck 步骤各自读写已有的 PPTX 文件
+            try:
+                stages = select_stages(stages, names)
+            except ValueError as e:
+                print(f"[ERROR] {e}")
+                return {"error": str(e)}
+        cache = StageCache() if use_cache else None
+        results = run_stages(stages, max_workers=max_workers, parallel=parallel, cache=cache,
+                             use_processes=use_processes)
+        if cache is not None:
+            print(f"[INFO] 缓存命中 {len(cache.hits)} 个阶段: {', '.join(cache.hits) or '-'}")
+        llm_client = sys.modules.get(f"{UTILS}.llm_client")
+        if llm_client is not None and llm_client.is_loaded():
+            llm_client.get_client().print_summary()
     
-    # 21. 客户分析文本添加到幻灯片（第5页）
-    print("\n执行客户分析文本添加到幻灯片（第5页）...")
-    customer_analysis_page5_result = pptx_gen_add_txt_page5_lyf(project_name, timestamp)
-    results["customer_analysis_page5_data"] = customer_analysis_page5_result
-    
-    # 22. 将地域来源饼图插入到幻灯片（第5页）
-    print("\n执行将地域来源饼图插入到幻灯片（第5页）...")
-    pptx_gen_add_pie_picture_to_page5_result = None
-    try:
-        pptx_gen_add_pie_picture_to_page5_result = pptx_gen_add_pie_picture_to_page5(project_name, timestamp)
-    except TypeError:
-        try:
-            pptx_gen_add_pie_picture_to_page5_result = pptx_gen_add_pie_picture_to_page5(project_name)
-        except Exception as e:
-            print(f"[WARN] pptx_gen_add_pie_picture_to_page5 调用失败: {e}")
-            pptx_gen_add_pie_picture_to_page5_result = {"success": False, "error": str(e)}
-    except Exception as e:
-        print(f"[WARN] pptx_gen_add_pie_picture_to_page5 调用异常: {e}")
-        pptx_gen_add_pie_picture_to_page5_result = {"success": False, "error": str(e)}
-    results["pptx_gen_add_pie_picture_to_page5_data"] = pptx_gen_add_pie_picture_to_page5_result
-    
-    print("\nPipeline 执行完成！")
-    return results
+        print("\nPipeline 执行完成！")
+        return results
+
+
+def batch_pipeline(manifest, timestamp: str = None, max_workers: int = None, deal_classification: str = "户型",
+                   use_cache: bool = True, summary_file: str = None,
+                   use_llm_cache: bool = True, llm_mode: str = None,
+                   native_charts: bool = False) -> List[Dict[str, Any]]:
+    """
+    Run main_pipeline for every project in a manifest on a bounded process pool.
+
+    manifest: 清单文件路径（.json / .csv / .txt），或项目名称列表。
+    每个项目在独立的工作进程中执行，日志写入各自工作目录下的 pipeline.log；
+    结束后打印成功/失败/耗时汇总表，并写入 CSV（默认 resources/working_data/batch_summary_{timestamp}.csv）。
+    """
+    import time
+    from real_estate_ppt_utils.pipeline_batch import load_manifest, print_summary, run_batch, write_summary_csv
+
+    if isinstance(manifest, str):
+        jobs = load_manifest(manifest)
+    else:
+        jobs = [{"project_name": name, "timestamp": None} for name in dict.fromkeys(manifest)]
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y%m%d")
+    for job in jobs:
+        job["timestamp"] = job["timestamp"] or timestamp
+
+    options = {"deal_classification": deal_classification, "use_cache": use_cache, "use_processes": False,
+               "use_llm_cache": use_llm_cache, "llm_mode": llm_mode, "native_charts": native_charts}
+    preload = [f"{UTILS}.pptx_gen_create_gemdale_slide_master:run", f"{UTILS}.data_processor_draw_table_picture:run"]
+    start = time.time()
+    summaries = run_batch(jobs, "main_pipeline:main_pipeline", options, max_workers=max_workers, preload=preload)
+    print_summary(summaries, time.time() - start)
+    summary_file = summary_file or f"resources/working_data/batch_summary_{timestamp}.csv"
+    print(f"[INFO] 汇总已保存到 {write_summary_csv(summaries, summary_file)}")
+    return summaries
+
+
+def _parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="生成楼盘分析 PPT")
+    parser.add_argument("project_name", nargs="?", help="项目名称（省略且未指定 --batch 时交互输入）")
+    parser.add_argument("--batch", metavar="MANIFEST", help="批量模式：项目清单文件（.json/.csv/.txt）")
+    parser.add_argument("--timestamp", help="工作目录时间戳，默认今天（YYYYMMDD）")
+    parser.add_argument("--workers", type=int, help="并发数：批量模式为同时处理的项目数")
+    parser.add_argument("--classification", choices=["户型", "物业类型"],
+                        default="户型", help="成交分析幻灯片使用的分类方式（默认：户型）")
+    parser.add_argument("--no-cache", action="store_true", help="不使用阶段缓存")
+    parser.add_argument("--no-llm-cache", action="store_true", help="不读取 LLM 响应缓存，调用模型的阶段也不读取阶段缓存")
+    parser.add_argument("--llm-mode", choices=["live", "record", "replay", "mock"],
+                        help="LLM 后端：真实调用 / 录制 / 回放录制结果 / 离线模拟")
+    parser.add_argument("--sequential", action="store_true", help="按声明顺序逐个执行阶段")
+    parser.add_argument("--native-charts", action="store_true",
+                        help="成交走势图和地域来源饼图写成 PowerPoint 原生图表，不渲染图片")
+    parser.add_argument("--stage", action="append", dest="stages", metavar="NAME",
+                        help="只执行指定阶段（可重复），例如 --stage page4_table_data")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="报告各阶段模块的导入耗时后退出")
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
-    final_result = main_pipeline()
+    args = _parse_args()
+    if args.profile_startup:
+        profile_startup(args.project_name or "项目", args.stages, args.native_charts)
+        sys.exit(0)
+    if args.batch:
+        batch_pipeline(args.batch, timestamp=args.timestamp, max_workers=args.workers,
+                       deal_classification=args.classification, use_cache=not args.no_cache,
+                       use_llm_cache=not args.no_llm_cache, llm_mode=args.llm_mode,
+                       native_charts=args.native_charts)
+        sys.exit(0)
+
+    final_result = main_pipeline(args.project_name, args.timestamp, parallel=not args.sequential,
+                                 max_workers=args.workers, use_cache=not args.no_cache,
+                                 deal_classification=args.classification, use_llm_cache=not args.no_llm_cache,
+                                 llm_mode=args.llm_mode, native_charts=args.native_charts,
+                                 only_stages=args.stages)
     print("\nPipeline 执行完成，最终结果:")
     for key, value in final_result.items():
-        print(f"{key}: {value}")
\ No newline at end of file
+        print(f"{key}: {value}")
@@ -1,6 +1,10 @@
 import os
 from datetime import datetime
-from openai import OpenAI
+
+try:
+    from .llm_client import chat
+except ImportError:
+    from llm_client import chat
 
 def run(project_name):
     """
@@ -12,7 +16,6 @@ def run(project_name):
     Returns:
         dict: {"status": "success/error", "message": "..."}
     """
-    api_key = "sk-ykloduxdazjstefqarmswtetrtafvvalaxtkqhxeldvsogtt"
     model = "deepseek-ai/DeepSeek-R1"
     timestamp = datetime.now().strftime("%Y%m%d")
     input_file = f"resources/working_data/{project_name}_{timestamp}/{project_name}_周边信息.txt"
@@ -44,10 +47,9 @@ def run(project_name):
     {content}
     """
 
-    client = OpenAI(base_url="https://api.siliconflow.cn/v1", api_key=api_key)
-
     try:
-        response = client.chat.completions.create(
+        response = chat(
+            "siliconflow",
             model=model,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=2000,
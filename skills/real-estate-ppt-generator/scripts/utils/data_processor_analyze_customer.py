@@ -3,22 +3,21 @@ import os
 import json
 import datetime
 
-from openai import OpenAI
 from openai.types.chat.chat_completion import Choice
 
-def run(project_name: str) -> None:
-    # Initialize OpenAI client
-    client = OpenAI(
-        base_url="https://api.moonshot.cn/v1",
-        api_key="sk-Ghgw4tuUZ9KJfGCgeymdRtVDkySjywunNiuc9M3oLjvpbBhT",
-    )
+try:
+    from .llm_client import chat as llm_chat
+except ImportError:
+    from llm_client import chat as llm_chat
 
+def run(project_name: str) -> None:
     # Search tool implementation
     def search_impl(arguments: Dict[str, Any]) -> Any:
         return arguments
 
     def chat(messages) -> Choice:
-        completion = client.chat.completions.create(
+        completion = llm_chat(
+            "moonshot",
             model="kimi-k2-0905-preview",
             messages=messages,
             temperature=0.6,
@@ -3,6 +3,7 @@
 """
 Real Estate Supply Data Analysis Script
 Analyzes supply data from Excel file to determine area ranges and room types by building type
+(area bands and the 物业类型 × 户型 × 面积段 cube, see data_processor_area_bands)
 """
 
 import pandas as pd
@@ -10,56 +11,60 @@ import numpy as np
 from pathlib import Path
 import warnings
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
 warnings.filterwarnings('ignore')
 
+try:
+    from .data_processor_area_bands import (DEFAULT_CONFIG_PATH, DEFAULT_EDGES, build_supply_cube,
+                                            categorize_areas, cube_counts, load_area_bands)
+    from .data_processor_excel_stream import contains_filter, iter_excel_chunks
+except ImportError:
+    from data_processor_area_bands import (DEFAULT_CONFIG_PATH, DEFAULT_EDGES, build_supply_cube,
+                                           categorize_areas, cube_counts, load_area_bands)
+    from data_processor_excel_stream import contains_filter, iter_excel_chunks
+
 # Configure pandas display options
 pd.set_option('display.max_rows', None)
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', 1000)
 pd.set_option('display.max_colwidth', 50)
 
-def categorize_area(area):
-    """Categorize area into standard Chinese real estate ranges"""
-    area = round(float(area))
-    if area < 90:
-        return "90㎡以下"
-    elif 90 <= area < 105:
-        return "90-105㎡"
-    elif 105 <= area < 120:
-        return "105-120㎡"
-    elif 120 <= area < 140:
-        return "120-140㎡"
-    else:
-        return "140㎡以上"
-
-def load_data(file_path):
-    """Load Excel data without headers"""
+def load_data(file_path, project_name=None, edges: Sequence[float] = DEFAULT_EDGES):
+    """
+    Load Excel data without headers.
+    
+    The sheet is streamed in read-only mode and only 物业类型, 户型 and 面积 are kept;
+    with project_name (city-wide dumps) rows of other projects are skipped while reading.
+    edges: area band edges (see load_area_bands).
+    """
     try:
-        # Read Excel file without headers
-        df = pd.read_excel(file_path, header=None)
+        # Column positions of the Chinese descriptions:
+        # 供应时间, 预售证编号, 项目名称, 项目地址, 房间号, 物业类型, 户型, 面积
+        columns = {5: '物业类型', 6: '户型', 7: '面积'}
+        row_filter = contains_filter(2, project_name) if project_name else None
         
-        # Set column names based on Chinese descriptions
-        df.columns = ['供应时间', '预售证编号', '项目名称', '项目地址', '房间号', '物业类型', '户型', '面积']
+        chunks = []
+        for chunk in iter_excel_chunks(file_path, columns, row_filter=row_filter, dtypes={'面积': 'float'}):
+            # Clean data - remove any rows with missing critical data or non-numeric area
+            chunks.append(chunk.dropna(subset=['物业类型', '户型', '面积']))
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=list(columns.values()))
         
-        # Clean data - remove any rows with missing critical data
-        df = df.dropna(subset=['物业类型', '户型', '面积'])
-        
-        # Convert area to numeric and round
-        df['面积'] = pd.to_numeric(df['面积'], errors='coerce')
-        df = df.dropna(subset=['面积'])
+        # Round area
         df['面积'] = df['面积'].round()
         
-        # Add area category
-        df['面积段'] = df['面积'].apply(categorize_area)
+        # Add area category (one binned cut over the column)
+        df['面积段'] = categorize_areas(df['面积'], edges)
         
         return df
     except Exception as e:
         print(f"Error loading data: {e}")
         return None
 
-def analyze_data(df):
-    """Perform comprehensive analysis of the data"""
+def analyze_data(df, cube: Optional[pd.DataFrame] = None):
+    """Perform comprehensive analysis of the data (every figure is read from the supply cube)"""
+    
+    if cube is None:
+        cube = build_supply_cube(df)
     
     # Basic statistics
     total_units = len(df)
@@ -69,18 +74,17 @@ def analyze_data(df):
     # Analysis by building type
     building_analysis = {}
     
-    for building_type in df['物业类型'].unique():
-        building_data = df[df['物业类型'] == building_type]
-        building_total = len(building_data)
+    for building_type, building_cube in cube.groupby('物业类型', sort=False):
+        building_total = int(building_cube['单元数'].sum())
         
         # Room type analysis
-        room_type_counts = building_data['户型'].value_counts()
+        room_type_counts = cube_counts(building_cube, '户型')
         
         # Area range analysis
-        area_range_counts = building_data['面积段'].value_counts()
+        area_range_counts = cube_counts(building_cube, '面积段')
         
         # Combined analysis: room type + area range
-        combined_counts = building_data.groupby(['户型', '面积段']).size()
+        combined_counts = building_cube.groupby(['户型', '面积段'])['单元数'].sum()
         
         building_analysis[building_type] = {
             '总单元数': building_total,
@@ -124,9 +128,12 @@ def print_detailed_analysis(analysis, total_units):
         
         print("-" * 80)
 
-def generate_summary_report(df, analysis):
+def generate_summary_report(df, analysis, cube: Optional[pd.DataFrame] = None):
     """Generate a summary report"""
     
+    if cube is None:
+        cube = build_supply_cube(df)
+    
     print("\n项目总体分析摘要")
     print("=" * 80)
     
@@ -139,7 +146,7 @@ def generate_summary_report(df, analysis):
     
     # Overall area distribution
     print("\n整体面积段分布:")
-    overall_area_dist = df['面积段'].value_counts()
+    overall_area_dist = cube_counts(cube, '面积段')
     for area_range, count in overall_area_dist.items():
         percentage = (count / len(df)) * 100
         print(f"  {area_range}: {count:,}单元 ({percentage:.1f}%)")
@@ -159,8 +166,27 @@ def generate_summary_report(df, analysis):
     summary_df = pd.DataFrame(building_summary)
     print(summary_df.to_string(index=False))
 
-def run(project_name: str, file_path: str = "resources/working_data/all_supply_with_date_data.xlsx") -> Dict[str, Any]:
-    """Run the supply data analysis with a given project name and file path."""
+def build_detail_table(cube):
+    """详细分析结果 sheet: per 物业类型 (first-appearance order) its 户型 × 面积段 rows sorted by key"""
+    
+    columns = ['物业类型', '户型', '面积段', '单元数', '占总项目比例', '占该类型比例']
+    if cube.empty:
+        return pd.DataFrame(columns=columns)
+    detail = pd.concat([part.sort_values(['户型', '面积段'], kind='stable')
+                        for _, part in cube.groupby('物业类型', sort=False)], ignore_index=True)
+    for column in ['占总项目比例', '占该类型比例']:
+        detail[column] = (detail[column] * 100).map('{:.2f}%'.format)
+    return detail[columns]
+
+def run(project_name: str, file_path: str = "resources/working_data/all_supply_with_date_data.xlsx",
+        filter_project: bool = False, city: Optional[str] = None,
+        area_bands_config: str = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Run the supply data analysis with a given project name and file path.
+    
+    filter_project: set for city-wide supply dumps, keeps only rows whose 项目名称 contains project_name.
+    city: picks the city's band edges from area_bands_config (default edges otherwise).
+    """
     
     # File path
     file_path = Path(file_path)
@@ -172,8 +198,15 @@ def run(project_name: str, file_path: str = "resources/working_data/all_supply_w
     print("开始分析房地产供应数据...")
     print("=" * 80)
     
+    # Area band edges for the city
+    try:
+        edges = load_area_bands(city, area_bands_config)
+    except (OSError, ValueError) as e:
+        print(f"面积段配置无效，使用默认分段: {e}")
+        edges = DEFAULT_EDGES
+    
     # Load data
-    df = load_data(file_path)
+    df = load_data(file_path, project_name if filter_project else None, edges)
     if df is None:
         return {}
     
@@ -186,11 +219,12 @@ def run(project_name: str, file_path: str = "resources/working_data/all_supply_w
     output_dir = Path(f"resources/working_data/{project_name}_{timestamp}/processed_data")
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Analyze data
-    analysis = analyze_data(df)
+    # Analyze data: one groupby builds the 物业类型 × 户型 × 面积段 cube, everything below reads from it
+    cube = build_supply_cube(df)
+    analysis = analyze_data(df, cube)
     
     # Generate reports
-    generate_summary_report(df, analysis)
+    generate_summary_report(df, analysis, cube)
     print_detailed_analysis(analysis, len(df))
     
     # Save detailed results to Excel
@@ -198,19 +232,7 @@ def run(project_name: str, file_path: str = "resources/working_data/all_supply_w
     
     with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
         # Summary sheet
-        summary_data = []
-        for building_type, data in analysis.items():
-            for (room_type, area_range), count in data['户型_面积段组合'].items():
-                summary_data.append({
-                    '物业类型': building_type,
-                    '户型': room_type,
-                    '面积段': area_range,
-                    '单元数': count,
-                    '占总项目比例': f"{(count/len(df))*100:.2f}%",
-                    '占该类型比例': f"{(count/data['总单元数'])*100:.2f}%"
-                })
-        
-        summary_df = pd.DataFrame(summary_data)
+        summary_df = build_detail_table(cube)
         summary_df.to_excel(writer, sheet_name='详细分析结果', index=False)
         
         # Overall statistics
@@ -232,7 +254,7 @@ def run(project_name: str, file_path: str = "resources/working_data/all_supply_w
             '平均面积': df['面积'].mean(),
             '中位数面积': df['面积'].median()
         },
-        'area_distribution': df['面积段'].value_counts().to_dict()
+        'area_distribution': cube_counts(cube, '面积段').to_dict()
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Configurable area bands and the supply cube.
+
+Band edges come from ``resources/config/area_bands.json``:
+
+    {"default": [90, 105, 120, 140], "cities": {"上海": [90, 120, 144]}}
+
+edges [a, b, c] give the bands "a㎡以下", "a-b㎡", "b-c㎡", "c㎡以上"; a band
+includes its lower edge. Areas are banded with one ``pd.cut`` over the whole
+column instead of a Python call per row.
+
+``build_supply_cube`` counts units per (物业类型, 户型, 面积段) in a single
+groupby; the per-type distributions, the overall band distribution and the
+Excel detail sheet are all re-aggregated from that small table.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CONFIG_PATH = os.path.join("resources", "config", "area_bands.json")
+DEFAULT_EDGES = (90, 105, 120, 140)
+CUBE_KEYS = ["物业类型", "户型", "面积段"]
+
+
+def _format_edge(edge: float) -> str:
+    return f"{edge:g}"
+
+
+def band_labels(edges: Sequence[float]) -> List[str]:
+    """[90, 105] -> ["90㎡以下", "90-105㎡", "105㎡以上"]"""
+    edges = [_format_edge(e) for e in edges]
+    return ([f"{edges[0]}㎡以下"] + [f"{lo}-{hi}㎡" for lo, hi in zip(edges, edges[1:])]
+            + [f"{edges[-1]}㎡以上"])
+
+
+def load_area_bands(city: Optional[str] = None, config_path: str = DEFAULT_CONFIG_PATH) -> List[float]:
+    """
+    Band edges for city (the "default" entry when the city has none).
+
+    A missing config file gives the built-in 90/105/120/140 edges.
+
+    Raises:
+        ValueError: if the configured edges are empty or not strictly increasing.
+    """
+    config: Dict = {}
+    if os.path.exists(config_path):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    edges = (config.get("cities") or {}).get(city) if city else None
+    if edges is None:
+        edges = config.get("default", DEFAULT_EDGES)
+    edges = [float(e) for e in edges]
+    if not edges or any(lo >= hi for lo, hi in zip(edges, edges[1:])):
+        raise ValueError(f"面积段边界必须非空且严格递增: {edges}")
+    return edges
+
+
+def categorize_areas(areas: pd.Series, edges: Sequence[float] = DEFAULT_EDGES) -> pd.Series:
+    """
+    Band labels for a column of areas, rounded to whole ㎡ first (half to even, like round()).
+
+    Returns an object Series of labels aligned with areas; NaN areas stay NaN.
+    """
+    bins = [-np.inf] + list(edges) + [np.inf]
+    banded = pd.cut(areas.astype("float64").round(), bins=bins, right=False, labels=band_labels(edges))
+    return banded.astype(object)
+
+
+def build_supply_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per (物业类型, 户型, 面积段) with 单元数, 占总项目比例 and 占该类型比例 (fractions).
+
+    Rows keep the first-appearance order of the combinations in df, so
+    re-aggregations with sort=False rank ties like value_counts on df.
+    """
+    cube = df.groupby(CUBE_KEYS, sort=False).size().rename("单元数").reset_index()
+    cube["占总项目比例"] = cube["单元数"] / cube["单元数"].sum()
+    cube["占该类型比例"] = cube["单元数"] / cube.groupby("物业类型", sort=False)["单元数"].transform("sum")
+    return cube
+
+
+def cube_counts(cube: pd.DataFrame, by) -> pd.Series:
+    """Unit counts by one key, ordered like value_counts(): most units first."""
+    return cube.groupby(by, sort=False)["单元数"].sum().sort_values(ascending=False)
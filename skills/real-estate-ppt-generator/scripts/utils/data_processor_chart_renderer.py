@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+Headless renderer for the deal chart (bars + price lines + monthly table).
+
+Setting up matplotlib and building a styled figure costs more than drawing a
+project's data into it, so the renderer keeps both warm for the life of the
+process:
+
+- matplotlib is switched to Agg and the fonts are configured once
+- one ``ChartTemplate`` per figure layout (number of table blocks) holds the
+  figure, axes, grid, labels and tick styling; a render removes the previous
+  project's bars, lines and tables, draws the new ones and saves
+- ``render_batch`` renders many projects, optionally on a process pool whose
+  workers each keep their own templates
+
+Besides PNG every render can write SVG (and EMF, converted from the SVG with
+Inkscape when it is installed, matplotlib has no EMF backend); formats come
+from the ``formats`` argument or ``CHART_FORMATS`` (default "png,svg").
+"""
+
+import math
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import matplotlib.ticker as ticker  # noqa: E402
+import numpy as np  # noqa: E402
+
+DEFAULT_FORMATS = ("png", "svg")
+DEFAULT_DPI = 300
+TABLE_CHUNK_SIZE = 25
+CHART_H = 4.0
+SPACER_H = 0.4
+TABLE_H_PER_CHUNK = 0.8
+HEADER_BG = "#f2f2f2"
+
+_configured = False
+
+
+def configure_matplotlib() -> None:
+    """Fonts and minus sign for Chinese labels; done once per process."""
+    global _configured
+    if _configured:
+        return
+    matplotlib.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'Noto Sans CJK SC']
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    _configured = True
+
+
+def chart_formats(formats: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+    """Requested output formats, PNG always first (the slides use it)."""
+    if formats is None:
+        formats = [f.strip() for f in os.getenv("CHART_FORMATS", ",".join(DEFAULT_FORMATS)).split(",")]
+    return tuple(dict.fromkeys(["png"] + [f.lower() for f in formats if f]))
+
+
+def type_palette(n_types: int) -> List[Tuple[float, float, float]]:
+    """Base colors per type: tab10, or tab20 for more than 10 types (same as seaborn.color_palette)."""
+    name = "tab10" if n_types <= 10 else "tab20"
+    colors = matplotlib.colormaps[name].colors
+    return [tuple(colors[i % len(colors)][:3]) for i in range(max(1, n_types))]
+
+
+@dataclass
+class TableBlock:
+    col_labels: List[str]                 # "" + month labels
+    cell_text: List[List[str]]            # row label + values
+    price_rows: List[int]                 # data row indices of price rows
+    label_colors: Dict[int, str] = field(default_factory=dict)  # data row index -> first-cell color
+
+
+@dataclass
+class DealChart:
+    x_labels: List[str]
+    bars: List[Tuple[str, Any, Any]]      # (series name, counts, color) per type
+    lines: List[Tuple[str, Any, Any]]     # (series name, prices in 万/㎡, color) per type
+    price_ylim: Optional[Tuple[float, float]]
+    tables: List[Optional[TableBlock]]    # one per chunk of TABLE_CHUNK_SIZE months; None = empty block
+
+    @property
+    def n_chunks(self) -> int:
+        return max(1, len(self.tables))
+
+
+class ChartTemplate:
+    """Styled figure for a fixed number of table blocks; data artists are swapped per render."""
+
+    def __init__(self, n_chunks: int):
+        configure_matplotlib()
+        self.n_chunks = n_chunks
+        fig_h_total = CHART_H + SPACER_H + n_chunks * TABLE_H_PER_CHUNK + (n_chunks - 1) * 0.6
+        self.fig = plt.figure(figsize=(20, fig_h_total), layout="constrained")
+        gs = self.fig.add_gridspec(n_chunks + 2, 1,
+                                   height_ratios=[CHART_H, SPACER_H] + [TABLE_H_PER_CHUNK] * n_chunks)
+
+        # 主图：网格在图层后面，淡灰色水平辅助线
+        self.ax = self.fig.add_subplot(gs[0])
+        self.ax.set_axisbelow(True)
+        self.ax.yaxis.grid(True, color='#e6e6e6', linestyle='-', linewidth=0.8, alpha=0.9)
+        self.ax.tick_params(axis='y', labelsize=14)
+        self.ax.set_ylabel('成交套数 (套)', fontsize=16)
+        self.ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
+
+        self.ax2 = self.ax.twinx()
+        self.ax2.set_ylabel('成交均价 (万/㎡)', fontsize=16)
+        self.ax2.tick_params(labelsize=14)
+
+        self.table_axes = []
+        for chunk_idx in range(n_chunks):
+            ax_table = self.fig.add_subplot(gs[chunk_idx + 2])
+            ax_table.axis('off')
+            self.table_axes.append(ax_table)
+        self._artists: List[Any] = []
+
+    def clear(self) -> None:
+        """Remove the previous render's bars, lines and tables."""
+        for artist in self._artists:
+            artist.remove()
+        self._artists = []
+
+    def draw(self, chart: DealChart) -> None:
+        self.clear()
+        # constrained_layout starts from the current positions; start where a new figure would.
+        # set_position() takes the axes out of the layout, so opt them back in.
+        for axes in self.fig.axes:
+            axes.set_position(axes.get_subplotspec().get_position(self.fig))
+            axes.set_in_layout(True)
+        ax, ax2 = self.ax, self.ax2
+        x = np.arange(len(chart.x_labels))
+
+        if chart.bars:
+            total_bar_width = 0.78
+            bar_w = total_bar_width / len(chart.bars)
+            offsets = (np.arange(len(chart.bars)) - (len(chart.bars) - 1) / 2) * bar_w
+            for i, (_, vals, color) in enumerate(chart.bars):
+                self._artists.extend(ax.bar(x + offsets[i], vals, bar_w * 0.92, color=color, alpha=0.96))
+        ax.set_xticks(x)
+        ax.set_xticklabels(chart.x_labels, rotation=90, ha='center', fontsize=14)
+
+        for _, vals, color in chart.lines:
+            self._artists.extend(ax2.plot(x, vals, marker='o', linestyle='-', linewidth=1.6, markersize=5,
+                                          color=color, markerfacecolor='white', markeredgewidth=1.4,
+                                          markeredgecolor=color))
+        # Limits as a freshly built figure would get them (no prices: the default 0-1)
+        ax2.relim()
+        ax2.set_ylim(*(chart.price_ylim or (0, 1)))
+        ax.relim()
+        ax.set_autoscale_on(True)
+        ax.autoscale_view()
+
+        for ax_table, block in zip(self.table_axes, chart.tables):
+            if block is not None:
+                self._artists.append(self._draw_table(ax_table, block))
+
+    @staticmethod
+    def _draw_table(ax_table, block: TableBlock):
+        n_cols = len(block.cell_text[0]) - 1 if block.cell_text else 0
+        table = ax_table.table(cellText=block.cell_text, colLabels=block.col_labels,
+                               cellLoc='center', loc='center')
+        table.auto_set_font_size(False)
+        # 表格字号随列数变化
+        if n_cols > 20:
+            base_font = 8.5
+        elif n_cols > 16:
+            base_font = 9.5
+        elif n_cols > 12:
+            base_font = 10.0
+        else:
+            base_font = 14
+        table.set_fontsize(base_font)
+        table.scale(1, 0.9 + max(0, (n_cols - 6) * 0.012))
+
+        cells = table.get_celld()
+        first_col_texts = [cell.get_text().get_text() for (r, c), cell in cells.items() if c == 0]
+        max_chars = max(len(t) for t in first_col_texts) if first_col_texts else 6
+        first_col_width = max(0.08, min(0.25, max_chars * 0.014))
+        for (r, c), cell in cells.items():
+            if c == 0:
+                cell.set_width(first_col_width)
+
+        for j in range(len(block.col_labels)):
+            if (0, j) in cells:
+                hcell = cells[(0, j)]
+                hcell.set_facecolor(HEADER_BG)
+                hcell.get_text().set_weight("bold")
+                hcell.get_text().set_fontsize(max(7, base_font + 1))
+
+        for (r, c), cell in cells.items():
+            if r == 0:
+                continue
+            if (r - 1) in block.price_rows:
+                cell.get_text().set_fontsize(max(7, base_font - 0))
+            else:
+                cell.get_text().set_fontsize(base_font)
+
+        for row_idx, color in block.label_colors.items():
+            cell = cells.get((row_idx + 1, 0))
+            if cell is not None:
+                cell.set_facecolor(color)
+                cell.get_text().set_color('white')
+                cell.get_text().set_weight('bold')
+        return table
+
+
+def _svg_to_emf(svg_path: str, emf_path: str) -> bool:
+    inkscape = shutil.which("inkscape")
+    if inkscape is None:
+        print("[WARN] 未安装 Inkscape，跳过 EMF 输出")
+        return False
+    try:
+        subprocess.run([inkscape, svg_path, "--export-type=emf", f"--export-filename={emf_path}"],
+                       check=True, capture_output=True, timeout=120)
+        return True
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"[WARN] EMF 转换失败: {e}")
+        return False
+
+
+class ChartRenderer:
+    """Keeps one ChartTemplate per layout and renders DealCharts into them."""
+
+    def __init__(self):
+        self._templates: Dict[int, ChartTemplate] = {}
+        self._lock = threading.Lock()  # templates are shared; one render at a time per process
+
+    def template(self, n_chunks: int) -> ChartTemplate:
+        if n_chunks not in self._templates:
+            self._templates[n_chunks] = ChartTemplate(n_chunks)
+        return self._templates[n_chunks]
+
+    def render(self, chart: DealChart, output_base: str, formats: Optional[Sequence[str]] = None,
+               dpi: int = DEFAULT_DPI) -> Dict[str, str]:
+        """
+        Draw chart and save it as output_base + ".png" (and the other formats).
+
+        Returns:
+        - dict: {format: path} of the files written
+        """
+        outputs = {}
+        with self._lock:
+            template = self.template(chart.n_chunks)
+            template.draw(chart)
+            for fmt in chart_formats(formats):
+                path = f"{output_base}.{fmt}"
+                if fmt == "emf":
+                    svg_path = outputs.get("svg") or f"{output_base}.svg"
+                    if "svg" not in outputs:
+                        template.fig.savefig(svg_path, dpi=dpi)
+                    if _svg_to_emf(svg_path, path):
+                        outputs[fmt] = path
+                    if "svg" not in outputs:
+                        os.remove(svg_path)
+                    continue
+                template.fig.savefig(path, dpi=dpi)
+                outputs[fmt] = path
+        return outputs
+
+
+_renderer: Optional[ChartRenderer] = None
+
+
+def get_renderer() -> ChartRenderer:
+    """The process-wide renderer (templates persist across projects)."""
+    global _renderer
+    if _renderer is None:
+        _renderer = ChartRenderer()
+    return _renderer
+
+
+def chunk_count(n_months: int) -> int:
+    return max(1, math.ceil(n_months / TABLE_CHUNK_SIZE))
+
+
+def _render_project(project_name: str, timestamp: Optional[str], formats: Optional[Sequence[str]]) -> Dict[str, Any]:
+    try:
+        from .data_processor_draw_table_picture import run
+    except ImportError:
+        from data_processor_draw_table_picture import run
+    try:
+        return {"project_name": project_name, **run(project_name, timestamp=timestamp, formats=formats)}
+    except Exception as e:
+        return {"project_name": project_name, "error": str(e)}
+
+
+def render_batch(project_names: Sequence[str], timestamp: Optional[str] = None,
+                 formats: Optional[Sequence[str]] = None, max_workers: int = 1) -> List[Dict[str, Any]]:
+    """
+    Render the deal chart of every project (default input paths).
+
+    max_workers > 1 spreads the projects over a process pool; every worker
+    keeps its own warm renderer.
+    """
+    worker = partial(_render_project, timestamp=timestamp, formats=formats)
+    if max_workers > 1 and len(project_names) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=configure_matplotlib) as executor:
+            return list(executor.map(worker, project_names))
+    return [worker(name) for name in project_names]
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk ingestion of crawled CRIC files into one Parquet file.
+
+Walks a directory tree for ``{project}_基本信息.txt`` / ``{project}_土地信息.txt``,
+parses every project on a process pool with the regular CRIC parsers and
+writes one row per project directory:
+
+- typed columns (prices, areas, ratios as float64, dates as datetime64) for
+  market-wide queries, numbers parsed with ``_parse_numeric_value``
+- ``housing_json`` / ``land_json`` with the full parser output, so per-project
+  consumers such as ``extract_table_data`` get exactly what ``save_json()``
+  would have written
+
+    python scripts/utils/data_processor_cric_bulk_ingest.py resources/working_data \\
+        --output resources/working_data/cric_corpus.parquet --workers 8
+
+Requires pyarrow (pandas' Parquet engine).
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from .data_processor_cric_housing_parser import CRICHousingParser
+    from .data_processor_cric_land_parser import CRICLandParser
+except ImportError:
+    from data_processor_cric_housing_parser import CRICHousingParser
+    from data_processor_cric_land_parser import CRICLandParser
+
+DEFAULT_DATASET_PATH = os.path.join("resources", "working_data", "cric_corpus.parquet")
+HOUSING_SUFFIX = "_基本信息.txt"
+LAND_SUFFIX = "_土地信息.txt"
+
+# (column, kind, paths into the parser outputs); the first path that has a value wins
+TYPED_COLUMNS: List[Tuple[str, str, List[Tuple[str, ...]]]] = [
+    ("所属城市", "text", [("housing", "基本信息", "所属城市"), ("land", "基本信息", "所属城市")]),
+    ("区域", "text", [("housing", "基本信息", "区域"), ("land", "基本信息", "所在区域")]),
+    ("板块", "text", [("housing", "基本信息", "板块"), ("land", "基本信息", "板块")]),
+    ("环线位置", "text", [("housing", "基本信息", "环线位置"), ("land", "基本信息", "环线位置")]),
+    ("销售状态", "text", [("housing", "基本信息", "销售状态")]),
+    ("开发商", "text", [("housing", "企业信息", "开发商"), ("land", "土地概要信息", "开发商")]),
+    ("物业管理", "text", [("housing", "企业信息", "物业管理")]),
+    ("物业类型", "text", [("housing", "产品综览", "overview", "物业类型")]),
+    ("土地属性", "text", [("land", "基本信息", "土地属性"), ("land", "土地概要信息", "土地属性")]),
+    ("最早开工时间", "date", [("housing", "基本信息", "最早开工时间")]),
+    ("最早开盘时间", "date", [("housing", "基本信息", "最早开盘时间")]),
+    ("最晚交房时间", "date", [("housing", "基本信息", "最晚交房时间")]),
+    ("成交时间", "date", [("land", "成交信息", "成交时间")]),
+    ("总建面积", "number", [("housing", "产品综览", "overview", "总建面积"), ("land", "基本信息", "总建面积")]),
+    ("用地面积", "number", [("land", "基本信息", "用地面积")]),
+    ("容积率", "number", [("housing", "产品综览", "overview", "容积率"), ("land", "基本信息", "容积率")]),
+    ("绿化率", "number", [("housing", "产品综览", "overview", "绿化率"), ("land", "基本信息", "绿化率")]),
+    ("规划户数", "number", [("housing", "产品综览", "overview", "规划户数")]),
+    ("成交总价", "number", [("land", "成交信息", "成交总价"), ("land", "土地概要信息", "成交总价")]),
+    ("楼板价", "number", [("land", "成交信息", "楼板价"), ("land", "土地概要信息", "楼板价")]),
+    ("出让底价", "number", [("land", "上市信息", "出让底价"), ("land", "土地概要信息", "出让底价")]),
+    ("溢价率", "number", [("land", "成交信息", "溢价率"), ("land", "土地概要信息", "溢价率")]),
+]
+
+
+def discover_projects(root: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Find project directories under root.
+
+    Returns:
+    - list: [{"project_name", "source_dir", "housing_path", "land_path"}, ...]; a missing file is None
+    """
+    projects: Dict[Tuple[str, str], Dict[str, Optional[str]]] = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            for suffix, field in ((HOUSING_SUFFIX, "housing_path"), (LAND_SUFFIX, "land_path")):
+                if filename.endswith(suffix) and len(filename) > len(suffix):
+                    name = filename[:-len(suffix)]
+                    entry = projects.setdefault((dirpath, name), {
+                        "project_name": name, "source_dir": dirpath, "housing_path": None, "land_path": None})
+                    entry[field] = os.path.join(dirpath, filename)
+    return [projects[key] for key in sorted(projects)]
+
+
+def _lookup(data: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+def _parse_project(project: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """Process-pool worker: parse one project and flatten it into a row."""
+    housing_parser = CRICHousingParser()
+    sources: Dict[str, Dict[str, Any]] = {"housing": {}, "land": {}}
+    errors = []
+    for source, path, parser in (("housing", project["housing_path"], housing_parser),
+                                 ("land", project["land_path"], CRICLandParser())):
+        if not path:
+            continue
+        try:
+            sources[source] = parser.parse_all_sections(path)
+        except Exception as e:
+            errors.append(f"{os.path.basename(path)}: {e}")
+
+    row: Dict[str, Any] = {
+        "project_name": project["project_name"],
+        "source_dir": project["source_dir"],
+        "housing_json": json.dumps(sources["housing"], ensure_ascii=False) if sources["housing"] else None,
+        "land_json": json.dumps(sources["land"], ensure_ascii=False) if sources["land"] else None,
+        "parse_error": "; ".join(errors) or None,
+    }
+    for column, kind, paths in TYPED_COLUMNS:
+        value = next((v for v in (_lookup(sources[p[0]], p[1:]) for p in paths)
+                      if isinstance(v, str) and v.strip()), None)
+        if value is not None and kind == "number":
+            value = housing_parser._parse_numeric_value(value)
+            value = value if isinstance(value, float) else None
+        row[column] = value
+    return row
+
+
+def build_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Rows -> DataFrame with the typed column dtypes applied."""
+    columns = ["project_name", "source_dir"] + [c[0] for c in TYPED_COLUMNS] + \
+              ["housing_json", "land_json", "parse_error"]
+    df = pd.DataFrame(rows, columns=columns)
+    for column, kind, _ in TYPED_COLUMNS:
+        if kind == "number":
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+        elif kind == "date":
+            df[column] = pd.to_datetime(df[column].str.replace("/", "-", regex=False).str.extract(
+                r"(\d{4}-\d{1,2}(?:-\d{1,2})?)", expand=False), errors="coerce", format="mixed")
+        else:
+            df[column] = df[column].astype("string")
+    df["parse_error"] = df["parse_error"].astype("string")
+    return df
+
+
+def ingest(root: str, output_path: str = DEFAULT_DATASET_PATH, max_workers: int = None) -> Dict[str, Any]:
+    """
+    Parse every project under root and write the Parquet file.
+
+    Returns:
+    - dict: {"success": bool, "output": str, "projects": int, "failed": [project_name, ...], "error": str}
+    """
+    projects = discover_projects(root)
+    if not projects:
+        return {"success": False, "output": output_path, "projects": 0, "failed": [],
+                "error": f"{root} 下没有找到 *{HOUSING_SUFFIX} / *{LAND_SUFFIX} 文件"}
+
+    start = time.time()
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers > 1 and len(projects) > 1:
+        chunksize = max(1, len(projects) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rows = list(executor.map(_parse_project, projects, chunksize=chunksize))
+    else:
+        rows = [_parse_project(project) for project in projects]
+
+    df = build_frame(rows)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp = f"{output_path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp, index=False, compression="zstd")
+    os.replace(tmp, output_path)
+
+    failed = df.loc[df["parse_error"].notna(), "project_name"].tolist()
+    for row in rows:
+        if row["parse_error"]:
+            print(f"[WARN] {row['project_name']} 解析失败: {row['parse_error']}")
+    print(f"[OK] {len(df)} 个项目已写入 {output_path}（{time.time() - start:.1f}s）")
+    return {"success": True, "output": output_path, "projects": len(df), "failed": failed, "error": ""}
+
+
+def read_dataset(path: str = DEFAULT_DATASET_PATH, columns: List[str] = None, filters=None) -> pd.DataFrame:
+    """
+    Read the corpus, optionally only some columns / rows (pyarrow filters, e.g. [("所属城市", "==", "上海")]).
+    """
+    return pd.read_parquet(path, columns=columns, filters=filters)
+
+
+def load_project(project_name: str, path: str = DEFAULT_DATASET_PATH) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Parsed (housing_data, land_data) of one project, as save_json() would have written them.
+
+    The latest source directory wins when a project was ingested from several snapshots.
+
+    Raises:
+        KeyError: if the project is not in the dataset.
+    """
+    df = read_dataset(path, columns=["project_name", "source_dir", "housing_json", "land_json"],
+                      filters=[("project_name", "==", project_name)])
+    if df.empty:
+        raise KeyError(f"{project_name} 不在 {path} 中")
+    row = df.sort_values("source_dir").iloc[-1]
+    return tuple(json.loads(row[column]) if isinstance(row[column], str) else {}
+                 for column in ("housing_json", "land_json"))
+
+
+def run(project_name: str = None, root: str = os.path.join("resources", "working_data"),
+        output_path: str = DEFAULT_DATASET_PATH, max_workers: int = None) -> Dict[str, Any]:
+    """Ingest everything under root; project_name is accepted for the usual run() signature and ignored."""
+    try:
+        return ingest(root, output_path, max_workers)
+    except ImportError as e:
+        print(f"[ERROR] 写入 Parquet 需要 pyarrow: {e}")
+        return {"success": False, "output": output_path, "projects": 0, "failed": [], "error": str(e)}
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="批量解析 CRIC 文本并写入 Parquet")
+    arg_parser.add_argument("root", nargs="?", default=os.path.join("resources", "working_data"))
+    arg_parser.add_argument("--output", default=DEFAULT_DATASET_PATH)
+    arg_parser.add_argument("--workers", type=int, help="解析进程数，默认 CPU 核数")
+    args = arg_parser.parse_args()
+    print(run(root=args.root, output_path=args.output, max_workers=args.workers))
@@ -13,6 +13,11 @@ from typing import Dict, List, Any, Union
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from .data_processor_cric_section_index import SectionIndex, extract_line_pairs, extract_missing_keys
+except ImportError:
+    from data_processor_cric_section_index import SectionIndex, extract_line_pairs, extract_missing_keys
+
 class CRICHousingParser:
     """Parser for CRIC housing project data files."""
     
@@ -21,6 +26,7 @@ class CRICHousingParser:
             "基本信息:", "企业信息:", "产品综览:", "产品细节:", 
             "装修情况:", "预证信息:", "开盘信息:", "营销信息:", "住宅图片："
         ]
+        self._index = None
     
     def read_file(self, file_path: str) -> List[str]:
         """Read the file and return lines as a list."""
@@ -32,31 +38,15 @@ class CRICHousingParser:
             with open(file_path, 'r', encoding='gb2312') as file:
                 return [line.strip() for line in file.readlines()]
     
+    def build_index(self, lines: List[str]) -> SectionIndex:
+        """Index every section label in one pass; reused by all parse_* calls on the same lines."""
+        if self._index is None or self._index.lines is not lines:
+            self._index = SectionIndex(lines, self.sections)
+        return self._index
+    
     def extract_section(self, lines: List[str], start_label: str, end_label: str = None) -> List[str]:
         """Extract content for a specific section."""
-        try:
-            start_idx = next(i for i, line in enumerate(lines) if start_label in line)
-            if end_label:
-                try:
-                    end_idx = next(i for i in range(start_idx + 1, len(lines)) 
-                                 if end_label in lines[i])
-                    return lines[start_idx + 1:end_idx]
-                except StopIteration:
-                    return lines[start_idx + 1:]
-            else:
-                # Find next section or end of file
-                next_sections = [s for s in self.sections if s != start_label]
-                end_idx = len(lines)
-                for section in next_sections:
-                    try:
-                        idx = next(i for i in range(start_idx + 1, len(lines)) 
-                                 if section in lines[i])
-                        end_idx = min(end_idx, idx)
-                    except StopIteration:
-                        continue
-                return lines[start_idx + 1:end_idx]
-        except StopIteration:
-            return []
+        return self.build_index(lines).section(start_label, end_label)
     
     def parse_key_value_pairs(self, lines: List[str]) -> Dict[str, Any]:
         """Parse key-value pairs from lines of text."""
@@ -142,54 +132,9 @@ class CRICHousingParser:
         ]
         
         result = {}
-        key_value_patterns = [
-            r"(所属城市)[:：]\s*(.+?)(?=\n|$)",
-            r"(区域)[:：]\s*(.+?)(?=\n|$)",
-            r"(板块)[:：]\s*(.+?)(?=\n|$)",
-            r"(环线位置)[:：]\s*(.+?)(?=\n|$)",
-            r"(销售状态)[:：]\s*(.+?)(?=\n|$)",
-            r"(产权类型)[:：]\s*(.+?)(?=\n|$)",
-            r"(产权年限)[:：]\s*(.+?)(?=\n|$)",
-            r"(最早开工时间)[:：]\s*(.+?)(?=\n|$)",
-            r"(最早开盘时间)[:：]\s*(.+?)(?=\n|$)",
-            r"(最晚交房时间)[:：]\s*(.+?)(?=\n|$)",
-            r"(楼盘地址)[:：]\s*(.+?)(?=\n|$)",
-            r"(售楼处地址)[:：]\s*(.+?)(?=\n|$)",
-            r"(项目四至)[:：]\s*(.+?)(?=\n|$)",
-            r"(售楼处电话)[:：]\s*(.+?)(?=\n|$)"
-        ]
         
         # First, try direct key-value mapping on separate lines
-        current_key = None
-        i = 0
-        
-        while i < len(section_lines):
-            line = section_lines[i].strip()
-            if not line:
-                i += 1
-                continue
-            
-            # Check if this is a key
-            found_key = None
-            for expected_key in basic_info_keys:
-                if line == expected_key:
-                    found_key = expected_key
-                    break
-            
-            if found_key:
-                # This is a key, collect the next non-empty line as value
-                current_key = found_key
-                i += 1
-                
-                while i < len(section_lines):
-                    value_line = section_lines[i].strip()
-                    if value_line and value_line not in basic_info_keys:
-                        result[current_key] = value_line
-                        i += 1
-                        break
-                    i += 1
-            else:
-                i += 1
+        result.update(extract_line_pairs(section_lines, basic_info_keys))
         
         # Handle missing keys by processing the entire text
         self._extract_missing_basic_info(section_lines, result, basic_info_keys)
@@ -198,26 +143,7 @@ class CRICHousingParser:
     
     def _extract_missing_basic_info(self, lines: List[str], result: Dict[str, Any], expected_keys: List[str]) -> None:
         """Extract any missing basic info keys from the raw text."""
-        text = "\n".join(lines)
-        
-        # Create comprehensive patterns for key-value extraction
-        for key in expected_keys:
-            if key not in result or not result[key].strip():
-                # Look for key on its own line followed by value on next line
-                pattern = r"{}\n\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                match = re.search(pattern, text, re.MULTILINE)
-                if match:
-                    value = match.group(1).strip()
-                    if value and not any(k in value for k in expected_keys):
-                        result[key] = value
-                else:
-                    # Look for key:value format
-                    pattern = r"{}[:：]\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                    match = re.search(pattern, text, re.MULTILINE)
-                    if match:
-                        value = match.group(1).strip()
-                        if value:
-                            result[key] = value
+        extract_missing_keys(lines, result, expected_keys)
     
     def parse_company_info(self, lines: List[str]) -> Dict[str, Any]:
         """Parse company information section with fine-grained key extraction."""
@@ -231,36 +157,7 @@ class CRICHousingParser:
         result = {}
         
         # First, try direct key-value mapping on separate lines
-        current_key = None
-        i = 0
-        
-        while i < len(section_lines):
-            line = section_lines[i].strip()
-            if not line:
-                i += 1
-                continue
-            
-            # Check if this is a key
-            found_key = None
-            for expected_key in company_info_keys:
-                if line == expected_key:
-                    found_key = expected_key
-                    break
-            
-            if found_key:
-                # This is a key, collect the next non-empty line as value
-                current_key = found_key
-                i += 1
-                
-                while i < len(section_lines):
-                    value_line = section_lines[i].strip()
-                    if value_line and value_line not in company_info_keys:
-                        result[current_key] = value_line
-                        i += 1
-                        break
-                    i += 1
-            else:
-                i += 1
+        result.update(extract_line_pairs(section_lines, company_info_keys))
         
         # Handle missing keys by processing the entire text
         self._extract_missing_company_info(section_lines, result, company_info_keys)
@@ -269,26 +166,7 @@ class CRICHousingParser:
     
     def _extract_missing_company_info(self, lines: List[str], result: Dict[str, Any], expected_keys: List[str]) -> None:
         """Extract any missing company info keys from the raw text."""
-        text = "\n".join(lines)
-        
-        # Create comprehensive patterns for key-value extraction
-        for key in expected_keys:
-            if key not in result or not result[key].strip():
-                # Look for key on its own line followed by value on next line
-                pattern = r"{}\n\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                match = re.search(pattern, text, re.MULTILINE)
-                if match:
-                    value = match.group(1).strip()
-                    if value and not any(k in value for k in expected_keys):
-                        result[key] = value
-                else:
-                    # Look for key:value format
-                    pattern = r"{}[:：]\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                    match = re.search(pattern, text, re.MULTILINE)
-                    if match:
-                        value = match.group(1).strip()
-                        if value:
-                            result[key] = value
+        extract_missing_keys(lines, result, expected_keys)
     
     def parse_product_overview(self, lines: List[str]) -> Dict[str, Any]:
         """Parse product overview section including building types with nested key-value structure."""
@@ -515,6 +393,7 @@ class CRICHousingParser:
     def parse_all_sections(self, file_path: str) -> Dict[str, Any]:
         """Parse all sections from the file."""
         lines = self.read_file(file_path)
+        self.build_index(lines)
         
         result = {
             "基本信息": self.parse_basic_info(lines),
@@ -13,6 +13,11 @@ from typing import Dict, List, Any, Union
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from .data_processor_cric_section_index import SectionIndex, extract_line_pairs, extract_missing_keys
+except ImportError:
+    from data_processor_cric_section_index import SectionIndex, extract_line_pairs, extract_missing_keys
+
 class CRICLandParser:
     """Parser for CRIC land parcel data files."""
     
@@ -20,6 +25,7 @@ class CRICLandParser:
         self.sections = [
             "基本信息:", "上市信息：", "成交信息:", "标书文件:"
         ]
+        self._index = None
     
     def read_file(self, file_path: str) -> List[str]:
         """Read the file and return lines as a list."""
@@ -31,31 +37,15 @@ class CRICLandParser:
             with open(file_path, 'r', encoding='gb2312') as file:
                 return [line.strip() for line in file.readlines()]
     
+    def build_index(self, lines: List[str]) -> SectionIndex:
+        """Index every section label in one pass; reused by all parse_* calls on the same lines."""
+        if self._index is None or self._index.lines is not lines:
+            self._index = SectionIndex(lines, self.sections)
+        return self._index
+    
     def extract_section(self, lines: List[str], start_label: str, end_label: str = None) -> List[str]:
         """Extract content for a specific section."""
-        try:
-            start_idx = next(i for i, line in enumerate(lines) if start_label in line)
-            if end_label:
-                try:
-                    end_idx = next(i for i in range(start_idx + 1, len(lines)) 
-                                 if end_label in lines[i])
-                    return lines[start_idx + 1:end_idx]
-                except StopIteration:
-                    return lines[start_idx + 1:]
-            else:
-                # Find next section or end of file
-                next_sections = [s for s in self.sections if s != start_label]
-                end_idx = len(lines)
-                for section in next_sections:
-                    try:
-                        idx = next(i for i in range(start_idx + 1, len(lines)) 
-                                 if section in lines[i])
-                        end_idx = min(end_idx, idx)
-                    except StopIteration:
-                        continue
-                return lines[start_idx + 1:end_idx]
-        except StopIteration:
-            return []
+        return self.build_index(lines).section(start_label, end_label)
     
     def parse_key_value_pairs(self, lines: List[str]) -> Dict[str, Any]:
         """Parse key-value pairs from lines of text."""
@@ -134,9 +124,12 @@ class CRICLandParser:
         general_info = {}
         
         # Look for lines between "功能导航" and "基本信息:"
+        index = self.build_index(lines)
         try:
-            func_nav_idx = next(i for i, line in enumerate(lines) if "功能导航" in line)
-            basic_info_idx = next(i for i, line in enumerate(lines) if "基本信息:" in line)
+            func_nav_idx = index.first("功能导航")
+            basic_info_idx = index.first("基本信息:")
+            if func_nav_idx is None or basic_info_idx is None:
+                return general_info
             
             relevant_lines = lines[func_nav_idx + 1:basic_info_idx]
             
@@ -214,36 +207,7 @@ class CRICLandParser:
         result = {}
         
         # First, try direct key-value mapping on separate lines
-        current_key = None
-        i = 0
-        
-        while i < len(section_lines):
-            line = section_lines[i].strip()
-            if not line:
-                i += 1
-                continue
-            
-            # Check if this is a key
-            found_key = None
-            for expected_key in basic_info_keys:
-                if line == expected_key:
-                    found_key = expected_key
-                    break
-            
-            if found_key:
-                # This is a key, collect the next non-empty line as value
-                current_key = found_key
-                i += 1
-                
-                while i < len(section_lines):
-                    value_line = section_lines[i].strip()
-                    if value_line and value_line not in basic_info_keys:
-                        result[current_key] = value_line
-                        i += 1
-                        break
-                    i += 1
-            else:
-                i += 1
+        result.update(extract_line_pairs(section_lines, basic_info_keys))
         
         # Handle missing keys by processing the entire text
         self._extract_missing_basic_info(section_lines, result, basic_info_keys)
@@ -252,26 +216,7 @@ class CRICLandParser:
     
     def _extract_missing_basic_info(self, lines: List[str], result: Dict[str, Any], expected_keys: List[str]) -> None:
         """Extract any missing basic info keys from the raw text."""
-        text = "\n".join(lines)
-        
-        # Create comprehensive patterns for key-value extraction
-        for key in expected_keys:
-            if key not in result or not result[key].strip():
-                # Look for key on its own line followed by value on next line
-                pattern = r"{}\n\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                match = re.search(pattern, text, re.MULTILINE)
-                if match:
-                    value = match.group(1).strip()
-                    if value and not any(k in value for k in expected_keys):
-                        result[key] = value
-                else:
-                    # Look for key:value format
-                    pattern = r"{}[:：]\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                    match = re.search(pattern, text, re.MULTILINE)
-                    if match:
-                        value = match.group(1).strip()
-                        if value:
-                            result[key] = value
+        extract_missing_keys(lines, result, expected_keys)
     
     def parse_listing_info(self, lines: List[str]) -> Dict[str, Any]:
         """Parse listing/market information section."""
@@ -288,36 +233,7 @@ class CRICLandParser:
         result = {}
         
         # First, try direct key-value mapping on separate lines
-        current_key = None
-        i = 0
-        
-        while i < len(section_lines):
-            line = section_lines[i].strip()
-            if not line:
-                i += 1
-                continue
-            
-            # Check if this is a key
-            found_key = None
-            for expected_key in listing_info_keys:
-                if line == expected_key:
-                    found_key = expected_key
-                    break
-            
-            if found_key:
-                # This is a key, collect the next non-empty line as value
-                current_key = found_key
-                i += 1
-                
-                while i < len(section_lines):
-                    value_line = section_lines[i].strip()
-                    if value_line and value_line not in listing_info_keys:
-                        result[current_key] = value_line
-                        i += 1
-                        break
-                    i += 1
-            else:
-                i += 1
+        result.update(extract_line_pairs(section_lines, listing_info_keys))
         
         # Handle missing keys by processing the entire text
         self._extract_missing_listing_info(section_lines, result, listing_info_keys)
@@ -326,26 +242,7 @@ class CRICLandParser:
     
     def _extract_missing_listing_info(self, lines: List[str], result: Dict[str, Any], expected_keys: List[str]) -> None:
         """Extract any missing listing info keys from the raw text."""
-        text = "\n".join(lines)
-        
-        # Create comprehensive patterns for key-value extraction
-        for key in expected_keys:
-            if key not in result or not result[key].strip():
-                # Look for key on its own line followed by value on next line
-                pattern = r"{}\n\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                match = re.search(pattern, text, re.MULTILINE)
-                if match:
-                    value = match.group(1).strip()
-                    if value and not any(k in value for k in expected_keys):
-                        result[key] = value
-                else:
-                    # Look for key:value format
-                    pattern = r"{}[:：]\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                    match = re.search(pattern, text, re.MULTILINE)
-                    if match:
-                        value = match.group(1).strip()
-                        if value:
-                            result[key] = value
+        extract_missing_keys(lines, result, expected_keys)
     
     def parse_transaction_info(self, lines: List[str]) -> Dict[str, Any]:
         """Parse transaction information section."""
@@ -360,36 +257,7 @@ class CRICLandParser:
         result = {}
         
         # First, try direct key-value mapping on separate lines
-        current_key = None
-        i = 0
-        
-        while i < len(section_lines):
-            line = section_lines[i].strip()
-            if not line:
-                i += 1
-                continue
-            
-            # Check if this is a key
-            found_key = None
-            for expected_key in transaction_info_keys:
-                if line == expected_key:
-                    found_key = expected_key
-                    break
-            
-            if found_key:
-                # This is a key, collect the next non-empty line as value
-                current_key = found_key
-                i += 1
-                
-                while i < len(section_lines):
-                    value_line = section_lines[i].strip()
-                    if value_line and value_line not in transaction_info_keys:
-                        result[current_key] = value_line
-                        i += 1
-                        break
-                    i += 1
-            else:
-                i += 1
+        result.update(extract_line_pairs(section_lines, transaction_info_keys))
         
         # Handle missing keys by processing the entire text
         self._extract_missing_transaction_info(section_lines, result, transaction_info_keys)
@@ -398,26 +266,7 @@ class CRICLandParser:
     
     def _extract_missing_transaction_info(self, lines: List[str], result: Dict[str, Any], expected_keys: List[str]) -> None:
         """Extract any missing transaction info keys from the raw text."""
-        text = "\n".join(lines)
-        
-        # Create comprehensive patterns for key-value extraction
-        for key in expected_keys:
-            if key not in result or not result[key].strip():
-                # Look for key on its own line followed by value on next line
-                pattern = r"{}\n\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                match = re.search(pattern, text, re.MULTILINE)
-                if match:
-                    value = match.group(1).strip()
-                    if value and not any(k in value for k in expected_keys):
-                        result[key] = value
-                else:
-                    # Look for key:value format
-                    pattern = r"{}[:：]\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                    match = re.search(pattern, text, re.MULTILINE)
-                    if match:
-                        value = match.group(1).strip()
-                        if value:
-                            result[key] = value
+        extract_missing_keys(lines, result, expected_keys)
     
     def parse_tender_info(self, lines: List[str]) -> Dict[str, Any]:
         """Parse tender/bid document section."""
@@ -431,36 +280,7 @@ class CRICLandParser:
         result = {}
         
         # First, try direct key-value mapping on separate lines
-        current_key = None
-        i = 0
-        
-        while i < len(section_lines):
-            line = section_lines[i].strip()
-            if not line:
-                i += 1
-                continue
-            
-            # Check if this is a key
-            found_key = None
-            for expected_key in tender_info_keys:
-                if line == expected_key:
-                    found_key = expected_key
-                    break
-            
-            if found_key:
-                # This is a key, collect the next non-empty line as value
-                current_key = found_key
-                i += 1
-                
-                while i < len(section_lines):
-                    value_line = section_lines[i].strip()
-                    if value_line and value_line not in tender_info_keys:
-                        result[current_key] = value_line
-                        i += 1
-                        break
-                    i += 1
-            else:
-                i += 1
+        result.update(extract_line_pairs(section_lines, tender_info_keys))
         
         # Handle missing keys by processing the entire text
         self._extract_missing_tender_info(section_lines, result, tender_info_keys)
@@ -469,30 +289,12 @@ class CRICLandParser:
     
     def _extract_missing_tender_info(self, lines: List[str], result: Dict[str, Any], expected_keys: List[str]) -> None:
         """Extract any missing tender info keys from the raw text."""
-        text = "\n".join(lines)
-        
-        # Create comprehensive patterns for key-value extraction
-        for key in expected_keys:
-            if key not in result or not result[key].strip():
-                # Look for key on its own line followed by value on next line
-                pattern = r"{}\n\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                match = re.search(pattern, text, re.MULTILINE)
-                if match:
-                    value = match.group(1).strip()
-                    if value and not any(k in value for k in expected_keys):
-                        result[key] = value
-                else:
-                    # Look for key:value format
-                    pattern = r"{}[:：]\s*([^\n]+?)(?=\n|$)".format(re.escape(key))
-                    match = re.search(pattern, text, re.MULTILINE)
-                    if match:
-                        value = match.group(1).strip()
-                        if value:
-                            result[key] = value
+        extract_missing_keys(lines, result, expected_keys)
     
     def parse_all_sections(self, file_path: str) -> Dict[str, Any]:
         """Parse all sections from the file."""
         lines = self.read_file(file_path)
+        self.build_index(lines)
         
         result = {
             "土地概要信息": self.parse_general_info(lines),
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the CRIC text parsers.
+
+``SectionIndex`` walks the crawled lines once and records, for every section
+label, the lines containing it; section boundaries are then found by binary
+search instead of rescanning the file for every section and every label.
+The key/value helpers replace the per-section copies of the same loops in
+the housing and land parsers and use compiled patterns cached per key.
+"""
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class SectionIndex:
+    """Line offsets of section labels, built in a single pass over the file."""
+
+    def __init__(self, lines: List[str], labels: Iterable[str]):
+        self.lines = lines
+        self.labels = list(dict.fromkeys(labels))
+        self._offsets: Dict[str, List[int]] = {label: [] for label in self.labels}
+        if self.labels:
+            # One regex pass over the whole text finds the few lines carrying a label
+            combined = re.compile("|".join(re.escape(label) for label in sorted(self.labels, key=len, reverse=True)))
+            text = "\n".join(lines)
+            line_starts = [0]
+            for line in lines:
+                line_starts.append(line_starts[-1] + len(line) + 1)
+            hit_lines = sorted({bisect_right(line_starts, m.start()) - 1 for m in combined.finditer(text)})
+            for i in hit_lines:
+                for label in self.labels:
+                    if label in lines[i]:  # a line can carry several labels
+                        self._offsets[label].append(i)
+
+    def offsets(self, label: str) -> List[int]:
+        if label not in self._offsets:  # label outside the section list, e.g. "功能导航"
+            self._offsets[label] = [i for i, line in enumerate(self.lines) if label in line]
+        return self._offsets[label]
+
+    def first(self, label: str, after: int = -1) -> Optional[int]:
+        """Index of the first line after ``after`` containing label, or None."""
+        offsets = self.offsets(label)
+        pos = bisect_right(offsets, after)
+        return offsets[pos] if pos < len(offsets) else None
+
+    def section(self, start_label: str, end_label: str = None) -> List[str]:
+        """
+        Lines after the first start_label line, up to end_label (or the next
+        other section label when end_label is None), or to the end of the file.
+        """
+        start_idx = self.first(start_label)
+        if start_idx is None:
+            return []
+        if end_label:
+            end_idx = self.first(end_label, start_idx)
+            return self.lines[start_idx + 1:end_idx if end_idx is not None else len(self.lines)]
+        end_idx = len(self.lines)
+        for label in self.labels:
+            if label == start_label:
+                continue
+            idx = self.first(label, start_idx)
+            if idx is not None:
+                end_idx = min(end_idx, idx)
+        return self.lines[start_idx + 1:end_idx]
+
+
+@lru_cache(maxsize=None)
+def _key_patterns(key: str) -> Tuple["re.Pattern", "re.Pattern"]:
+    """(key on its own line followed by the value, key:value on one line)."""
+    escaped = re.escape(key)
+    return (re.compile(r"{}\n\s*([^\n]+?)(?=\n|$)".format(escaped), re.MULTILINE),
+            re.compile(r"{}[:：]\s*([^\n]+?)(?=\n|$)".format(escaped), re.MULTILINE))
+
+
+def extract_line_pairs(section_lines: List[str], keys: List[str]) -> Dict[str, Any]:
+    """Keys that sit alone on a line, each taking the next non-empty line that is not itself a key."""
+    key_set = set(keys)
+    result: Dict[str, Any] = {}
+    i = 0
+    while i < len(section_lines):
+        line = section_lines[i].strip()
+        i += 1
+        if line not in key_set:
+            continue
+        while i < len(section_lines):
+            value_line = section_lines[i].strip()
+            i += 1
+            if value_line and value_line not in key_set:
+                result[line] = value_line
+                break
+    return result
+
+
+def extract_missing_keys(lines: List[str], result: Dict[str, Any], expected_keys: List[str]) -> None:
+    """Fill keys still missing from result by searching the section text."""
+    text = "\n".join(lines)
+    for key in expected_keys:
+        if key in result and result[key].strip():
+            continue
+        if key not in text:
+            continue
+        own_line, inline = _key_patterns(key)
+        # Look for key on its own line followed by value on next line
+        match = own_line.search(text)
+        if match:
+            value = match.group(1).strip()
+            if value and not any(k in value for k in expected_keys):
+                result[key] = value
+        else:
+            # Look for key:value format
+            match = inline.search(text)
+            if match:
+                value = match.group(1).strip()
+                if value:
+                    result[key] = value
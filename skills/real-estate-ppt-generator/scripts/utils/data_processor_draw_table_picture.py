@@ -2,32 +2,39 @@
 """
 Real Estate Deal Data Visualization Script
 Generates a combined bar, line, and table visualization from deal analysis results
+(drawn by the warm template renderer in data_processor_chart_renderer)
 """
 
 import pandas as pd
 import numpy as np
-import matplotlib
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
-import seaborn as sns
 from matplotlib import colors as mcolors
 from decimal import Decimal, ROUND_HALF_UP
 import os
-import math
 import re
 from collections import OrderedDict
 import colorsys
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence, Tuple
 
-def run(project_name: str, file_path: str = None) -> Dict[str, Any]:
-    """Run the deal data visualization with a given project name and file path."""
+try:
+    from .data_processor_chart_renderer import (TABLE_CHUNK_SIZE, DealChart, TableBlock, chunk_count,
+                                                get_renderer, type_palette)
+    from .data_processor_workbook_cache import read_excel_cached
+except ImportError:
+    from data_processor_chart_renderer import (TABLE_CHUNK_SIZE, DealChart, TableBlock, chunk_count,
+                                               get_renderer, type_palette)
+    from data_processor_workbook_cache import read_excel_cached
+
+def run(project_name: str, file_path: str = None, timestamp: Optional[str] = None,
+        formats: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Run the deal data visualization with a given project name and file path.
+    
+    formats: 除 PNG 外额外输出的格式（"svg"、"emf"），默认取 CHART_FORMATS 环境变量（png,svg）。
+    """
     
-    # 字体与显示设置
-    matplotlib.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'Noto Sans CJK SC']
-    matplotlib.rcParams['axes.unicode_minus'] = False
-    timestamp = datetime.now().strftime("%Y%m%d")
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d")
     
     # 默认输入文件路径
     if file_path is None:
@@ -39,7 +46,31 @@ def run(project_name: str, file_path: str = None) -> Dict[str, Any]:
         return {}
     
     # 读取数据
-    df = pd.read_excel(file_path, sheet_name=0, engine="openpyxl")
+    df = read_excel_cached(file_path, sheet_name=0, engine="openpyxl")
+    chart, info = build_deal_chart(df)
+    if chart is None:
+        return {}
+    
+    # 绘制并保存（模板图复用，仅替换数据图元）
+    output_dir = Path(f"resources/working_data/{project_name}_{timestamp}/processed_data")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    outputs = get_renderer().render(chart, str(output_dir / f"{project_name}_成交结果分析混合图与表"), formats)
+    out_img = Path(outputs["png"])
+    print("已保存图片：", out_img)
+    
+    # 返回结果
+    return {'output_image': str(out_img), 'outputs': outputs, **info}
+
+def build_deal_chart(df: pd.DataFrame) -> Tuple[Optional[DealChart], Dict[str, Any]]:
+    """
+    Series, colors and table blocks of the deal chart from the 成交分析结果 sheet.
+    
+    Shared by the PNG renderer and the native PPTX chart (pptx_gen_add_native_charts).
+    
+    Returns:
+    - (DealChart, {"time_range": {"start", "end"}, "types": [...]}), or (None, {}) if the time column is unusable
+    """
+    df = df.copy()
     print("原始列名：", df.columns.tolist())
     
     # ---------- 工具函数 ----------
@@ -115,7 +146,7 @@ def run(project_name: str, file_path: str = None) -> Dict[str, Any]:
         _time_series = pd.to_datetime(df[time_col], errors='coerce')
     if _time_series.isna().all():
         print("时间列解析失败：无法识别任何有效日期。")
-        return {}
+        return None, {}
     min_date = _time_series.dropna().min().to_period('M').to_timestamp()
     last_date = _time_series.dropna().max().to_period('M').to_timestamp()
     print(f"[DEBUG] 原始数据时间范围: {min_date.strftime('%Y-%m')} 至 {last_date.strftime('%Y-%m')}")
@@ -189,12 +220,10 @@ def run(project_name: str, file_path: str = None) -> Dict[str, Any]:
                 x_labels.append(f'{month_int:02d}')
         except Exception:
             x_labels.append(cat)
-    x = np.arange(len(cats))
     
     # ---------- 颜色 ----------
     types_all = list(dict.fromkeys(list(count_map.keys()) + list(price_map.keys())))
-    n_types = max(1, len(types_all))
-    base_palette = sns.color_palette("tab10", n_types) if n_types <= 10 else sns.color_palette("tab20", n_types)
+    base_palette = type_palette(len(types_all))
     type_color_dict = {}
     for i, t in enumerate(types_all):
         base = base_palette[i % len(base_palette)]
@@ -202,47 +231,11 @@ def run(project_name: str, file_path: str = None) -> Dict[str, Any]:
         line_color = lighten_color(base, amount=0.45)
         type_color_dict[t] = {"base": base, "bar": bar_color, "line": line_color}
     
-    # ---------- 表格分块参数 ----------
-    CHUNK_SIZE = 25
-    n_months = len(cats)
-    n_chunks = max(1, math.ceil(n_months / CHUNK_SIZE))
-    chart_h = 4.0
-    spacer_h = 0.4
-    table_h_per_chunk = 0.8
-    
-    # 用 constrained_layout 自动布局
-    fig_h_total = chart_h + spacer_h + n_chunks * table_h_per_chunk + (n_chunks - 1) * 0.6
-    fig = plt.figure(figsize=(20, fig_h_total), layout="constrained")
-    gs = fig.add_gridspec(n_chunks + 2, 1,
-                          height_ratios=[chart_h, spacer_h] + [table_h_per_chunk] * n_chunks)
-    
-    # ---------- 主图 ----------
-    ax = fig.add_subplot(gs[0])
-    n_bar_types = len(count_map)
-    if n_bar_types > 0:
-        total_bar_width = 0.78
-        bar_w = total_bar_width / max(1, n_bar_types)
-        offsets = (np.arange(n_bar_types) - (n_bar_types - 1) / 2) * bar_w
-        for i, (t, col) in enumerate(count_map.items()):
-            vals = display_df[col].fillna(0).astype(int).values
-            bar_color = type_color_dict.get(t, {}).get("bar", None)
-            ax.bar(x + offsets[i], vals, bar_w * 0.92, color=bar_color, alpha=0.96)
-    
-    # === 新增：把网格放到图层后面，并绘制淡灰色水平辅助线（不改变其他图形逻辑） ===
-    ax.set_axisbelow(True)
-    ax.yaxis.grid(True, color='#e6e6e6', linestyle='-', linewidth=0.8, alpha=0.9)
-    # ==============================================================================
-    
-    ax.set_xticks(x)
-    # === 修改：把横坐标刻度文字调大一些 ===
-    ax.set_xticklabels(x_labels, rotation=90, ha='center', fontsize=14)
-    # 修改纵坐标刻度大小
-    ax.tick_params(axis='y', labelsize=14)
-    ax.set_ylabel('成交套数 (套)', fontsize=16)  # 修改纵坐标标签大小
-    
-    ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
-    
-    ax2 = ax.twinx()
+    # ---------- 主图数据：柱为套数，折线为均价（万/㎡） ----------
+    bars = [(f"{t} 成交套数(套)", display_df[col].fillna(0).astype(int).values,
+             type_color_dict.get(t, {}).get("bar", None)) for t, col in count_map.items()]
+    lines = []
+    price_ylim = None
     price_cols_with_observed = [c for c in price_map.values() if c in full_df.columns and full_df[c].notna().any()]
     if price_cols_with_observed:
         numeric_vals = display_df[price_cols_with_observed].astype(float) / 10000.0
@@ -250,15 +243,11 @@ def run(project_name: str, file_path: str = None) -> Dict[str, Any]:
         min_price = np.nanmin(numeric_vals.values)
         for t, col in price_map.items():
             if col in price_cols_with_observed:
-                vals = display_df[col].astype(float) / 10000.0
-                line_color = type_color_dict.get(t, {}).get("line", None)
-                ax2.plot(x, vals, marker='o', linestyle='-', linewidth=1.6, markersize=5,
-                         color=line_color, markerfacecolor='white', markeredgewidth=1.4, markeredgecolor=line_color)
-        ax2.set_ylim(max(0.0, min_price * 0.88), max_price * 1.12)
-    ax2.set_ylabel('成交均价 (万/㎡)', fontsize=16)  # 修改次坐标纵坐标标签大小
-    ax2.tick_params(labelsize=14)  # 修改次坐标刻度大小
-    
-    # ---------- 表格 ----------
+                lines.append((f"{t} 成交均价 (万/㎡)", display_df[col].astype(float) / 10000.0,
+                              type_color_dict.get(t, {}).get("line", None)))
+        price_ylim = (max(0.0, min_price * 0.88), max_price * 1.12)
+    
+    # ---------- 表格（每 TABLE_CHUNK_SIZE 个月一块） ----------
     df_t_full = display_df.set_index(time_col).T.copy()
     df_t_full.columns = df_t_full.columns.astype(str)
     row_order = list(count_map.values()) + list(price_map.values())
@@ -280,21 +269,30 @@ def run(project_name: str, file_path: str = None) -> Dict[str, Any]:
         legend_color_map[f"{t} 成交套数(套)"] = type_color_dict.get(t, {}).get("bar")
     for t in price_map.keys():
         legend_color_map[f"{t} 成交均价 (万/㎡)"] = type_color_dict.get(t, {}).get("line")
+    label_colors = {}
+    for row_idx, row_label in enumerate(row_labels_full):
+        color = legend_color_map.get(row_label, None)
+        if color is not None:
+            try:
+                label_colors[row_idx] = mcolors.to_hex(color)
+            except Exception:
+                continue
     
-    for chunk_idx in range(n_chunks):
-        start = chunk_idx * CHUNK_SIZE
-        end = min((chunk_idx + 1) * CHUNK_SIZE, n_months)
+    n_months = len(cats)
+    tables = []
+    for chunk_idx in range(chunk_count(n_months)):
+        start = chunk_idx * TABLE_CHUNK_SIZE
+        end = min((chunk_idx + 1) * TABLE_CHUNK_SIZE, n_months)
         chunk_months = cats[start:end]
-        display_months = x_labels[start:end]
-        col_labels_chunk = [""] + display_months
+        col_labels_chunk = [""] + x_labels[start:end]
         available_cols = [c for c in chunk_months if c in df_t_full.columns]
         if not available_cols:
+            tables.append(None)
             continue
     
         df_chunk_t = df_t_full[available_cols]
         cell_text = []
         for i in range(len(df_chunk_t)):
-            row_label = row_labels_full[i]
             row_vals = []
             for c in df_chunk_t.columns:
                 v = df_chunk_t.iloc[i][c]
@@ -302,85 +300,10 @@ def run(project_name: str, file_path: str = None) -> Dict[str, Any]:
                     row_vals.append(format_price_wan_str(v))
                 else:
                     row_vals.append(round_half_up_str(v))
-            cell_text.append([row_label] + row_vals)
-    
-        ax_table = fig.add_subplot(gs[chunk_idx + 2])
-        ax_table.axis('off')
-        table = ax_table.table(cellText=cell_text,
-                               colLabels=col_labels_chunk,
-                               cellLoc='center',
-                               loc='center')
-    
-        table.auto_set_font_size(False)
-        # === 修改：放大表格字体（根据列数动态选择基准字号） ===
-        base_font = 16
-        if len(available_cols) > 20:
-            base_font = 8.5
-        elif len(available_cols) > 16:
-            base_font = 9.5
-        elif len(available_cols) > 12:
-            base_font = 10.0
-        else:
-            base_font = 14
-        table.set_fontsize(base_font)
-        # 稍微增加纵向缩放以容纳更大的字体，但保持原有缩放思路
-        table.scale(1, 0.9 + max(0, (len(available_cols) - 6) * 0.012))
-        # ==============================================================================
-    
-        first_col_texts = [cell.get_text().get_text() 
-                   for (r, c), cell in table.get_celld().items() if c == 0]
-        max_chars = max(len(t) for t in first_col_texts) if first_col_texts else 6
-        # 基准宽度随字数增加，每个字符大约 0.012 ~ 0.015
-        first_col_width = max(0.08, min(0.25, max_chars * 0.014))
-
-        for (r, c), cell in table.get_celld().items():
-            if c == 0:
-                cell.set_width(first_col_width)
-    
-        header_default_bg = "#f2f2f2"
-        for j in range(len(col_labels_chunk)):
-            if (0, j) in table.get_celld():
-                hcell = table.get_celld()[(0, j)]
-                hcell.set_facecolor(header_default_bg)
-                hcell.get_text().set_weight("bold")
-                # === 修改：表头字体也放大一点 ===
-                hcell.get_text().set_fontsize(max(7, base_font + 1))
-    
-        for (r, c), cell in table.get_celld().items():
-            if r == 0:
-                continue
-            # r-1 对应数据行索引（因为表格第一行为列头）
-            if (r - 1) in price_row_indices:
-                # 价格行略微使用相同或稍小字号，但总体放大
-                cell.get_text().set_fontsize(max(7, base_font - 0))
-            else:
-                cell.get_text().set_fontsize(base_font)
-    
-        for row_idx, row_label in enumerate(row_labels_full):
-            color = legend_color_map.get(row_label, None)
-            if color is not None:
-                cell_key = (row_idx + 1, 0)
-                if cell_key in table.get_celld():
-                    cell = table.get_celld()[cell_key]
-                    try:
-                        c_hex = mcolors.to_hex(color)
-                    except Exception:
-                        continue
-                    cell.set_facecolor(c_hex)
-                    cell.get_text().set_color('white')
-                    cell.get_text().set_weight('bold')
-    
-    # 保存图片
-    output_dir = Path(f"resources/working_data/{project_name}_{timestamp}/processed_data")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    out_img = output_dir / f"{project_name}_成交结果分析混合图与表.png"
-    fig.savefig(out_img, dpi=300)
-    plt.close(fig)
-    print("已保存图片：", out_img)
+            cell_text.append([row_labels_full[i]] + row_vals)
+        tables.append(TableBlock(col_labels_chunk, cell_text, price_row_indices, label_colors))
     
-    # 返回结果
-    return {
-        'output_image': str(out_img),
+    return DealChart(x_labels, bars, lines, price_ylim, tables), {
         'time_range': {
             'start': min_date.strftime('%Y-%m'),
             'end': last_date.strftime('%Y-%m')
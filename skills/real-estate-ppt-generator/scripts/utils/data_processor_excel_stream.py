@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming reader for large header-less Excel dumps (supply / deal tables).
+
+``pd.read_excel`` materializes the whole workbook through openpyxl before a
+single column can be dropped. ``iter_excel_chunks`` opens the workbook in
+openpyxl's read-only mode and walks the rows lazily, so memory is bounded by
+``chunk_size`` no matter how large the file is:
+
+- only the requested columns are kept, picked from each row tuple
+- an optional row filter (e.g. the target project) runs on the raw values
+  before any DataFrame is built
+- every chunk is converted to the requested dtypes ("float", "string"), so
+  numbers are parsed once, chunk by chunk
+
+Rows come from a small lxml ``iterparse`` reader of the sheet XML when lxml
+is installed (several times faster than openpyxl, which also scans the
+whole sheet up front when the <dimension> record is missing); values match
+openpyxl's (shared/inline strings, ints/floats, booleans, date-formatted
+numbers as datetime). ``engine="openpyxl"`` forces the openpyxl reader.
+"""
+
+import posixpath
+import zipfile
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils import column_index_from_string
+from openpyxl.utils.datetime import from_excel, from_ISO8601
+
+try:
+    from lxml import etree
+except ImportError:  # openpyxl engine only
+    etree = None
+
+DEFAULT_CHUNK_SIZE = 50_000
+# Bounds handed to iter_rows: without them read-only openpyxl scans the whole sheet
+# up front when the file has no (or a stale) <dimension> record
+MAX_SCAN_COLUMNS = 64
+
+
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(element) -> str:
+    """Concatenated <t> text of a shared/inline string, without phonetic runs."""
+    if len(element) == 1 and _local(element[0].tag) == "t":  # plain string, by far the most common
+        return element[0].text or ""
+    return "".join(t.text or "" for t in element.iter("{*}t")
+                   if _local(t.getparent().tag) != "rPh")
+
+
+def _sheet_path(archive: zipfile.ZipFile, sheet: int) -> str:
+    workbook = etree.fromstring(archive.read("xl/workbook.xml"))
+    rel_id = [el.get(_REL_NS) for el in workbook.iter("{*}sheet")][sheet]
+    rels = etree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    target = next(el.get("Target") for el in rels.iter("{*}Relationship") if el.get("Id") == rel_id)
+    return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as f:
+        for _, si in etree.iterparse(f, tag="{*}si"):
+            strings.append(_text(si))
+            si.clear()
+    return strings
+
+
+def _date_styles(archive: zipfile.ZipFile) -> set:
+    """Indices of cell formats (the c/@s attribute) whose number format is a date."""
+    if "xl/styles.xml" not in archive.namelist():
+        return set()
+    styles = etree.fromstring(archive.read("xl/styles.xml"))
+    formats = dict(BUILTIN_FORMATS)
+    formats.update({int(el.get("numFmtId")): el.get("formatCode") for el in styles.iter("{*}numFmt")})
+    date_styles = set()
+    for cell_xfs in styles.iter("{*}cellXfs"):
+        for index, xf in enumerate(cell_xfs.iter("{*}xf")):
+            if is_date_format(formats.get(int(xf.get("numFmtId", 0)), "")):
+                date_styles.add(index)
+    return date_styles
+
+
+def _lxml_rows(file_path, sheet: int, max_col: int) -> Iterator[tuple]:
+    with zipfile.ZipFile(file_path) as archive:
+        strings = _shared_strings(archive)
+        date_styles = _date_styles(archive)
+        columns: Dict[str, int] = {}
+        value_tag = inline_tag = None
+        with archive.open(_sheet_path(archive, sheet)) as f:
+            for _, row in etree.iterparse(f, tag="{*}row"):
+                if value_tag is None:  # exact tags are much faster to look up than {*} wildcards
+                    namespace = row.tag[:-len("row")]
+                    value_tag, inline_tag = namespace + "v", namespace + "is"
+                values = [None] * max_col
+                position = 0
+                for cell in row:
+                    ref = cell.get("r")
+                    if ref:
+                        letters = ref.rstrip("0123456789")
+                        if letters not in columns:
+                            columns[letters] = column_index_from_string(letters) - 1
+                        position = columns[letters]
+                    if position >= max_col:
+                        break
+                    kind = cell.get("t", "n")
+                    if kind == "inlineStr":
+                        inline = cell.find(inline_tag)
+                        value = _text(inline) if inline is not None else None
+                    else:
+                        v = cell.find(value_tag)
+                        value = v.text if v is not None else None
+                        if value is not None:
+                            if kind == "s":
+                                value = strings[int(value)]
+                            elif kind == "n":
+                                value = float(value) if any(ch in value for ch in ".eE") else int(value)
+                                if int(cell.get("s", 0)) in date_styles:
+                                    value = from_excel(value)
+                            elif kind == "b":
+                                value = value == "1"
+                            elif kind == "d":
+                                value = from_ISO8601(value)
+                    values[position] = value
+                    position += 1
+                row.clear()
+                while row.getprevious() is not None:  # drop processed rows from the tree
+                    del row.getparent()[0]
+                yield tuple(values)
+
+
+def _openpyxl_rows(file_path, sheet: int, max_col: int) -> Iterator[tuple]:
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[sheet].iter_rows(max_col=max_col, values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_rows(file_path, sheet: int = 0, max_col: int = MAX_SCAN_COLUMNS, engine: str = None) -> Iterator[tuple]:
+    """Value tuples of length max_col for every row of the sheet (engine: "lxml" / "openpyxl")."""
+    if engine is None:
+        engine = "lxml" if etree is not None else "openpyxl"
+    reader = _lxml_rows if engine == "lxml" else _openpyxl_rows
+    return reader(file_path, sheet, max_col)
+
+
+def sheet_width(file_path, sheet: int = 0, sample_rows: int = 100, engine: str = None) -> int:
+    """Number of used columns, judged from the first sample_rows non-empty rows."""
+    width, seen = 0, 0
+    rows = iter_rows(file_path, sheet, MAX_SCAN_COLUMNS, engine)
+    try:
+        for row in rows:
+            used = max((i + 1 for i, value in enumerate(row) if value is not None), default=0)
+            if used:
+                width, seen = max(width, used), seen + 1
+                if seen >= sample_rows:
+                    break
+    finally:
+        rows.close()
+    return width
+
+
+def _convert(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+    for column, dtype in dtypes.items():
+        if column not in df:
+            continue
+        if dtype == "float":
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+        elif dtype == "string":
+            df[column] = df[column].astype("string")
+    return df
+
+
+def iter_excel_chunks(file_path, columns: Dict[int, str], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      row_filter: Optional[Callable[[Sequence], bool]] = None,
+                      dtypes: Optional[Dict[str, str]] = None, sheet: int = 0,
+                      engine: str = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield DataFrames of at most chunk_size rows from a header-less sheet.
+
+    Parameters:
+    - file_path: str or Path, .xlsx file
+    - columns: dict, {0-based column index: column name} of the columns to keep
+    - chunk_size: int, rows per chunk
+    - row_filter: callable, receives the full row tuple, returns False to skip the row
+    - dtypes: dict, {column name: "float" / "string"} applied to every chunk
+    - sheet: int, worksheet index
+    - engine: str, "lxml" (default when installed) or "openpyxl"
+
+    Fully empty rows are skipped.
+    """
+    indices = list(columns)
+    names = [columns[i] for i in indices]
+    dtypes = dtypes or {}
+
+    rows: List[tuple] = []
+    for row in iter_rows(file_path, sheet, max(indices) + 1, engine):
+        if all(value is None for value in row):
+            continue
+        if row_filter is not None and not row_filter(row):
+            continue
+        rows.append(tuple(row[i] for i in indices))
+        if len(rows) >= chunk_size:
+            yield _convert(pd.DataFrame.from_records(rows, columns=names), dtypes)
+            rows = []
+    if rows:
+        yield _convert(pd.DataFrame.from_records(rows, columns=names), dtypes)
+
+
+def read_excel_columns(file_path, columns: Dict[int, str], **kwargs) -> pd.DataFrame:
+    """iter_excel_chunks concatenated into one DataFrame (only the kept columns/rows are held)."""
+    chunks = list(iter_excel_chunks(file_path, columns, **kwargs))
+    if not chunks:
+        return _convert(pd.DataFrame(columns=list(columns.values())), kwargs.get("dtypes") or {})
+    return pd.concat(chunks, ignore_index=True)
+
+
+def contains_filter(column: int, text: str) -> Callable[[Sequence], bool]:
+    """Row filter: column value contains text, case-insensitive (like str.contains(case=False))."""
+    needle = text.lower()
+
+    def _match(row: Sequence) -> bool:
+        value = row[column]
+        return value is not None and needle in str(value).strip().lower()
+
+    return _match
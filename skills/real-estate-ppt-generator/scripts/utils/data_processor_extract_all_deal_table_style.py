@@ -3,17 +3,35 @@
 """
 Real Estate Deal Data Analysis Script
 Analyzes deal data from Excel file to compute monthly sales counts and average prices by category
+(both classifications in one pass, see data_processor_deal_aggregation)
 """
 
 import pandas as pd
 import os
-import re
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-def run(project_name: str, file_path: str = "resources/working_data/all_deal_with_date_data.xlsx") -> Dict[str, Any]:
-    """Run the deal data analysis with a given project name and file path."""
+try:
+    from .data_processor_deal_aggregation import (DEFAULT_DIMENSIONS, clean_deals, combine_groups,
+                                                  group_deals, pivot_dimension)
+    from .data_processor_excel_stream import contains_filter, iter_excel_chunks, sheet_width
+except ImportError:
+    from data_processor_deal_aggregation import (DEFAULT_DIMENSIONS, clean_deals, combine_groups,
+                                                 group_deals, pivot_dimension)
+    from data_processor_excel_stream import contains_filter, iter_excel_chunks, sheet_width
+
+def run(project_name: str, file_path: str = "resources/working_data/all_deal_with_date_data.xlsx",
+        classification: str = "户型", extra_dimensions: Optional[List[str]] = None,
+        filter_project: bool = False) -> Dict[str, Any]:
+    """
+    Run the deal data analysis with a given project name and file path.
+
+    classification: "户型" 或 "物业类型"，决定写入结果第一个工作表、供幻灯片使用的分类。
+    extra_dimensions: 额外的分组维度列（如 "楼栋"），与两种分类一起汇总，各写入一个工作表。
+    filter_project: 城市级成交底表时为 True，只统计项目列包含 project_name 的行。
+    文件以只读方式逐行流式读取，按块汇总。
+    """
     
     # 固定文件路径
     file_path = Path(file_path)
@@ -23,154 +41,59 @@ def run(project_name: str, file_path: str = "resources/working_data/all_deal_wit
         print(f"文件不存在: {file_path}")
         return {}
     
-    try:
-        # 读取 Excel 文件，无表头
-        df = pd.read_excel(file_path, header=None)
-        
-        # 模糊匹配：检查第二列是否包含项目名称的部分内容
-        second_column_data = df.iloc[:, 1].astype(str).str.strip()
-        is_presale_license = not any(second_column_data.str.contains(project_name, case=False, na=False))
-        
-        # 定义表头
-        if is_presale_license:
-            # 如果是预售证，删除第二列并使用新的表头
-            df = df.drop(columns=1)  # 删除第二列（预售证）
-            header = ['成交日期', '项目', '楼栋', '房间', '物业类型', '户型', '面积', '单价', '成交总价']
-        else:
-            # 如果是项目，保留原表头
-            header = ['成交日期', '项目', '楼栋', '房间', '物业类型', '户型', '面积', '单价', '成交总价']
-        
-        # 将表头赋值给 DataFrame
-        df.columns = header
-    except Exception as e:
-        print(f"读取文件失败：{e}")
+    if classification not in DEFAULT_DIMENSIONS:
+        print("无效的分类方式，请使用'户型'或'物业类型'。")
         return {}
     
-    # 确保必要的字段存在
-    required_columns = ['成交日期', '物业类型', '户型', '面积', '成交总价']
-    if not all(col in df.columns for col in required_columns):
-        print("xlsx文件缺少必要的字段：成交日期、物业类型、户型、面积、成交总价")
+    header = ['成交日期', '项目', '楼栋', '房间', '物业类型', '户型', '面积', '单价', '成交总价']
+    dimensions = [classification] + [d for d in list(DEFAULT_DIMENSIONS) + list(extra_dimensions or [])
+                                      if d != classification]
+    missing = [d for d in dimensions if d not in header]
+    if missing:
+        print(f"成交数据中没有维度列：{', '.join(missing)}")
         return {}
     
-    # 清理成交日期格式，提取有效的日期字符串
-    def extract_date_string(date_str):
-        # Handle None or NaN
-        if pd.isna(date_str):
-            return None
-        
-        # Convert to string
-        date_str = str(date_str)
+    try:
+        # 预售证底表比项目底表多一列（第二列为预售证编号），读取时跳过该列
+        width = sheet_width(file_path)
+        if width == len(header) + 1:
+            positions = [0] + list(range(2, width))
+        elif width == len(header):
+            positions = list(range(width))
+        else:
+            raise ValueError(f"列数为 {width}，应为 {len(header)} 或 {len(header) + 1}")
         
-        # Try to extract date pattern (e.g., 2025/08/27)
-        date_match = re.search(r'\b(\d{4}/\d{2}/\d{2})\b', date_str)
-        if date_match:
-            return date_match.group(1)
+        # 只保留需要的列；城市级底表可按项目列过滤，在构建 DataFrame 之前丢弃其他项目的行
+        keep = ['成交日期', '面积', '成交总价'] + dimensions
+        columns = {positions[i]: name for i, name in enumerate(header) if name in keep}
+        # 项目列在预售证底表中为原始第三列（positions 已跳过预售证编号）
+        row_filter = contains_filter(positions[header.index('项目')], project_name) if filter_project else None
         
-        # Fallback: remove brackets, quotes, newlines, and clean up
-        cleaned = re.sub(r'[\[\]"\n\r_\x000D\s]', '', date_str)
-        return cleaned if cleaned else None
-    
-    df['成交日期'] = df['成交日期'].apply(extract_date_string)
-    
-    # 将成交日期转换为 datetime 格式
-    try:
-        df['成交日期'] = pd.to_datetime(df['成交日期'], format='%Y/%m/%d', errors='coerce')
+        # 逐块清理并分组汇总，内存占用与文件大小无关
+        parts = []
+        stats = {"invalid_dates": 0, "invalid_area": 0, "invalid_price": 0}
+        for chunk in iter_excel_chunks(file_path, columns, row_filter=row_filter):
+            chunk, chunk_stats = clean_deals(chunk)
+            for key, value in chunk_stats.items():
+                stats[key] += value
+            # 检查面积列是否有零或负值
+            if any(chunk['面积'] <= 0):
+                print("面积列包含零或负值，请检查数据！")
+                return {}
+            parts.append(group_deals(chunk, dimensions))
     except Exception as e:
-        print(f"日期格式转换失败：{e}")
-        return {}
-    
-    print(df['成交日期'].head())
-    # 过滤无效日期
-    invalid_dates = df['成交日期'].isna().sum()
-    if invalid_dates > 0:
-        print(f"警告：{invalid_dates} 条日期记录无效，已被移除")
-    df = df.dropna(subset=['成交日期'])
-    
-    # 清理面积和成交总价中的逗号并转换为数值
-    df['面积'] = df['面积'].astype(str).str.replace(',', '', regex=False).str.strip()
-    df['成交总价'] = df['成交总价'].astype(str).str.replace(',', '', regex=False).str.strip()
-    
-    # 将面积和成交总价转换为数值类型
-    try:
-        df['面积'] = pd.to_numeric(df['面积'], errors='coerce')
-        df['成交总价'] = pd.to_numeric(df['成交总价'], errors='coerce')
-    except Exception as e:
-        print(f"面积或成交总价转换为数值失败：{e}")
-        return {}
-    
-    # 检查无效数值
-    invalid_area = df['面积'].isna().sum()
-    invalid_price = df['成交总价'].isna().sum()
-    if invalid_area > 0 or invalid_price > 0:
-        print(f"警告：面积列有 {invalid_area} 条无效值，成交总价列有 {invalid_price} 条无效值，已被移除")
-        df = df.dropna(subset=['面积', '成交总价'])
-    
-    # 检查面积列是否有零或负值
-    if any(df['面积'] <= 0):
-        print("面积列包含零或负值，请检查数据！")
-        return {}
-    
-    # 用户输入分类方式
-    classification = input("请输入分类方式（户型 或 物业类型）：").strip()
-    
-    # 按月分组，并添加月份列
-    df['时间'] = df['成交日期'].dt.to_period('M').astype(str)
-    
-    # 动态获取分类值并过滤总套数少于20的分类
-    if classification == '户型':
-        df['分类'] = df['户型'].fillna('其他')
-        # 计算每个户型的总套数
-        category_counts = df['分类'].value_counts()
-        # 筛选出总套数 >= 20 的分类
-        valid_categories = category_counts[category_counts >= 20].index.tolist()
-        # 过滤数据，只保留有效分类
-        df = df[df['分类'].isin(valid_categories)]
-        categories = valid_categories
-    elif classification == '物业类型':
-        df['分类'] = df['物业类型'].fillna('其他')
-        # 计算每个物业类型的总套数
-        category_counts = df['分类'].value_counts()
-        # 筛选出总套数 >= 20 的分类
-        valid_categories = category_counts[category_counts >= 20].index.tolist()
-        # 过滤数据，只保留有效分类
-        df = df[df['分类'].isin(valid_categories)]
-        categories = valid_categories
-    else:
-        print("无效输入，请输入'户型'或'物业类型'。")
+        print(f"读取文件失败：{e}")
         return {}
     
-    # 按月和分类统计销售套数
-    sales_count = df.groupby(['时间', '分类']).size().unstack(fill_value=0)
-    
-    # 按月和分类计算成交均价 = sum(成交总价) / sum(面积)
-    monthly_avg_price = df.groupby(['时间', '分类']).apply(
-        lambda x: x['成交总价'].sum() / x['面积'].sum() if x['面积'].sum() > 0 else 0,
-        include_groups=False
-    ).round(2).unstack(fill_value=0)
-    
-    # 重命名均价列，添加后缀以区分
-    monthly_avg_price.columns = [f'{col}_成交均价 (元/m²)' for col in monthly_avg_price.columns]
-    
-    # 合并结果并重置索引
-    result = sales_count.join(monthly_avg_price).reset_index()
-    
-    # 动态生成列顺序：时间 + 每个分类的销售套数和均价
-    columns_order = ['时间']
-    for category in categories:
-        if category in result.columns:
-            columns_order.append(category)
-        if f'{category}_成交均价 (元/m²)' in result.columns:
-            columns_order.append(f'{category}_成交均价 (元/m²)')
-    
-    # 确保所有分类的列都存在，若不存在则填充0
-    for category in categories:
-        if category not in result.columns:
-            result[category] = 0
-        if f'{category}_成交均价 (元/m²)' not in result.columns:
-            result[f'{category}_成交均价 (元/m²)'] = 0
+    if stats["invalid_dates"] > 0:
+        print(f"警告：{stats['invalid_dates']} 条日期记录无效，已被移除")
+    if stats["invalid_area"] > 0 or stats["invalid_price"] > 0:
+        print(f"警告：面积列有 {stats['invalid_area']} 条无效值，成交总价列有 {stats['invalid_price']} 条无效值，已被移除")
     
-    # 按动态列顺序重新排序结果
-    result = result[columns_order]
+    # 同时得到两种分类及额外维度的按月套数与成交均价
+    grouped = combine_groups(parts, dimensions)
+    pivots = {dimension: pivot_dimension(grouped, dimension) for dimension in dimensions}
+    result, categories = pivots[classification]
     
     # 输出结果表格
     if not result.empty:
@@ -182,8 +105,10 @@ def run(project_name: str, file_path: str = "resources/working_data/all_deal_wit
             output_dir.mkdir(parents=True, exist_ok=True)
             output_path = output_dir / f"{project_name}_成交分析结果.xlsx"
             
-            # 写入 Excel（保持原格式）
-            result.to_excel(output_path, index=False, engine="openpyxl")
+            # 第一个工作表为所选分类（下游按 sheet 0 读取），其余维度依次写入后续工作表
+            with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
+                for dimension, (table, _) in pivots.items():
+                    table.to_excel(writer, sheet_name=dimension[:31], index=False)
             
             print(f"结果已保存到 {output_path}")
         except Exception as e:
@@ -195,7 +120,9 @@ def run(project_name: str, file_path: str = "resources/working_data/all_deal_wit
     return {
         'sales_data': result.to_dict(),
         'classification': classification,
-        'categories': categories
+        'categories': categories,
+        'pivots': {dimension: {'sales_data': table.to_dict(), 'categories': cats}
+                   for dimension, (table, cats) in pivots.items()}
     }
 
 if __name__ == "__main__":
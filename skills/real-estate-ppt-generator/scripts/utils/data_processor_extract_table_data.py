@@ -22,6 +22,36 @@ def extract_table_data_from_json(housing_data_path: str, land_data_path: str) ->
     - list: 2D array (16x2) table data compatible with add_table_to_slide function
     """
     
+    # Load housing data
+    try:
+        with open(housing_data_path, 'r', encoding='utf-8') as f:
+            housing_data = json.load(f)
+    except Exception as e:
+        print(f"无法加载住房数据文件 {housing_data_path}: {str(e)}")
+        housing_data = {}
+    
+    # Load land data
+    try:
+        with open(land_data_path, 'r', encoding='utf-8') as f:
+            land_data = json.load(f)
+    except Exception as e:
+        print(f"无法加载土地数据文件 {land_data_path}: {str(e)}")
+        land_data = {}
+    
+    return extract_table_data(housing_data, land_data)
+
+def extract_table_data(housing_data: Dict[str, Any], land_data: Dict[str, Any]) -> List[List[str]]:
+    """
+    Create the table data structure from parsed housing and land data.
+    
+    Parameters:
+    - housing_data: dict, CRIC housing parser output
+    - land_data: dict, CRIC land parser output
+    
+    Returns:
+    - list: 2D array (16x2) table data compatible with add_table_to_slide function
+    """
+    
     # Initialize the keys we need to extract
     target_keys = [
         "开发商",
@@ -44,22 +74,6 @@ def extract_table_data_from_json(housing_data_path: str, land_data_path: str) ->
     
     table_data = []
     
-    # Load housing data
-    try:
-        with open(housing_data_path, 'r', encoding='utf-8') as f:
-            housing_data = json.load(f)
-    except Exception as e:
-        print(f"无法加载住房数据文件 {housing_data_path}: {str(e)}")
-        housing_data = {}
-    
-    # Load land data
-    try:
-        with open(land_data_path, 'r', encoding='utf-8') as f:
-            land_data = json.load(f)
-    except Exception as e:
-        print(f"无法加载土地数据文件 {land_data_path}: {str(e)}")
-        land_data = {}
-    
     # Extract data for each target key
     for key in target_keys:
         value = ""
@@ -166,7 +180,8 @@ def extract_table_data_from_json(housing_data_path: str, land_data_path: str) ->
     
     return table_data
 
-def run(project_name: str, housing_data_path: str = None, land_data_path: str = None) -> Dict[str, Any]:
+def run(project_name: str, housing_data_path: str = None, land_data_path: str = None,
+        dataset_path: str = None) -> Dict[str, Any]:
     """
     Run the table data extraction with a given project name and optional file paths.
     
@@ -174,10 +189,25 @@ def run(project_name: str, housing_data_path: str = None, land_data_path: str =
     - project_name: str, name of the project
     - housing_data_path: str, path to housing data JSON file (optional)
     - land_data_path: str, path to land data JSON file (optional)
+    - dataset_path: str, Parquet corpus from data_processor_cric_bulk_ingest (optional);
+      when given, the project is read from it instead of the JSON files
     
     Returns:
     - dict: Contains the extracted table data
     """
+    if dataset_path is not None:
+        # 只有读取 Parquet 语料时才导入 pandas；缺少 pyarrow 时与其他失败情况一样返回空表
+        try:
+            try:
+                from .data_processor_cric_bulk_ingest import load_project
+            except ImportError:
+                from data_processor_cric_bulk_ingest import load_project
+            housing_data, land_data = load_project(project_name, dataset_path)
+        except (ImportError, KeyError, OSError) as e:
+            print(f"无法从数据集读取项目: {e}")
+            return {"table_data": []}
+        return {"table_data": extract_table_data(housing_data, land_data)}
+    
     timestamp = datetime.now().strftime("%Y%m%d")
     
     # Set default file paths if not provided
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Floor plan image preprocessing for the vision model.
+
+- detects the real image format with Pillow instead of assuming JPEG
+- downsizes to the model's effective resolution (``FLOOR_PLAN_MAX_PIXELS``,
+  default 1024*1024; larger uploads are resized by the provider anyway)
+- computes a 256-bit difference hash (dHash) so the same floor plan, even
+  re-encoded or resized, is analyzed once; results are kept in an index
+  shared across projects
+- encodes the data URL from the prepared file in chunks, right before the
+  request, so only in-flight images are held in memory as base64
+
+Prepared images and the index live under ``resources/working_data/.cache/floor_plans``.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from PIL import Image
+
+CACHE_DIR = os.path.join("resources", "working_data", ".cache", "floor_plans")
+MAX_PIXELS = int(os.getenv("FLOOR_PLAN_MAX_PIXELS", 1024 * 1024))
+JPEG_QUALITY = 85
+# Floor plans are mostly white line art, so 64-bit hashes collide between different
+# plans; 16x16 keeps them apart while re-encoded or resized copies stay within a few bits.
+DHASH_SIZE = 16
+DUPLICATE_DISTANCE = 10  # of 256 bits
+ASPECT_TOLERANCE = 0.05
+_ENCODE_CHUNK = 3 * 64 * 1024  # multiple of 3, so chunk encodings concatenate cleanly
+
+_MIME = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp", "GIF": "image/gif", "BMP": "image/bmp"}
+
+
+@dataclass
+class PreparedImage:
+    source_path: str
+    prepared_path: str
+    mime: str
+    width: int
+    height: int
+    source_bytes: int
+    prepared_bytes: int
+    dhash: int
+
+    @property
+    def aspect(self) -> float:
+        return self.width / float(self.height)
+
+
+def dhash(image: Image.Image, size: int = DHASH_SIZE) -> int:
+    """Difference hash: compare horizontally adjacent pixels of a (size+1) x size grayscale thumbnail."""
+    small = image.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def is_duplicate(hash_a: int, aspect_a: float, hash_b: int, aspect_b: float,
+                 max_distance: int = DUPLICATE_DISTANCE) -> bool:
+    """dHash ignores proportions, so the aspect ratio has to match as well."""
+    return (abs(aspect_a - aspect_b) <= ASPECT_TOLERANCE * max(aspect_a, aspect_b)
+            and hamming(hash_a, hash_b) <= max_distance)
+
+
+def prepare_image(path: str, max_pixels: int = MAX_PIXELS, cache_dir: str = CACHE_DIR) -> PreparedImage:
+    """
+    Downscale one image for upload and store it under cache_dir, named by content hash.
+
+    Images already within max_pixels in a format the API accepts are kept byte for byte.
+
+    Raises:
+        OSError: if the file is missing or not a readable image.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    source_digest = hashlib.sha256(raw).hexdigest()
+    with Image.open(io.BytesIO(raw)) as image:
+        fmt = image.format
+        width, height = image.size
+        scale = min(1.0, (max_pixels / float(width * height)) ** 0.5)
+        target = (max(1, int(width * scale)), max(1, int(height * scale)))
+        if fmt == "JPEG" and scale < 1.0:
+            image.draft("RGB", target)  # decode at reduced size, much faster for large JPEGs
+        image.load()
+        fingerprint = dhash(image)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        if scale >= 1.0 and fmt in ("JPEG", "PNG", "WEBP"):
+            mime, data = _MIME[fmt], raw
+            prepared_path = os.path.join(cache_dir, f"{source_digest}.{fmt.lower()}")
+        else:
+            if image.mode in ("RGBA", "LA", "P"):
+                background = Image.new("RGB", image.size, "white")  # floor plans: transparent -> paper white
+                background.paste(image.convert("RGBA"), mask=image.convert("RGBA").split()[-1])
+                image = background
+            image = image.convert("RGB")
+            if image.size != target:
+                image = image.resize(target, Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True)
+            mime, data = "image/jpeg", buffer.getvalue()
+            prepared_path = os.path.join(cache_dir, f"{source_digest}_{max_pixels}.jpg")
+            width, height = image.size
+
+    if not os.path.exists(prepared_path):
+        tmp = f"{prepared_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, prepared_path)
+    return PreparedImage(path, prepared_path, mime, width, height, len(raw), len(data), fingerprint)
+
+
+def encode_data_url(prepared: PreparedImage) -> str:
+    """Build the data URL from the prepared file in chunks (no intermediate full-size copies)."""
+    parts = [f"data:{prepared.mime};base64,"]
+    with open(prepared.prepared_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_ENCODE_CHUNK), b""):
+            parts.append(base64.b64encode(chunk).decode("ascii"))
+    return "".join(parts)
+
+
+class FloorPlanIndex:
+    """dHash -> analysis result, persisted as JSON so duplicates are skipped across projects."""
+
+    def __init__(self, path: str = os.path.join(CACHE_DIR, "index.json")):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries: Dict[str, Dict[str, Any]] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    def lookup(self, image: PreparedImage, version: str) -> Optional[Dict[str, Any]]:
+        """Closest stored duplicate analyzed with the same prompt/model version, if any."""
+        best, best_distance = None, None
+        with self._lock:
+            for key, entry in self.entries.items():
+                if entry.get("version") != version:
+                    continue
+                fingerprint = int(key, 16)
+                if not is_duplicate(image.dhash, image.aspect, fingerprint, entry.get("aspect", 0.0)):
+                    continue
+                distance = hamming(image.dhash, fingerprint)
+                if best_distance is None or distance < best_distance:
+                    best, best_distance = entry, distance
+        return best
+
+    def add(self, image: PreparedImage, version: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.entries[f"{image.dhash:064x}"] = dict(entry, version=version, aspect=image.aspect)
+
+    def save(self) -> None:
+        """Merge with entries written meanwhile by other processes (batch workers), then replace."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                on_disk = json.load(f)
+        except (FileNotFoundError, ValueError):
+            on_disk = {}
+        with self._lock:
+            self.entries = dict(on_disk, **self.entries)
+            data = json.dumps(self.entries, ensure_ascii=False, indent=2)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+
+def group_duplicates(images: List[PreparedImage]) -> Dict[str, str]:
+    """Map every source path to the first earlier image it duplicates (itself if unique)."""
+    representative: Dict[str, str] = {}
+    firsts: List[PreparedImage] = []
+    for img in images:
+        match = next((f for f in firsts if is_duplicate(f.dhash, f.aspect, img.dhash, img.aspect)), None)
+        if match is None:
+            firsts.append(img)
+            representative[img.source_path] = img.source_path
+        else:
+            representative[img.source_path] = match.source_path
+    return representative
+
+
+def run(project_name: str, image_paths: List[str] = None) -> Dict[str, Any]:
+    """
+    Prepare the floor plan images of a project and report size savings and duplicates.
+
+    Returns:
+        dict: {"success": bool, "images": [...], "duplicates": {path: path}, "error": str}
+    """
+    if image_paths is None:
+        image_paths = [f"resources/images/room_style{i}.jpg" for i in range(1, 6)]
+    prepared, errors = [], []
+    for path in image_paths:
+        try:
+            prepared.append(prepare_image(path))
+        except OSError as e:
+            print(f"[WARN] 无法读取图片 {path}: {e}")
+            errors.append(path)
+    for img in prepared:
+        print(f"[INFO] {img.source_path}: {img.mime} {img.width}x{img.height}, "
+              f"{img.source_bytes / 1024:.0f}KB -> {img.prepared_bytes / 1024:.0f}KB")
+    duplicates = {k: v for k, v in group_duplicates(prepared).items() if k != v}
+    for path, original in duplicates.items():
+        print(f"[INFO] {path} 与 {original} 为同一户型图")
+    return {
+        "success": not errors,
+        "images": [img.__dict__ for img in prepared],
+        "duplicates": duplicates,
+        "error": f"无法读取: {', '.join(errors)}" if errors else "",
+    }
+
+
+if __name__ == "__main__":
+    print(run("华发四季半岛"))
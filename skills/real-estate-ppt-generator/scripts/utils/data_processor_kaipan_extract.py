@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Single-pass extraction of opening (开盘) records from CRIC 基本信息 files.
+
+Each 开盘描述 is tokenized once with one compiled pattern (product mentions,
+"N套", "共N套", price ranges, mean prices, batch starts) and a small state
+machine assigns the tokens to the product types mentioned before them:
+
+- 套数: first mention of the product directly followed by "N套"
+- 价格最低/最高: last "价格(在)N-M元/㎡" after the product's first mention
+- 均价: first "均价(为)N元/㎡" after the product's first mention
+- 整体均价: first mean price preceded by 整盘 / 本批次整体
+
+which is what the per-field regexes of the original parser matched, without
+re-scanning (and backtracking over) the description once per field.
+
+Product types come from ``resources/config/kaipan_products.json``:
+
+    {"products": [{"name": "小高层", "aliases": ["多层、小高层", "小高层"]},
+                  {"name": "叠加", "aliases": ["叠加", "叠加别墅", "别墅"], "set_aliases": ["叠加"]}]}
+
+each adds the columns {name}套数 / {name}价格最低 / {name}价格最高 / {name}均价.
+
+Back-filling a district:
+
+    python scripts/utils/data_processor_kaipan_extract.py resources/working_data \\
+        --output resources/working_data/开盘信息汇总.xlsx --workers 8
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+DEFAULT_CONFIG_PATH = os.path.join("resources", "config", "kaipan_products.json")
+MISSING = "-"
+WHOLE_MEAN_PREFIXES = ("整盘", "本批次整体")
+_DATE_LINE = re.compile(r"^\d{4}/\d{2}/\d{2}$")
+
+
+@dataclass(frozen=True)
+class ProductSpec:
+    name: str                         # column prefix, e.g. 小高层 -> 小高层套数 ...
+    aliases: Tuple[str, ...]          # mentions that open the product's part of a description
+    set_aliases: Tuple[str, ...] = ()  # mentions counted by "N套" right after them (default: aliases)
+
+    def columns(self) -> List[str]:
+        return [f"{self.name}套数", f"{self.name}价格最低", f"{self.name}价格最高", f"{self.name}均价"]
+
+
+DEFAULT_PRODUCTS: Tuple[ProductSpec, ...] = (
+    ProductSpec("小高层", ("多层、小高层", "小高层")),
+    ProductSpec("叠加", ("叠加", "叠加别墅", "别墅"), ("叠加",)),
+)
+
+
+def load_product_specs(config_path: str = DEFAULT_CONFIG_PATH) -> Tuple[ProductSpec, ...]:
+    """
+    Product types from the config file (DEFAULT_PRODUCTS when it does not exist).
+
+    Raises:
+        ValueError: if a product has no name or no aliases.
+    """
+    if not os.path.exists(config_path):
+        return DEFAULT_PRODUCTS
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    products = []
+    for entry in config.get("products", []):
+        if not entry.get("name") or not entry.get("aliases"):
+            raise ValueError(f"产品类型配置缺少 name 或 aliases: {entry}")
+        products.append(ProductSpec(entry["name"], tuple(entry["aliases"]), tuple(entry.get("set_aliases", ()))))
+    return tuple(products)
+
+
+class KaipanExtractor:
+    """Compiled extraction spec for a set of product types; reusable across files and processes."""
+
+    def __init__(self, products: Sequence[ProductSpec] = DEFAULT_PRODUCTS):
+        self.products = tuple(products)
+        self.columns = ["开盘日期", "批次", "总套数"] + \
+            [c for product in self.products for c in product.columns()] + ["整体均价"]
+        self._blank = dict.fromkeys(self.columns[1:], MISSING)
+        # alias -> (套数, 价格最低, 价格最高, 均价) columns of the products it mentions / counts
+        self._mentions: Dict[str, List[List[str]]] = {}
+        self._counts: Dict[str, List[str]] = {}
+        for product in self.products:
+            for alias in product.aliases:
+                self._mentions.setdefault(alias, []).append(product.columns())
+            for alias in product.set_aliases or product.aliases:
+                self._counts.setdefault(alias, []).append(product.columns()[0])
+        aliases = sorted(set(self._mentions) | set(self._counts), key=len, reverse=True)
+        alias_pattern = r"(?P<alias>" + "|".join(map(re.escape, aliases)) + r")(?:(?P<sets>\d+)套)?|" if aliases else ""
+        self._tokens = re.compile(
+            alias_pattern
+            + r"共(?P<total>\d+)套"
+            + r"|价格在?(?P<low>\d+)-(?P<high>\d+)元/㎡"
+            + r"|均价为?(?P<mean>\d+)元/㎡"
+            + r"|(?P<batch>第|住宅,)"
+        )
+
+    def extract(self, desc: str) -> Dict[str, Any]:
+        """Fields of one opening description (without 开盘日期); missing values are '-'."""
+        row: Dict[str, Any] = dict(self._blank)
+        mentioned: List[List[str]] = []  # columns of the products mentioned so far, in order
+        batch_done = False
+
+        for m in self._tokens.finditer(desc):
+            kind = m.lastgroup
+            if kind == "alias" or kind == "sets":
+                alias = m.group("alias")
+                for columns in self._mentions.get(alias, ()):
+                    if columns not in mentioned:
+                        mentioned.append(columns)
+                if kind == "sets":
+                    for column in self._counts.get(alias, ()):
+                        if row[column] == MISSING:
+                            row[column] = int(m.group("sets"))
+            elif kind == "high":
+                low, high = int(m.group("low")), int(m.group("high"))
+                for columns in mentioned:  # the last range after the first mention wins
+                    row[columns[1]], row[columns[2]] = low, high
+            elif kind == "mean":
+                mean = int(m.group("mean"))
+                for columns in mentioned:
+                    if row[columns[3]] == MISSING:
+                        row[columns[3]] = mean
+                if row["整体均价"] == MISSING and desc.endswith(WHOLE_MEAN_PREFIXES, 0, m.start()):
+                    row["整体均价"] = mean
+            elif kind == "total":
+                if row["总套数"] == MISSING:
+                    row["总套数"] = int(m.group("total"))
+            elif not batch_done:
+                # Only the first batch start can match: a later one has no more 批 after it either
+                batch_done = True
+                end = desc.find("批", m.end())
+                if end >= 0:
+                    row["批次"] = desc[m.start():end + 1].replace("住宅,", "").strip()
+        return row
+
+    def extract_lines(self, lines: Iterable[str]) -> List[Dict[str, Any]]:
+        """Rows (with 开盘日期) for every dated entry of the 开盘信息 section."""
+        rows = []
+        for date, desc in iter_kaipan_entries(lines):
+            row = self.extract(desc)
+            row["开盘日期"] = date
+            rows.append(row)
+        return rows
+
+    def extract_file(self, path: str) -> List[Dict[str, Any]]:
+        with open(path, "r", encoding="utf-8") as f:
+            return self.extract_lines(f)
+
+    def to_frame(self, rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        return pd.DataFrame(rows, columns=self.columns).fillna(MISSING)
+
+
+def iter_kaipan_entries(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    (开盘日期, 开盘描述) pairs from the lines after "开盘信息:" up to "更多".
+
+    An entry is a yyyy/mm/dd line followed by a 开盘描述 block that ends at
+    查看产品信息 / 查看销售报价; entries without description text are skipped.
+    """
+    in_section = False
+    current_date = None
+    current_desc: List[str] = []
+    collecting_desc = False
+
+    for line in lines:
+        line = line.strip()
+        if line == "开盘信息:":
+            in_section = True
+            continue
+        if not in_section:
+            continue
+        if line == "更多":
+            break
+        if _DATE_LINE.match(line):
+            if current_date and current_desc:
+                yield current_date, ' '.join(current_desc).strip()
+            current_date = line
+            current_desc = []
+            collecting_desc = False
+            continue
+        if line == "开盘描述":
+            collecting_desc = True
+            continue
+        if collecting_desc and ("查看产品信息" in line or "查看销售报价" in line):
+            collecting_desc = False
+            continue
+        if collecting_desc and line:
+            current_desc.append(line + ' ')
+
+    if current_date and current_desc:
+        yield current_date, ' '.join(current_desc).strip()
+
+
+def _extract_project(project: Dict[str, Optional[str]], extractor: KaipanExtractor) -> Tuple[str, List[Dict[str, Any]], str]:
+    """Process-pool worker: (project_name, rows, error)."""
+    try:
+        return project["project_name"], extractor.extract_file(project["housing_path"]), ""
+    except Exception as e:
+        return project["project_name"], [], str(e)
+
+
+def bulk_extract(root: str, products: Sequence[ProductSpec] = DEFAULT_PRODUCTS,
+                 max_workers: int = None) -> pd.DataFrame:
+    """
+    Opening records of every *_基本信息.txt under root, one row per entry with a leading 项目 column.
+    """
+    try:
+        from .data_processor_cric_bulk_ingest import discover_projects
+    except ImportError:
+        from data_processor_cric_bulk_ingest import discover_projects
+
+    extractor = KaipanExtractor(products)
+    projects = [p for p in discover_projects(root) if p["housing_path"]]
+    worker = partial(_extract_project, extractor=extractor)
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers > 1 and len(projects) > 1:
+        chunksize = max(1, len(projects) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(worker, projects, chunksize=chunksize))
+    else:
+        results = [worker(project) for project in projects]
+
+    rows = []
+    for project_name, project_rows, error in results:
+        if error:
+            print(f"[WARN] {project_name} 开盘信息提取失败: {error}")
+        rows.extend(dict(row, 项目=project_name) for row in project_rows)
+    return pd.DataFrame(rows, columns=["项目"] + extractor.columns).fillna(MISSING)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="批量提取开盘信息")
+    arg_parser.add_argument("root", nargs="?", default=os.path.join("resources", "working_data"))
+    arg_parser.add_argument("--output", default=os.path.join("resources", "working_data", "开盘信息汇总.xlsx"))
+    arg_parser.add_argument("--config", default=DEFAULT_CONFIG_PATH, help="产品类型配置文件")
+    arg_parser.add_argument("--workers", type=int, help="进程数，默认 CPU 核数")
+    args = arg_parser.parse_args()
+    df = bulk_extract(args.root, load_product_specs(args.config), args.workers)
+    df.to_excel(args.output, index=False)
+    print(f"[OK] {df['项目'].nunique()} 个项目、{len(df)} 条开盘记录已写入 {args.output}")
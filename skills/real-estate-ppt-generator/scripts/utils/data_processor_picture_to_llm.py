@@ -4,15 +4,29 @@ Picture to LLM Data Processor
 Analyzes floor plan images using SiliconFlow API to generate layout descriptions and analysis
 """
 
-import os
-import base64
-from openai import OpenAI
+import asyncio
+import hashlib
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List
 
-def run(project_name: str, image_paths: List[str] = None) -> Dict[str, Any]:
-    """Run the floor plan analysis with a given project name and list of image paths."""
+try:
+    from .llm_client import achat, provider_concurrency, run_async
+    from .data_processor_floor_plan_preprocess import FloorPlanIndex, encode_data_url, group_duplicates, prepare_image
+except ImportError:
+    from llm_client import achat, provider_concurrency, run_async
+    from data_processor_floor_plan_preprocess import FloorPlanIndex, encode_data_url, group_duplicates, prepare_image
+
+VISION_MODEL = "Qwen/Qwen2.5-VL-32B-Instruct"
+TEXT_MODEL = "deepseek-ai/DeepSeek-R1"
+
+def run(project_name: str, image_paths: List[str] = None, reuse_duplicates: bool = True) -> Dict[str, Any]:
+    """
+    Run the floor plan analysis with a given project name and list of image paths.
+
+    Images are downscaled before upload; with reuse_duplicates=True a floor plan that
+    was already analyzed (same dHash, in this or any earlier project) is not sent again.
+    """
     
     # 设置默认图片路径列表
     if image_paths is None:
@@ -24,13 +38,6 @@ def run(project_name: str, image_paths: List[str] = None) -> Dict[str, Any]:
             "resources/images/room_style5.jpg"   # 叠拼2
         ]
     
-    # 设置SiliconFlow API客户端
-    # 注意：API密钥应通过环境变量或配置文件提供，此处仅保留占位符
-    client = OpenAI(
-        api_key=os.getenv("SILICONFLOW_API_KEY", "sk-ykloduxdazjstefqarmswtetrtafvvalaxtkqhxeldvsogtt"),
-        base_url="https://api.siliconflow.cn/v1"  # SiliconFlow API基础URL
-    )
-    
     # 视觉模型提示词（中文，用于户型布局分析）
     vision_prompt = """
     分析提供的户型图，详细描述布局，包括：
@@ -52,48 +59,40 @@ def run(project_name: str, image_paths: List[str] = None) -> Dict[str, Any]:
     
     """
     
-    # 将图片编码为base64
-    def encode_image(image_path):
-        try:
-            with open(image_path, "rb") as image_file:
-                return base64.b64encode(image_file.read()).decode('utf-8')
-        except Exception as e:
-            print(f"无法编码图片 {image_path}: {str(e)}")
-            return None
+    # 提示词或模型变化时，户型图索引中的旧结果不再复用
+    analysis_version = hashlib.sha256(
+        "\n".join([VISION_MODEL, vision_prompt, TEXT_MODEL, llm_prompt_template]).encode("utf-8")).hexdigest()[:16]
     
-    # 分析单张户型图
-    def analyze_floor_plan(image_path):
-        # 编码图片
-        base64_image = encode_image(image_path)
-        if base64_image is None:
-            return {
-                "image_path": image_path,
-                "layout_description": "",
-                "analysis_text": f"错误：无法读取图片 {image_path}",
-                "error": True
-            }
+    # 分析单张户型图（协程，多张图片并发执行；SiliconFlow 客户端与限流由 llm_client 统一管理）
+    async def analyze_floor_plan(prepared, slots):
+        image_path = prepared.source_path
         
         # 步骤1：使用视觉模型（SiliconFlow支持的视觉模型，例如qwen-vl）获取布局描述
         try:
-            vision_response = client.chat.completions.create(
-                model="Qwen/Qwen2.5-VL-32B-Instruct",  # SiliconFlow支持的视觉模型
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": vision_prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"  # 假设为JPEG格式，需根据实际调整
+            # 取得并发槽后才编码为 data URL，按实际格式标注 MIME，请求结束即释放
+            async with slots:
+                image_url = encode_data_url(prepared)
+                vision_response = await achat(
+                    "siliconflow",
+                    model=VISION_MODEL,  # SiliconFlow支持的视觉模型
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [
+                                {"type": "text", "text": vision_prompt},
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": image_url
+                                    }
                                 }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=500,
-                temperature=0.7
-            )
+                            ]
+                        }
+                    ],
+                    max_tokens=500,
+                    temperature=0.7
+                )
+                del image_url
             layout_description = vision_response.choices[0].message.content.strip()
         except Exception as e:
             print(f"视觉模型处理 {image_path} 失败: {str(e)}")
@@ -106,8 +105,9 @@ def run(project_name: str, image_paths: List[str] = None) -> Dict[str, Any]:
         
         # 步骤2：使用LLM（SiliconFlow支持的模型，例如DeepSeek-R1）生成分析文本
         try:
-            llm_response = client.chat.completions.create(
-                model="deepseek-ai/DeepSeek-R1",  # SiliconFlow支持的LLM模型
+            llm_response = await achat(
+                "siliconflow",
+                model=TEXT_MODEL,  # SiliconFlow支持的LLM模型
                 messages=[
                     {
                         "role": "user",
@@ -140,11 +140,62 @@ def run(project_name: str, image_paths: List[str] = None) -> Dict[str, Any]:
     output_dir.mkdir(parents=True, exist_ok=True)
     output_file = output_dir / f"{project_name}_户型分析.txt"
     
+    # 预处理：识别格式、缩小到模型有效分辨率、计算感知哈希
+    analyzed = {}
+    prepared = {}
+    for path in image_paths:
+        if not Path(path).exists():
+            continue
+        try:
+            prepared[path] = prepare_image(path)
+        except OSError as e:
+            print(f"无法读取图片 {path}: {str(e)}")
+            analyzed[path] = {
+                "image_path": path,
+                "layout_description": "",
+                "analysis_text": f"错误：无法读取图片 {path}",
+                "error": True
+            }
+
+    # 同一户型图只分析一次：本次重复的图片、以及以前项目中分析过的图片直接复用结果
+    representative = group_duplicates(list(prepared.values())) if reuse_duplicates else {p: p for p in prepared}
+    index = FloorPlanIndex() if reuse_duplicates else None
+    pending = []
+    for path, img in prepared.items():
+        if representative[path] != path:
+            continue
+        hit = index.lookup(img, analysis_version) if index else None
+        if hit:
+            print(f"[INFO] {path} 与已分析的户型图 {hit['image_path']} 相同，复用分析结果")
+            analyzed[path] = dict(hit, image_path=path)
+            for key in ("version", "aspect"):
+                analyzed[path].pop(key, None)
+        else:
+            pending.append(img)
+
+    # 其余图片并发分析，结果仍按原顺序写入
+    async def analyze_all(images):
+        # 同时持有 base64 数据的协程不超过服务商并发数（gather 会同时启动全部协程）
+        slots = asyncio.Semaphore(provider_concurrency("siliconflow"))
+        return await asyncio.gather(*(analyze_floor_plan(img, slots) for img in images), return_exceptions=True)
+
+    if pending:
+        for img, result in zip(pending, run_async(analyze_all(pending))):
+            analyzed[img.source_path] = result
+            if index is not None and isinstance(result, dict) and not result["error"]:
+                index.add(img, analysis_version, result)
+        if index is not None:
+            index.save()
+    for path, rep in representative.items():
+        if rep != path:
+            result = analyzed[rep]
+            analyzed[path] = result if isinstance(result, Exception) else dict(result, image_path=path)
+
     results = []
     with open(output_file, "w", encoding="utf-8") as f:
         for path in image_paths:
             try:
-                if not Path(path).exists():
+                if path not in analyzed:
                     error_msg = f"图片不存在: {path}\n"
                     f.write(error_msg)
                     print(error_msg)
@@ -156,7 +207,9 @@ def run(project_name: str, image_paths: List[str] = None) -> Dict[str, Any]:
                     })
                     continue
                 
-                result = analyze_floor_plan(path)
+                result = analyzed[path]
+                if isinstance(result, Exception):
+                    raise result
                 results.append(result)
                 # 写入TXT文件
                 f.write(f"户型图路径: {path}\n")
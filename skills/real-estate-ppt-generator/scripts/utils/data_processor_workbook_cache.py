@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Columnar cache in front of ``pd.read_excel``.
+
+The first read of a workbook parses it with pandas as before and stores the
+resulting DataFrame as Feather under
+``resources/working_data/.cache/workbooks/<content sha256>_<read args>.feather``;
+every later read of a file with the same content (in any stage, process or
+run) loads the Feather copy memory-mapped instead of parsing XML again.
+
+The frame is written through ``pyarrow.Table.from_pandas``, so integer column
+labels (``header=None``) and ``index_col`` indexes are kept. Only frames
+Arrow cannot store or does not round-trip exactly (mixed object columns,
+mixed-type labels) are pickled. Without pyarrow nothing is cached.
+
+Most cached workbooks are intermediate results that every run rewrites, so
+each run adds an entry. Entries not read for ``ttl`` seconds (default 7
+days, ``WORKBOOK_CACHE_TTL``) are deleted after every store. Past
+``max_bytes`` (default 512MB, ``WORKBOOK_CACHE_MAX_BYTES``) the least
+recently read entries are deleted too. Set ``WORKBOOK_CACHE=off`` to always
+read the workbook directly.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from typing import Any, Optional
+
+import pandas as pd
+
+try:
+    from .pipeline_stage_cache import file_digest
+except ImportError:
+    from pipeline_stage_cache import file_digest
+
+DEFAULT_CACHE_DIR = os.path.join("resources", "working_data", ".cache", "workbooks")
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+ENTRY_SUFFIXES = (".feather", ".pkl")
+
+
+def cache_enabled() -> bool:
+    return os.getenv("WORKBOOK_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+
+def _entry_base(digest: str, read_kwargs: dict, cache_dir: str) -> str:
+    args = json.dumps(read_kwargs, sort_keys=True, default=str)
+    args_key = hashlib.sha256(f"{args}|{pd.__version__}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{digest}_{args_key}")
+
+
+def _read_feather(path: str, memory_map: bool = True) -> pd.DataFrame:
+    from pyarrow import feather
+    return feather.read_table(path, memory_map=memory_map).to_pandas()
+
+
+def _load(base: str):
+    for suffix in ENTRY_SUFFIXES:
+        path = base + suffix
+        if not os.path.exists(path):
+            continue
+        try:
+            os.utime(path)  # 记录最近读取时间，淘汰时按此排序
+        except OSError:
+            pass
+        if suffix == ".feather":
+            return _read_feather(path)
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    return None
+
+
+def _round_trips(back: pd.DataFrame, df: pd.DataFrame) -> bool:
+    return (back.equals(df) and back.dtypes.equals(df.dtypes)
+            and back.columns.equals(df.columns) and back.columns.dtype == df.columns.dtype
+            and back.index.equals(df.index))
+
+
+def _store(base: str, df: pd.DataFrame) -> None:
+    try:
+        import pyarrow as pa
+        from pyarrow import feather
+    except ImportError:
+        return  # Feather 不可用时不缓存
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    tmp = f"{base}.{os.getpid()}.tmp"
+    try:
+        feather.write_feather(pa.Table.from_pandas(df), tmp)
+        if _round_trips(_read_feather(tmp, memory_map=False), df):
+            os.replace(tmp, base + ".feather")
+            return
+    except (pa.ArrowException, TypeError, ValueError):
+        pass  # Arrow 无法表示该 DataFrame，改用 pickle
+    with open(tmp, "wb") as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, base + ".pkl")
+
+
+def evict(cache_dir: str = DEFAULT_CACHE_DIR, ttl: Optional[float] = None,
+          max_bytes: Optional[int] = None) -> int:
+    """
+    Delete entries not read for ttl seconds, then the least recently read ones
+    until the cache is at most max_bytes. Returns the number of entries deleted.
+    """
+    ttl = float(os.getenv("WORKBOOK_CACHE_TTL", DEFAULT_TTL)) if ttl is None else ttl
+    max_bytes = int(os.getenv("WORKBOOK_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)) if max_bytes is None else max_bytes
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0
+    entries = []
+    for name in names:
+        if not name.endswith(ENTRY_SUFFIXES):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    entries.sort()  # 最久未读取的在前
+
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for accessed, size, path in entries:
+        if now - accessed <= ttl and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue  # 其他进程正在使用（Windows）或已删除
+        total -= size
+        removed += 1
+    return removed
+
+
+def read_excel_cached(io, cache_dir: str = DEFAULT_CACHE_DIR, **read_kwargs: Any) -> pd.DataFrame:
+    """
+    Drop-in for pd.read_excel(io, **read_kwargs) on a file path.
+
+    Only single-sheet reads (sheet_name an int or str) are cached; anything
+    else, or a missing file, goes straight to pd.read_excel so errors are the same.
+    """
+    sheet_name = read_kwargs.get("sheet_name", 0)
+    if not cache_enabled() or not isinstance(io, (str, os.PathLike)) or not isinstance(sheet_name, (int, str)):
+        return pd.read_excel(io, **read_kwargs)
+    digest = file_digest(os.fspath(io))
+    if digest is None:
+        return pd.read_excel(io, **read_kwargs)
+
+    base = _entry_base(digest, read_kwargs, cache_dir)
+    try:
+        df = _load(base)
+    except Exception as e:
+        print(f"[WARN] 工作簿缓存读取失败，重新解析 {io}: {e}")
+        df = None
+    if df is not None:
+        return df
+
+    df = pd.read_excel(io, **read_kwargs)
+    try:
+        _store(base, df)
+        evict(cache_dir)
+    except OSError as e:
+        print(f"[WARN] 工作簿缓存写入失败: {e}")
+    return df
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared LLM client for every LLM stage of the pipeline.
+
+One AsyncOpenAI client per provider (SiliconFlow, Moonshot) lives on a
+background event loop, so all stages in a process share its connection
+pool. Each provider has its own concurrency limit and token-bucket rate
+limit; 429 / 5xx / connection errors are retried with exponential backoff.
+Every call records latency and token usage. Completed responses are kept in
+a persistent cache (see llm_response_cache) so reruns do not pay again.
+
+Synchronous stages call ``chat()``; stages with several independent
+requests build coroutines with ``achat()`` and run them together with
+``run_async()``.
+
+Limits can be overridden per provider with environment variables, e.g.
+``LLM_SILICONFLOW_CONCURRENCY=4`` and ``LLM_SILICONFLOW_RPM=30``. The backend
+(live API, record, replay or offline mock) is chosen by ``LLM_PROVIDER_MODE``;
+see llm_providers.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+from openai.types.chat import ChatCompletion
+
+try:
+    from .llm_providers import get_mode, make_provider
+    from .llm_response_cache import LLMResponseCache, cache_enabled, request_key
+except ImportError:
+    from llm_providers import get_mode, make_provider
+    from llm_response_cache import LLMResponseCache, cache_enabled, request_key
+
+
+@dataclass
+class ProviderConfig:
+    base_url: str
+    api_key_env: str
+    max_concurrency: int = 8
+    requests_per_minute: float = 60.0
+    max_retries: int = 4
+    timeout: float = 300.0
+
+    @property
+    def api_key(self) -> str:
+        """The key from the environment; there is no built-in default."""
+        key = os.getenv(self.api_key_env)
+        if not key:
+            raise ValueError(f"{self.api_key_env} is not set (API key for {self.base_url})")
+        return key
+
+
+PROVIDERS: Dict[str, ProviderConfig] = {
+    "siliconflow": ProviderConfig(
+        base_url="https://api.siliconflow.cn/v1",
+        api_key_env="SILICONFLOW_API_KEY",
+    ),
+    "moonshot": ProviderConfig(
+        base_url="https://api.moonshot.cn/v1",
+        api_key_env="MOONSHOT_API_KEY",
+        max_concurrency=4,
+        requests_per_minute=20.0,
+    ),
+}
+
+_BACKOFF_BASE = 1.0
+_BACKOFF_MAX = 30.0
+
+
+@dataclass
+class CallMetric:
+    provider: str
+    model: str
+    latency: float
+    attempts: int
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    ok: bool = True
+    error: str = ""
+    cached: bool = False
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        if retry_after is not None:
+            return min(float(retry_after), _BACKOFF_MAX)
+    except ValueError:
+        pass
+    delay = min(_BACKOFF_BASE * 2 ** attempt, _BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class LLMClient:
+    """Per-process client pool with limits and metrics, driven by one background event loop."""
+
+    def __init__(self, providers: Optional[Dict[str, ProviderConfig]] = None, mode: Optional[str] = None):
+        self.providers = dict(providers or PROVIDERS)
+        self.backend = make_provider(mode)
+        self.metrics: List[CallMetric] = []
+        self._ready: set = set()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._metrics_lock = threading.Lock()
+        self._response_cache: Optional[LLMResponseCache] = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client-loop", daemon=True)
+        self._thread.start()
+
+    def _config(self, provider: str) -> ProviderConfig:
+        if provider not in self.providers:
+            raise ValueError(f"unknown LLM provider {provider!r}")
+        config = self.providers[provider]
+        prefix = f"LLM_{provider.upper()}_"
+        config.max_concurrency = int(os.getenv(prefix + "CONCURRENCY", config.max_concurrency))
+        config.requests_per_minute = float(os.getenv(prefix + "RPM", config.requests_per_minute))
+        return config
+
+    def concurrency(self, provider: str) -> int:
+        """Concurrent requests allowed for a provider (after environment overrides)."""
+        return self._config(provider).max_concurrency
+
+    def _ensure_provider(self, provider: str) -> None:
+        """Create the limiters lazily, on the loop thread."""
+        if provider in self._ready:
+            return
+        config = self._config(provider)
+        self._ready.add(provider)
+        self._semaphores[provider] = asyncio.Semaphore(config.max_concurrency)
+        rate = config.requests_per_minute / 60.0
+        self._buckets[provider] = TokenBucket(rate, capacity=max(1.0, min(config.max_concurrency, rate * 60)))
+
+    @property
+    def response_cache(self) -> Optional[LLMResponseCache]:
+        if not cache_enabled() or not self.backend.uses_response_cache:
+            return None
+        if self._response_cache is None:
+            self._response_cache = LLMResponseCache()
+        return self._response_cache
+
+    async def achat(self, provider: str, model: str, messages: List[Dict[str, Any]],
+                    use_cache: bool = True, **params):
+        """
+        Async chat completion with rate limiting and retries; returns the ChatCompletion.
+
+        use_cache=False skips the response cache for this call (the result is still stored).
+        """
+        self._ensure_provider(provider)
+        config = self.providers[provider]
+        start = time.time()
+        cache = self.response_cache
+        key = request_key(provider, model, messages, params) if cache is not None else None
+        if cache is not None and use_cache:
+            body = cache.get(key)
+            if body is not None:
+                response = ChatCompletion.model_validate(body)
+                self._record(CallMetric(provider, model, time.time() - start, 0, cached=True))
+                print(f"[LLM] {provider}/{model} 命中响应缓存")
+                return response
+
+        attempt = 0
+        while True:
+            try:
+                await self._buckets[provider].acquire()
+                async with self._semaphores[provider]:
+                    response = await self.backend.complete(provider, config, model, messages, params)
+                break
+            except Exception as e:
+                if not _is_retryable(e) or attempt >= config.max_retries:
+                    self._record(CallMetric(provider, model, time.time() - start, attempt + 1, ok=False, error=str(e)))
+                    raise
+                delay = _retry_delay(e, attempt)
+                print(f"[WARN] {provider}/{model} 调用失败（{type(e).__name__}），{delay:.1f}s 后重试")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+        usage = getattr(response, "usage", None)
+        metric = CallMetric(provider, model, time.time() - start, attempt + 1,
+                            getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0)
+        self._record(metric)
+        print(f"[LLM] {provider}/{model} {metric.latency:.2f}s tokens {metric.prompt_tokens}+{metric.completion_tokens}")
+        if cache is not None:
+            try:
+                cache.put(key, provider, model, response.model_dump(mode="json"))
+            except Exception as e:
+                print(f"[WARN] LLM 响应缓存写入失败: {e}")
+        return response
+
+    def _record(self, metric: CallMetric) -> None:
+        with self._metrics_lock:
+            self.metrics.append(metric)
+
+    def run_async(self, coro):
+        """Run a coroutine on the client loop from synchronous code and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def chat(self, provider: str, model: str, messages: List[Dict[str, Any]], **params):
+        return self.run_async(self.achat(provider, model, messages, **params))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregate metrics per provider/model."""
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._metrics_lock:
+            metrics = list(self.metrics)
+        for m in metrics:
+            s = out.setdefault(f"{m.provider}/{m.model}", {"calls": 0, "cached": 0, "errors": 0, "retries": 0,
+                                                            "latency": 0.0, "prompt_tokens": 0, "completion_tokens": 0})
+            s["calls"] += 1
+            s["cached"] += 1 if m.cached else 0
+            s["errors"] += 0 if m.ok else 1
+            s["retries"] += max(m.attempts - 1, 0)
+            s["latency"] += m.latency
+            s["prompt_tokens"] += m.prompt_tokens
+            s["completion_tokens"] += m.completion_tokens
+        return out
+
+    def print_summary(self) -> None:
+        summary = self.summary()
+        if not summary:
+            return
+        print("\nLLM 调用统计:")
+        print(f"{'model':<48}{'calls':>6}{'cached':>7}{'errors':>7}{'retries':>8}{'avg(s)':>8}{'tokens in/out':>16}")
+        for name, s in summary.items():
+            tokens = f"{s['prompt_tokens']}/{s['completion_tokens']}"
+            print(f"{name:<48}{s['calls']:>6}{s['cached']:>7}{s['errors']:>7}{s['retries']:>8}"
+                  f"{s['latency'] / s['calls']:>8.2f}{tokens:>16}")
+
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LLMClient:
+    """Process-wide shared client; follows LLM_PROVIDER_MODE if it changes between runs."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMClient()
+        elif _client.backend.name != get_mode():
+            _client.backend = make_provider()
+        return _client
+
+
+def chat(provider: str, model: str, messages: List[Dict[str, Any]], **params):
+    """Synchronous chat completion through the shared client."""
+    return get_client().chat(provider, model, messages, **params)
+
+
+async def achat(provider: str, model: str, messages: List[Dict[str, Any]], **params):
+    """Coroutine form of chat(); run it with run_async()."""
+    return await get_client().achat(provider, model, messages, **params)
+
+
+def run_async(coro):
+    return get_client().run_async(coro)
+
+
+def provider_concurrency(provider: str) -> int:
+    """Concurrency limit of a provider on the shared client."""
+    return get_client().concurrency(provider)
+
+
+def is_loaded() -> bool:
+    return _client is not None
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pluggable backends behind llm_client.
+
+- live:   call the real provider API (default)
+- record: call the real API and save every response under the recordings dir
+- replay: answer from recordings only, sleeping the recorded latency; no network
+- mock:   answer with canned text after a simulated latency; no network
+
+Select the mode with ``LLM_PROVIDER_MODE`` (or ``main_pipeline.py --llm-mode``).
+Recordings live in ``LLM_RECORDINGS_DIR`` (default
+``resources/working_data/.cache/llm_recordings``), one JSON file per request key.
+
+Mock latency is drawn from a log-normal distribution per model family, seeded
+by the request so repeated runs see the same delays. Override it with
+``LLM_MOCK_LATENCY="median[,sigma]"`` (seconds) and scale every simulated or
+replayed delay with ``LLM_LATENCY_SCALE`` (e.g. 0 for instant answers).
+``LLM_MOCK_RESPONSES`` may point to a JSON list of {"match": ..., "content": ...}
+rules that take precedence over the built-in canned answers.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+try:
+    from .llm_response_cache import request_key
+except ImportError:
+    from llm_response_cache import request_key
+
+MODES = ("live", "record", "replay", "mock")
+DEFAULT_RECORDINGS_DIR = os.path.join("resources", "working_data", ".cache", "llm_recordings")
+
+# (median seconds, sigma) of the simulated latency, matched by model name substring
+MOCK_LATENCY = {
+    "VL": (6.0, 0.4),
+    "R1": (15.0, 0.5),
+    "kimi": (20.0, 0.5),
+}
+DEFAULT_MOCK_LATENCY = (5.0, 0.5)
+
+# Canned answers shaped like the real ones, so downstream parsers and slides still work
+MOCK_RESPONSES: List[Dict[str, str]] = [
+    {"match": "分析提供的户型图",
+     "content": "（模拟）三室两厅两卫，客厅与主卧朝南，厨房朝北；入户玄关连接客餐厅，动静分区明确，为高层住宅，约 95㎡。"},
+    {"match": "### 总体评价",
+     "content": "### 总体评价\n（模拟）南北通透，动线紧凑，空间利用率高，适合三口之家。"},
+    {"match": "开盘/开盘信息",
+     "content": "（模拟）项目于首开批次推出住宅房源，开盘均价与周边竞品基本持平。"},
+    {"match": "对项目的周边配套进行全面总结",
+     "content": "（模拟）\n- 地段交通：步行可达地铁站，公交线路较多。\n- 附近学校：周边有幼儿园、小学及初中各 1 所。\n"
+                "- 居住品质：小区绿化率较高，物业服务规范。\n- 生活配套：商业、医疗、银行均在 1 公里范围内。"},
+    {"match": "购房客群分析",
+     "content": "（模拟）主要购房客群画像\n\n1. 地域来源\n   本地改善40%，地铁沿线外溢35%，市内其他区域20%，外省市5%。\n\n"
+                "2. 支付力\n   总价段中等，首付比例 40-60%。\n\n结论\n以本地改善和沿线刚改家庭为主。"},
+]
+
+
+def get_mode() -> str:
+    mode = os.getenv("LLM_PROVIDER_MODE", "live").lower()
+    if mode not in MODES:
+        raise ValueError(f"LLM_PROVIDER_MODE must be one of {MODES}, got {mode!r}")
+    return mode
+
+
+def _latency_scale() -> float:
+    return float(os.getenv("LLM_LATENCY_SCALE", "1"))
+
+
+def _completion(model: str, content: str, prompt_chars: int) -> ChatCompletion:
+    prompt_tokens, completion_tokens = max(prompt_chars // 2, 1), max(len(content) // 2, 1)
+    return ChatCompletion.model_validate({
+        "id": "mock-" + hashlib.sha1(content.encode("utf-8")).hexdigest()[:12],
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    })
+
+
+def _prompt_text(messages: List[Any]) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else getattr(message, "content", None)
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(item.get("text", "") for item in content if isinstance(item, dict))
+    return "\n".join(parts)
+
+
+class LiveProvider:
+    """Real API calls; one AsyncOpenAI client (and connection pool) per provider."""
+
+    name = "live"
+    uses_response_cache = True
+
+    def __init__(self):
+        self._clients: Dict[str, AsyncOpenAI] = {}
+
+    async def complete(self, provider: str, config, model: str, messages: List[Any],
+                       params: Dict[str, Any]) -> ChatCompletion:
+        if provider not in self._clients:
+            self._clients[provider] = AsyncOpenAI(api_key=config.api_key, base_url=config.base_url,
+                                                  max_retries=0, timeout=config.timeout)
+        return await self._clients[provider].chat.completions.create(model=model, messages=messages, **params)
+
+
+class RecordingProvider(LiveProvider):
+    """Live calls whose responses are written to the recordings dir for later replay."""
+
+    name = "record"
+    uses_response_cache = False  # every request must reach the API to be recorded
+
+    def __init__(self, recordings_dir: Optional[str] = None):
+        super().__init__()
+        self.recordings_dir = recordings_dir or os.getenv("LLM_RECORDINGS_DIR", DEFAULT_RECORDINGS_DIR)
+        os.makedirs(self.recordings_dir, exist_ok=True)
+
+    async def complete(self, provider, config, model, messages, params) -> ChatCompletion:
+        start = time.time()
+        response = await super().complete(provider, config, model, messages, params)
+        record = {"provider": provider, "model": model, "latency": time.time() - start,
+                  "response": response.model_dump(mode="json")}
+        key = request_key(provider, model, messages, params)
+        path = os.path.join(self.recordings_dir, f"{key}.json")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return response
+
+
+class ReplayProvider:
+    """Serve recorded responses; a request that was never recorded is an error."""
+
+    name = "replay"
+    uses_response_cache = False
+
+    def __init__(self, recordings_dir: Optional[str] = None):
+        self.recordings_dir = recordings_dir or os.getenv("LLM_RECORDINGS_DIR", DEFAULT_RECORDINGS_DIR)
+
+    async def complete(self, provider, config, model, messages, params) -> ChatCompletion:
+        key = request_key(provider, model, messages, params)
+        path = os.path.join(self.recordings_dir, f"{key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            raise LookupError(f"no recorded response for {provider}/{model} (key {key[:12]})") from None
+        await asyncio.sleep(record.get("latency", 0.0) * _latency_scale())
+        return ChatCompletion.model_validate(record["response"])
+
+
+class MockProvider:
+    """Canned responses with simulated, reproducible latency."""
+
+    name = "mock"
+    uses_response_cache = False
+
+    def __init__(self, responses: Optional[List[Dict[str, str]]] = None,
+                 latency: Optional[Tuple[float, float]] = None, seed: Optional[int] = None):
+        rules_path = os.getenv("LLM_MOCK_RESPONSES")
+        if responses is None and rules_path:
+            with open(rules_path, "r", encoding="utf-8") as f:
+                responses = json.load(f) + MOCK_RESPONSES
+        self.responses = responses if responses is not None else MOCK_RESPONSES
+        if latency is None and os.getenv("LLM_MOCK_LATENCY"):
+            values = [float(v) for v in os.getenv("LLM_MOCK_LATENCY").split(",")]
+            latency = (values[0], values[1] if len(values) > 1 else 0.0)
+        self.latency = latency
+        self.seed = int(os.getenv("LLM_MOCK_SEED", "0")) if seed is None else seed
+
+    def _delay(self, model: str, key: str) -> float:
+        median, sigma = self.latency or next(
+            (v for k, v in MOCK_LATENCY.items() if k in model), DEFAULT_MOCK_LATENCY)
+        rng = random.Random(f"{self.seed}:{key}")
+        return median * rng.lognormvariate(0.0, sigma) if sigma else median
+
+    async def complete(self, provider, config, model, messages, params) -> ChatCompletion:
+        prompt = _prompt_text(messages)
+        content = next((r["content"] for r in self.responses if r["match"] in prompt), "（模拟响应）")
+        await asyncio.sleep(self._delay(model, request_key(provider, model, messages, params)) * _latency_scale())
+        return _completion(model, content, len(prompt))
+
+
+def make_provider(mode: Optional[str] = None):
+    mode = mode or get_mode()
+    return {"live": LiveProvider, "record": RecordingProvider,
+            "replay": ReplayProvider, "mock": MockProvider}[mode]()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent cache of LLM chat completions (SQLite).
+
+The key is the SHA-256 of provider, model, messages and sampling parameters.
+Inline base64 images (``data:...;base64,`` URLs) are replaced by the SHA-256
+of their payload before hashing, so keys stay small and identical images
+hit regardless of which file they were read from.
+
+Entries expire after ``ttl`` seconds; when the database grows past
+``max_bytes`` the least recently used entries are evicted. Set
+``LLM_CACHE=off`` to bypass the cache entirely.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_PATH = os.path.join("resources", "working_data", ".cache", "llm_responses.sqlite")
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT,
+    model TEXT,
+    created REAL,
+    accessed REAL,
+    size INTEGER,
+    body TEXT
+)
+"""
+
+
+def cache_enabled() -> bool:
+    return os.getenv("LLM_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+
+def _normalize(value: Any) -> Any:
+    """JSON-friendly copy of a request with image payloads replaced by their hash."""
+    if hasattr(value, "model_dump"):  # assistant messages appended back into the conversation
+        value = value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str) and value.startswith("data:") and ";base64," in value:
+        header, payload = value.split(";base64,", 1)
+        return f"{header};sha256,{hashlib.sha256(payload.encode('ascii')).hexdigest()}"
+    return value
+
+
+def request_key(provider: str, model: str, messages: List[Any], params: Dict[str, Any]) -> str:
+    payload = {"provider": provider, "model": model, "messages": _normalize(messages), "params": _normalize(params)}
+    blob = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response store with TTL and LRU size eviction."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = float(os.getenv("LLM_CACHE_TTL", ttl))
+        self.max_bytes = int(os.getenv("LLM_CACHE_MAX_BYTES", max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")  # batch workers share the file
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored response body, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT created, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            created, body = row
+            if now - created > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return json.loads(body)
+
+    def put(self, key: str, provider: str, model: str, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (key, provider, model, now, now, len(data.encode("utf-8")), data))
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch runner: generate decks for many projects on a bounded process pool.
+
+Each worker process is warmed once (pandas, matplotlib with the Agg backend
+and its font cache, python-pptx, the slide master module) and then runs
+whole projects one after another. A project only ever touches its own
+``resources/working_data/{project}_{timestamp}`` directory; its console
+output is redirected to ``pipeline.log`` inside that directory so parallel
+projects do not interleave.
+
+Manifest formats (one project per entry):
+
+- .json: ["项目A", {"project_name": "项目B", "timestamp": "20250101"}]
+- .csv:  header with project_name and optional timestamp column
+- other: plain text, one project name per line, ``#`` starts a comment
+"""
+
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional
+
+try:
+    from .pipeline_scheduler import _init_process_worker, is_failed_result, resolve_target
+except ImportError:
+    from pipeline_scheduler import _init_process_worker, is_failed_result, resolve_target
+
+LOG_NAME = "pipeline.log"
+
+
+def load_manifest(path: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Read a project manifest.
+
+    Returns:
+    - list: [{"project_name": str, "timestamp": str or None}, ...], duplicates removed
+    """
+    ext = os.path.splitext(path)[1].lower()
+    entries: List[Dict[str, Optional[str]]] = []
+    with open(path, "r", encoding="utf-8-sig") as f:
+        if ext == ".json":
+            for item in json.load(f):
+                if isinstance(item, str):
+                    item = {"project_name": item}
+                entries.append({"project_name": str(item["project_name"]).strip(),
+                                "timestamp": item.get("timestamp")})
+        elif ext == ".csv":
+            for row in csv.DictReader(f):
+                name = (row.get("project_name") or "").strip()
+                if name:
+                    entries.append({"project_name": name, "timestamp": (row.get("timestamp") or "").strip() or None})
+        else:
+            for line in f:
+                name = line.split("#", 1)[0].strip()
+                if name:
+                    entries.append({"project_name": name, "timestamp": None})
+
+    jobs, seen = [], set()
+    for entry in entries:
+        key = (entry["project_name"], entry["timestamp"])
+        if not entry["project_name"] or key in seen:
+            if entry["project_name"]:
+                print(f"[WARN] 清单中重复的项目已忽略: {entry['project_name']}")
+            continue
+        seen.add(key)
+        jobs.append(entry)
+    return jobs
+
+
+def _warm_worker(sys_path: List[str], cwd: str, preload: List[str]) -> None:
+    """Process-pool initializer: import the heavy libraries once per worker."""
+    _init_process_worker(sys_path, cwd)
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        from matplotlib import font_manager
+        font_manager.fontManager  # builds / loads the font cache
+        import pandas  # noqa: F401
+        import openpyxl  # noqa: F401
+        import pptx  # noqa: F401
+        for module in preload:
+            resolve_target(module)
+    except Exception as e:
+        print(f"[WARN] 批处理进程预热失败: {e}")
+
+
+def run_project(target: str, job: Dict[str, Optional[str]], options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one project inside a worker with its output redirected to the project log.
+
+    Returns a summary dict only; full stage results stay on disk.
+    """
+    project_name, timestamp = job["project_name"], job["timestamp"]
+    working_dir = f"resources/working_data/{project_name}_{timestamp}"
+    os.makedirs(working_dir, exist_ok=True)
+    log_file = os.path.join(working_dir, LOG_NAME)
+
+    summary: Dict[str, Any] = {"project_name": project_name, "timestamp": timestamp, "success": False,
+                               "failed_stages": [], "duration": 0.0, "log_file": log_file, "error": ""}
+    start = time.time()
+    with open(log_file, "w", encoding="utf-8") as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            results = resolve_target(target)(project_name=project_name, timestamp=timestamp, **options)
+            if set(results) == {"error"}:  # pipeline aborted before any stage ran
+                summary["error"] = str(results["error"])
+            else:
+                summary["failed_stages"] = [name for name, result in results.items() if is_failed_result(result)]
+                summary["success"] = not summary["failed_stages"]
+        except Exception as e:
+            traceback.print_exc()
+            summary["error"] = str(e)
+    summary["duration"] = time.time() - start
+    return summary
+
+
+def run_batch(jobs: List[Dict[str, Optional[str]]], target: str, options: Optional[Dict[str, Any]] = None,
+              max_workers: Optional[int] = None, preload: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Run every job on a spawn process pool.
+
+    Parameters:
+    - jobs: list, entries from load_manifest (timestamp must be filled in)
+    - target: str, "module:function" taking (project_name, timestamp, **options)
+    - options: dict, extra keyword arguments for target
+    - max_workers: int, number of projects processed at once (default: os.cpu_count())
+    - preload: list, "module:function" targets imported when a worker starts
+
+    Returns:
+    - list: one summary dict per job, in manifest order
+    """
+    options = options or {}
+    workers = min(max_workers or os.cpu_count() or 4, max(len(jobs), 1))
+    summaries: Dict[int, Dict[str, Any]] = {}
+    print(f"[INFO] 批量处理 {len(jobs)} 个项目，{workers} 个工作进程")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"), initializer=_warm_worker,
+                             initargs=(list(sys.path), os.getcwd(), list(preload or []))) as pool:
+        futures = {pool.submit(run_project, target, job, options): i for i, job in enumerate(jobs)}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            job = jobs[i]
+            try:
+                summary = fut.result()
+            except Exception as e:  # worker crashed
+                summary = {"project_name": job["project_name"], "timestamp": job["timestamp"], "success": False,
+                           "failed_stages": [], "duration": 0.0, "log_file": "", "error": str(e)}
+            summaries[i] = summary
+            tag = "[OK]" if summary["success"] else "[ERROR]"
+            print(f"{tag} ({len(summaries)}/{len(jobs)}) {summary['project_name']} {summary['duration']:.1f}s")
+    return [summaries[i] for i in range(len(jobs))]
+
+
+def print_summary(summaries: List[Dict[str, Any]], wall_time: float) -> None:
+    print("\n批量处理汇总:")
+    print(f"{'project':<24}{'status':<8}{'time(s)':>9}  failed stages / error")
+    for s in summaries:
+        status = "OK" if s["success"] else "FAILED"
+        detail = ", ".join(s["failed_stages"]) or s["error"]
+        print(f"{s['project_name']:<24}{status:<8}{s['duration']:>9.1f}  {detail}")
+    ok = sum(1 for s in summaries if s["success"])
+    total = sum(s["duration"] for s in summaries)
+    print(f"[INFO] 成功 {ok} / 失败 {len(summaries) - ok}，实际耗时 {wall_time:.1f}s / 串行累计 {total:.1f}s")
+
+
+def write_summary_csv(summaries: List[Dict[str, Any]], path: str) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["project_name", "timestamp", "success", "duration", "failed_stages", "error", "log_file"])
+        for s in summaries:
+            writer.writerow([s["project_name"], s["timestamp"], s["success"], f"{s['duration']:.2f}",
+                             ";".join(s["failed_stages"]), s["error"], s["log_file"]])
+    return path
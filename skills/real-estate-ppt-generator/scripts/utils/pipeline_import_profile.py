@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Startup profiling: what importing the pipeline's stage modules costs.
+
+The modules are imported in a fresh interpreter with ``python -X importtime``
+(in the given order, with the caller's sys.path), so the numbers are cold
+import costs no matter what the current process has already loaded. The
+report lists:
+
+- every stage module with its cumulative import time. Dependencies shared
+  by several modules are charged to the first module that imports them.
+- the packages with the most import time of their own (pandas, matplotlib,
+  pptx, openai, ...)
+"""
+
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(modules: Sequence[str], sys_path: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Cold import times of modules, imported one after another in a new interpreter.
+
+    Returns:
+    - list: {"module", "self_ms", "cumulative_ms", "depth"} per module loaded, in import order
+    """
+    # __import__ goes through the C import path that -X importtime instruments (importlib.import_module does not)
+    code = (f"for name in {list(modules)!r}:\n"
+            "    try:\n"
+            "        __import__(name)\n"
+            "    except Exception as e:\n"
+            "        print(f'[WARN] {name}: {e}')\n")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in (sys_path or sys.path) if p))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, env=env)
+    if proc.stdout.strip():
+        print(proc.stdout.rstrip())
+    entries = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            entries.append({"module": m.group(4), "self_ms": int(m.group(1)) / 1000,
+                            "cumulative_ms": int(m.group(2)) / 1000, "depth": len(m.group(3)) // 2})
+    return entries
+
+
+def print_import_report(modules: Sequence[str], entries: List[Dict[str, Any]], top: int = 15) -> None:
+    """Per-module cumulative cost, then the heaviest packages by their own import time."""
+    by_name = {e["module"]: e for e in entries}
+    total = sum(e["self_ms"] for e in entries)
+    width = max([len(name) for name in modules] + [20]) + 2
+    print("\n========== 启动导入耗时 ==========")
+    print(f"{'模块':<{width}}{'累计(ms)':>10}")
+    for name in modules:
+        entry = by_name.get(name)
+        cost = f"{entry['cumulative_ms']:.1f}" if entry else "(失败)"
+        print(f"{name:<{width}}{cost:>10}")
+
+    packages: Dict[str, float] = {}
+    for e in entries:
+        package = e["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + e["self_ms"]
+    print(f"\n{'包':<{width}}{'自身(ms)':>10}")
+    for package, cost in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"{package:<{width}}{cost:>10.1f}")
+    print(f"\n合计 {total:.1f} ms（{len(entries)} 个模块，共享依赖计入首次导入它的模块）")
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DAG scheduler for the real-estate pipeline.
+
+Each stage declares the files it reads (inputs) and writes (outputs); an edge
+A -> B exists whenever B reads a file A writes, or B lists A in ``after``.
+Ready stages are dispatched to one of three lanes:
+
+- "thread":  shared thread pool, for network-bound LLM stages
+- "process": process pool, for pandas / matplotlib stages
+- "serial":  one dedicated thread, run in order (python-pptx deck edits,
+             stages that must not run concurrently)
+
+A critical-path report is printed at the end of the run. With a
+StageCache, stages whose inputs are unchanged are restored from the cache
+instead of being run.
+"""
+
+import importlib
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+LANES = ("thread", "process", "serial")
+
+
+@dataclass
+class Stage:
+    """One pipeline step and its data dependencies."""
+
+    name: str
+    target: Union[str, Callable[..., Any]]  # "package.module:function" or a callable
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    fallback_args: Optional[Tuple[Any, ...]] = None  # retried on TypeError (older run() signatures)
+    fallback_kwargs: Dict[str, Any] = field(default_factory=dict)
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    after: List[str] = field(default_factory=list)
+    lane: str = "thread"
+    label: str = ""
+    cache: bool = True  # False: always run (interactive or side-effecting stages)
+
+
+@dataclass
+class StageTiming:
+    name: str
+    lane: str
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def resolve_target(target: Union[str, Callable[..., Any]]) -> Callable[..., Any]:
+    """Import "package.module:function" lazily; callables are returned unchanged."""
+    if callable(target):
+        return target
+    module_name, _, func_name = target.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, func_name or "run")
+
+
+def invoke_stage(target, args, kwargs, fallback_args, fallback_kwargs, label) -> Tuple[Any, float, float]:
+    """
+    Run one stage and return (result, start, end).
+
+    Module-level so it can be pickled into process-pool workers. Exceptions are
+    turned into {"success": False, "error": ...} like the sequential pipeline did.
+    """
+    start = time.time()
+    print(f"\n执行{label}...")
+    try:
+        func = resolve_target(target)
+        try:
+            result = func(*args, **kwargs)
+        except TypeError:
+            if fallback_args is None:
+                raise
+            result = func(*fallback_args, **fallback_kwargs)
+    except Exception as e:
+        print(f"[WARN] {label} 调用异常: {e}")
+        traceback.print_exc()
+        result = {"success": False, "error": str(e)}
+    return result, start, time.time()
+
+
+def is_failed_result(result: Any) -> bool:
+    """Stage results use either {"success": False} or {"status": "error"}; both count as failures."""
+    if isinstance(result, dict):
+        return (result.get("success") is False or result.get("status") == "error"
+                or bool(result.get("error")))
+    return False
+
+
+def select_stages(stages: List[Stage], names: List[str]) -> List[Stage]:
+    """
+    Only the named stages, in declaration order.
+
+    The skipped stages are not run; selected stages read whatever their
+    inputs currently hold (e.g. regenerating one slide from existing files).
+    ``after`` orderings are kept through skipped stages, so selected deck
+    steps still run in their declared order.
+
+    Raises:
+        ValueError: on unknown stage names.
+    """
+    by_name = {s.name: s for s in stages}
+    unknown = [n for n in names if n not in by_name]
+    if unknown:
+        raise ValueError(f"unknown stage(s) {', '.join(unknown)}; available: {', '.join(by_name)}")
+    wanted = set(names)
+
+    def selected_after(stage: Stage, seen: set) -> List[str]:
+        deps: List[str] = []
+        for name in stage.after:
+            if name in wanted:
+                deps.append(name)
+            elif name not in seen and name in by_name:
+                seen.add(name)
+                deps.extend(selected_after(by_name[name], seen))
+        return deps
+
+    return [replace(s, after=list(dict.fromkeys(selected_after(s, set())))) for s in stages if s.name in wanted]
+
+
+def _init_process_worker(sys_path: List[str], cwd: str) -> None:
+    """Make spawned workers see the same import path and working directory."""
+    sys.path[:] = sys_path
+    os.chdir(cwd)
+
+
+def build_graph(stages: List[Stage]) -> Dict[str, List[str]]:
+    """
+    Return {stage name: [predecessor names]} derived from file inputs/outputs and ``after``.
+
+    Raises:
+        ValueError: on duplicate names, unknown ``after`` references, unknown lanes or cycles.
+    """
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("duplicate stage names in pipeline definition")
+
+    producers: Dict[str, List[str]] = {}
+    for s in stages:
+        if s.lane not in LANES:
+            raise ValueError(f"stage {s.name}: unknown lane {s.lane!r}")
+        for path in s.outputs:
+            producers.setdefault(os.path.normpath(path), []).append(s.name)
+
+    preds: Dict[str, List[str]] = {}
+    for s in stages:
+        deps: List[str] = []
+        for path in s.inputs:
+            for producer in producers.get(os.path.normpath(path), []):
+                if producer != s.name and producer not in deps:
+                    deps.append(producer)
+        for name in s.after:
+            if name not in names:
+                raise ValueError(f"stage {s.name}: unknown dependency {name!r}")
+            if name not in deps:
+                deps.append(name)
+        preds[s.name] = deps
+
+    # Cycle check (Kahn)
+    indegree = {n: len(p) for n, p in preds.items()}
+    succs: Dict[str, List[str]] = {n: [] for n in names}
+    for n, p in preds.items():
+        for d in p:
+            succs[d].append(n)
+    queue = [n for n in names if indegree[n] == 0]
+    visited = 0
+    while queue:
+        n = queue.pop()
+        visited += 1
+        for m in succs[n]:
+            indegree[m] -= 1
+            if indegree[m] == 0:
+                queue.append(m)
+    if visited != len(names):
+        raise ValueError("pipeline definition contains a dependency cycle")
+    return preds
+
+
+def critical_path(stages: List[Stage], preds: Dict[str, List[str]],
+                  timings: Dict[str, StageTiming]) -> Tuple[List[str], float]:
+    """Longest chain of stage durations through the graph."""
+    best: Dict[str, float] = {}
+    via: Dict[str, Optional[str]] = {}
+    remaining = [s.name for s in stages]
+    while remaining:
+        for name in list(remaining):
+            if all(p in best for p in preds[name]):
+                prev = max(preds[name], key=lambda p: best[p], default=None)
+                duration = timings[name].duration if name in timings else 0.0
+                best[name] = duration + (best[prev] if prev else 0.0)
+                via[name] = prev
+                remaining.remove(name)
+    if not best:
+        return [], 0.0
+    tail = max(best, key=best.get)
+    path = []
+    node: Optional[str] = tail
+    while node:
+        path.append(node)
+        node = via[node]
+    return list(reversed(path)), best[tail]
+
+
+def print_report(stages: List[Stage], preds: Dict[str, List[str]],
+                 timings: Dict[str, StageTiming], wall_time: float) -> None:
+    path, path_time = critical_path(stages, preds, timings)
+    on_path = set(path)
+    t0 = min((t.start for t in timings.values()), default=0.0)
+    total = sum(t.duration for t in timings.values())
+
+    print("\n关键路径报告:")
+    print(f"{'':2}{'stage':<42}{'lane':<9}{'start(s)':>9}{'time(s)':>9}")
+    for s in stages:
+        t = timings.get(s.name)
+        if t is None:
+            continue
+        mark = "*" if s.name in on_path else " "
+        print(f"{mark:2}{s.name:<42}{t.lane:<9}{t.start - t0:>9.2f}{t.duration:>9.2f}")
+    print(f"[INFO] 关键路径: {' -> '.join(path)}")
+    print(f"[INFO] 关键路径耗时 {path_time:.2f}s / 实际耗时 {wall_time:.2f}s / 串行累计 {total:.2f}s")
+
+
+def run_stages(stages: List[Stage], max_workers: Optional[int] = None,
+               parallel: bool = True, report: bool = True, cache=None,
+               use_processes: bool = True) -> Dict[str, Any]:
+    """
+    Execute stages respecting their dependencies.
+
+    Parameters:
+    - stages: List[Stage], stage declarations (declaration order is kept in the results)
+    - max_workers: int, size of the thread and process pools (default: os.cpu_count())
+    - parallel: bool, False runs every stage one by one in declaration order
+    - report: bool, print the critical-path report
+    - cache: StageCache, skip stages whose cache key is unchanged (optional)
+    - use_processes: bool, False runs the "process" lane on the thread pool
+      (used inside batch workers, which are already separate processes)
+
+    Returns:
+    - dict: {stage name: stage result}
+    """
+    preds = build_graph(stages)
+    by_name = {s.name: s for s in stages}
+    results: Dict[str, Any] = {}
+    timings: Dict[str, StageTiming] = {}
+    wall_start = time.time()
+
+    def call_args(s: Stage):
+        return (s.target, s.args, s.kwargs, s.fallback_args, s.fallback_kwargs, s.label or s.name)
+
+    def from_cache(s: Stage) -> bool:
+        if cache is None:
+            return False
+        now = time.time()
+        hit, result = cache.lookup(s)
+        if hit:
+            results[s.name] = result
+            timings[s.name] = StageTiming(s.name, "cache", now, time.time())
+        return hit
+
+    def finish(s: Stage, result: Any, start: float, end: float, lane: str) -> None:
+        results[s.name] = result
+        timings[s.name] = StageTiming(s.name, lane, start, end)
+        if cache is not None:
+            cache.store(s, result)
+
+    if not parallel:
+        done_names: List[str] = []
+        pending = list(stages)
+        while pending:
+            # declaration order, but never before a predecessor
+            s = next(x for x in pending if all(p in done_names for p in preds[x.name]))
+            pending.remove(s)
+            if not from_cache(s):
+                finish(s, *invoke_stage(*call_args(s)), lane="serial")
+            done_names.append(s.name)
+    else:
+        workers = max_workers or os.cpu_count() or 4
+        pools = {"thread": ThreadPoolExecutor(max_workers=workers), "serial": ThreadPoolExecutor(max_workers=1)}
+        if not use_processes:
+            pools["process"] = pools["thread"]
+        elif any(s.lane == "process" for s in stages):
+            pools["process"] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+                initializer=_init_process_worker,
+                initargs=(list(sys.path), os.getcwd()),
+            )
+        futures = {}
+        submitted = set()
+        try:
+            while len(results) < len(stages):
+                for s in stages:
+                    if s.name in submitted or not all(p in results for p in preds[s.name]):
+                        continue
+                    target = s.target
+                    if s.lane == "process" and callable(target):
+                        raise ValueError(f"stage {s.name}: process lane needs an importable 'module:function' target")
+                    submitted.add(s.name)
+                    if from_cache(s):
+                        continue
+                    try:
+                        futures[pools[s.lane].submit(invoke_stage, *call_args(s))] = s.name
+                    except Exception as e:  # e.g. broken process pool
+                        print(f"[WARN] {s.name} 提交失败: {e}")
+                        now = time.time()
+                        results[s.name] = {"success": False, "error": str(e)}
+                        timings[s.name] = StageTiming(s.name, s.lane, now, now)
+                if not futures:
+                    continue
+                finished, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    name = futures.pop(fut)
+                    try:
+                        result, start, end = fut.result()
+                    except Exception as e:  # worker crashed or result not picklable
+                        print(f"[WARN] {name} 执行失败: {e}")
+                        result, start, end = {"success": False, "error": str(e)}, time.time(), time.time()
+                    finish(by_name[name], result, start, end, by_name[name].lane)
+        finally:
+            for pool in set(pools.values()):
+                pool.shutdown(wait=True)
+
+    if report:
+        print_report(stages, preds, timings, time.time() - wall_start)
+    return {s.name: results[s.name] for s in stages}
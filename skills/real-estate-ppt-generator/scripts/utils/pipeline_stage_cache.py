@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache for pipeline stages.
+
+A stage's cache key is the SHA-256 of its target, arguments, declared output
+paths, the contents of every declared input file and the source of the
+stage module together with every sibling module it imports (directly or
+through other siblings). On a hit the recorded output files are copied back from the
+blob store and the recorded result is returned, so the stage is skipped.
+
+Layout under ``resources/working_data/.cache/stages``::
+
+    entries/<key>.pkl   pickled {"result": ..., "outputs": [(path, digest), ...]}
+    objects/<digest>    output file contents, stored once per digest
+"""
+
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import shutil
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .pipeline_scheduler import is_failed_result
+except ImportError:
+    from pipeline_scheduler import is_failed_result
+
+CACHE_FORMAT = 1
+DEFAULT_CACHE_DIR = os.path.join("resources", "working_data", ".cache", "stages")
+_CHUNK = 1024 * 1024
+
+_digest_memo: Dict[str, Tuple[int, int, str]] = {}
+_imports_memo: Dict[Tuple[str, str], List[str]] = {}
+_memo_lock = threading.Lock()
+
+
+def file_digest(path: str) -> Optional[str]:
+    """SHA-256 of a file's contents (None if missing), memoized on (size, mtime)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = os.path.abspath(path)
+    with _memo_lock:
+        cached = _digest_memo.get(key)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _memo_lock:
+        _digest_memo[key] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+
+def sibling_imports(path: str) -> List[str]:
+    """
+    Files of the modules next to ``path`` that it imports, memoized on its digest.
+
+    Both forms of the try/except import pattern count (``from .x import y`` and
+    ``from x import y``), as do imports inside functions.
+    """
+    digest = file_digest(path)
+    if digest is None:
+        return []
+    memo_key = (os.path.abspath(path), digest)
+    with _memo_lock:
+        cached = _imports_memo.get(memo_key)
+    if cached is not None:
+        return cached
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level <= 1:
+            if node.module:
+                names.add(node.module)
+            elif node.level == 1:  # from . import x
+                names.update(alias.name for alias in node.names)
+    directory = os.path.dirname(path)
+    files = sorted(
+        candidate for candidate in (os.path.join(directory, f"{name}.py") for name in names if "." not in name)
+        if os.path.isfile(candidate)
+    )
+    with _memo_lock:
+        _imports_memo[memo_key] = files
+    return files
+
+
+def code_version(target: str) -> str:
+    """
+    Digest of the source of a "package.module:function" target and of every
+    first-party module it imports, so editing a shared helper invalidates the
+    stages that use it.
+    """
+    module_name = target.partition(":")[0]
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        spec = None
+    origin = getattr(spec, "origin", None)
+    if not origin or not os.path.isfile(origin):
+        return f"unresolved:{module_name}"
+
+    seen = {os.path.abspath(origin)}
+    pending = [origin]
+    while pending:
+        for path in sibling_imports(pending.pop()):
+            path = os.path.abspath(path)
+            if path not in seen:
+                seen.add(path)
+                pending.append(path)
+    h = hashlib.sha256()
+    for path in sorted(seen):
+        h.update(f"{os.path.basename(path)}:{file_digest(path)}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+class StageCache:
+    """Skip stages whose inputs, parameters and code are unchanged."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.entries_dir = os.path.join(cache_dir, "entries")
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        os.makedirs(self.entries_dir, exist_ok=True)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.hits: List[str] = []
+        self.misses: List[str] = []
+        self._keys: Dict[str, str] = {}
+
+    @staticmethod
+    def is_cacheable(stage) -> bool:
+        """Only importable targets can be keyed; deck edits and opted-out stages always run."""
+        return getattr(stage, "cache", True) and isinstance(stage.target, str)
+
+    def key(self, stage) -> str:
+        payload = {
+            "format": CACHE_FORMAT,
+            "name": stage.name,
+            "target": stage.target,
+            "code": code_version(stage.target),
+            "args": repr(stage.args),
+            "kwargs": repr(sorted(stage.kwargs.items())),
+            "fallback_args": repr(stage.fallback_args),
+            "inputs": [(p, file_digest(p)) for p in stage.inputs],
+            "outputs": list(stage.outputs),
+            # 模拟/回放模式产生的 LLM 输出不能在真实运行中复用
+            "llm_mode": os.getenv("LLM_PROVIDER_MODE", "live"),
+        }
+        blob = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(blob).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.entries_dir, f"{key}.pkl")
+
+    def _atomic_write(self, path: str, data: bytes) -> None:
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def lookup(self, stage) -> Tuple[bool, Any]:
+        """
+        Return (hit, result). On a hit the stage's output files are restored.
+        """
+        if not self.is_cacheable(stage):
+            return False, None
+        # 输入在阶段运行期间不变，store() 复用同一个 key
+        key = self._keys[stage.name] = self.key(stage)
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                entry = pickle.load(f)
+            for path, digest in entry["outputs"]:
+                blob = os.path.join(self.objects_dir, digest)
+                if not os.path.exists(blob):
+                    raise FileNotFoundError(blob)
+                if file_digest(path) != digest:
+                    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                    shutil.copyfile(blob, path)
+        except FileNotFoundError:
+            self.misses.append(stage.name)
+            return False, None
+        except Exception as e:
+            print(f"[WARN] 缓存条目损坏，忽略 {stage.name}: {e}")
+            self.misses.append(stage.name)
+            return False, None
+        self.hits.append(stage.name)
+        print(f"[CACHE] 命中缓存，跳过 {stage.label or stage.name}")
+        return True, entry["result"]
+
+    def store(self, stage, result: Any) -> bool:
+        """Record a successful stage run; failed runs or missing outputs are not cached."""
+        if not self.is_cacheable(stage) or is_failed_result(result):
+            return False
+        outputs = []
+        for path in stage.outputs:
+            digest = file_digest(path)
+            if digest is None:
+                return False
+            blob = os.path.join(self.objects_dir, digest)
+            if not os.path.exists(blob):
+                tmp = f"{blob}.{os.getpid()}.{threading.get_ident()}.tmp"
+                shutil.copyfile(path, tmp)
+                os.replace(tmp, blob)
+            outputs.append((path, digest))
+        try:
+            data = pickle.dumps({"result": result, "outputs": outputs})
+        except Exception as e:
+            print(f"[WARN] 阶段结果无法缓存 {stage.name}: {e}")
+            return False
+        key = self._keys.pop(stage.name, None) or self.key(stage)
+        self._atomic_write(self._entry_path(key), data)
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        return {"hits": list(self.hits), "misses": list(self.misses), "cache_dir": self.cache_dir}
@@ -8,7 +8,6 @@
 
 from pathlib import Path
 from datetime import datetime
-import os
 import re
 import traceback
 
@@ -49,23 +48,12 @@ def heuristic_kaipan_summary(text: str) -> str:
 def llm_kaipan_summary(text: str) -> str:
     """
     使用 SiliconFlow API（兼容 OpenAI）生成一句话的开盘摘要。
-    若调用失败或不可用，抛出异常由调用方回退到启发式。
+    客户端、限流与重试由 llm_client 统一管理；调用失败时抛出异常由调用方回退到启发式。
     """
-    # 设置SiliconFlow API客户端
-    # 注意：API密钥应通过环境变量或配置文件提供，此处保留占位符或从 env 获取
     try:
-        # 尝试导入新版 OpenAI SDK 中的 OpenAI client
-        from openai import OpenAI as OpenAIClient
-    except Exception:
-        # 旧版 openai 包也可能存在，但我们优先尝试上面那种；如果没有则尝试常规 openai
-        try:
-            import openai as _openai_mod
-            OpenAIClient = None
-        except Exception:
-            OpenAIClient = None
-
-    api_key = os.getenv("SILICONFLOW_API_KEY", "sk-ykloduxdazjstefqarmswtetrtafvvalaxtkqhxeldvsogtt")
-    base_url = "https://api.siliconflow.cn/v1"  # SiliconFlow API基础URL
+        from .llm_client import chat
+    except ImportError:
+        from llm_client import chat
 
     # 构造 prompt：要求一句话摘要（中文）
     prompt = (
@@ -74,70 +62,21 @@ def llm_kaipan_summary(text: str) -> str:
         "输出不要包含多余解释，仅返回一句话。\n\n文本:\n" + text
     )
 
-    # 尝试使用新版 OpenAIClient 接口（如果可用）
-    if OpenAIClient is not None:
-        try:
-            client = OpenAIClient(api_key=api_key, base_url=base_url)
-            # 调用 chat completions（OpenAI 新 SDK 的常见调用方式）
-            resp = client.chat.completions.create(
-                model="deepseek-ai/DeepSeek-R1",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=150
-            )
-            # 解析响应兼容不同 SDK 返回格式
-            content = None
-            try:
-                content = resp.choices[0].message.content
-            except Exception:
-                try:
-                    content = resp['choices'][0]['message']['content']
-                except Exception:
-                    content = str(resp)
-            if not content or not str(content).strip():
-                raise RuntimeError("LLM 返回为空")
-            return str(content).strip()
-        except Exception as e:
-            # 抛出异常以让调用方回退启发式
-            print("[WARN] SiliconFlow (OpenAIClient) 调用失败:", e)
-            # 可打印堆栈便于调试
-            # traceback.print_exc()
-            raise
-
-    # 否则尝试使用旧的 openai 包（如果存在）
     try:
-        import openai as openai_legacy
-        # 设置 base url 与 api key 以便走 SiliconFlow 的 API（openai 库允许通过 api_base 覆盖）
-        try:
-            openai_legacy.api_base = base_url
-        except Exception:
-            pass
-        if hasattr(openai_legacy, "api_key"):
-            openai_legacy.api_key = api_key
-        else:
-            os.environ["OPENAI_API_KEY"] = api_key
-
-        # 尝试 ChatCompletion.create（旧接口）
-        resp = openai_legacy.ChatCompletion.create(
-            model="gpt-3.5-turbo",
+        resp = chat(
+            "siliconflow",
+            model="deepseek-ai/DeepSeek-R1",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.1,
             max_tokens=150
         )
-        content = None
-        try:
-            content = resp.choices[0].message.content
-        except Exception:
-            try:
-                content = resp['choices'][0]['message']['content']
-            except Exception:
-                content = str(resp)
+        content = resp.choices[0].message.content
         if not content or not str(content).strip():
             raise RuntimeError("LLM 返回为空")
         return str(content).strip()
     except Exception as e:
-        print("[WARN] 使用旧 openai 客户端调用 SiliconFlow 失败或不可用:", e)
-        # traceback.print_exc()
+        # 抛出异常以让调用方回退启发式
+        print("[WARN] SiliconFlow 调用失败:", e)
         raise
 
 # --------------------------
@@ -158,13 +97,14 @@ def ensure_one_sentence(s: str) -> str:
 # --------------------------
 # 主接口：run
 # --------------------------
-def run(project_name: str, timestamp: str = None, pptx_path: str = None) -> dict:
+def run(project_name: str, timestamp: str = None, pptx_path: str = None, prs=None) -> dict:
     """
     读取基本信息文本，总结开盘信息一句话并插入到 PPT 第2页顶部。
     参数：
       - project_name: 项目名称（用于构造路径）
       - timestamp: YYYYMMDD，可选，默认今天
       - pptx_path: 可选，指定要修改的 PPTX 路径；若 None 则使用默认路径 resources/working_data/{project}_{timestamp}/processed_data/{project}_gemdale_housing_project_template.pptx
+      - prs: 可选，共享的 Presentation 对象（deck session 模式）；传入时不读写 PPTX 文件
     返回：
       dict 包含 success(bool)、summary(str)、pptx_path(str) 或 error 信息
     """
@@ -195,11 +135,12 @@ def run(project_name: str, timestamp: str = None, pptx_path: str = None) -> dict
         # 确保是一句话的形式
         summary = ensure_one_sentence(summary_raw)
 
-        # 打开 PPT 并插入文本
-        if not pptx_path.exists():
-            return {"success": False, "error": f"PPTX 文件不存在: {pptx_path}"}
-
-        prs = Presentation(str(pptx_path))
+        # 打开 PPT 并插入文本（deck session 模式下直接使用共享对象）
+        save_to_disk = prs is None
+        if save_to_disk:
+            if not pptx_path.exists():
+                return {"success": False, "error": f"PPTX 文件不存在: {pptx_path}"}
+            prs = Presentation(str(pptx_path))
 
         # 确保至少有 2 页
         while len(prs.slides) < 2:
@@ -230,7 +171,8 @@ def run(project_name: str, timestamp: str = None, pptx_path: str = None) -> dict
         p.font.color.rgb = RGBColor(0, 51, 102)
 
         # 保存 PPT（覆盖原文件）
-        prs.save(str(pptx_path))
+        if save_to_disk:
+            prs.save(str(pptx_path))
 
         return {"success": True, "summary": summary, "pptx_path": str(pptx_path)}
     except Exception as e:
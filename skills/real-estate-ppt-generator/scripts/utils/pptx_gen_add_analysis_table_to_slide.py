@@ -4,7 +4,6 @@
 Script to add the analysis results from Excel file as a table to PowerPoint presentation.
 """
 
-import pandas as pd
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
@@ -13,6 +12,11 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any
 
+try:
+    from .data_processor_workbook_cache import read_excel_cached
+except ImportError:
+    from data_processor_workbook_cache import read_excel_cached
+
 def load_analysis_data_from_excel(excel_file_path: str) -> list:
     """
     Load analysis data from the first sheet of Excel file.
@@ -25,7 +29,7 @@ def load_analysis_data_from_excel(excel_file_path: str) -> list:
     """
     try:
         # Read the first sheet
-        df = pd.read_excel(excel_file_path, sheet_name=0)
+        df = read_excel_cached(excel_file_path, sheet_name=0)
         
         # Convert DataFrame to list of lists
         table_data = [df.columns.tolist()]  # Header row
@@ -41,7 +45,7 @@ def add_analysis_table_to_slide(pptx_file_path: str, excel_file_path: str,
                                slide_number: int = 1, left_position: float = 2.0,
                                top_position: float = 4.5, table_width: float = 5.0,
                                table_height: float = 2.0, font_name: str = "Arial",
-                               font_size: int = 10) -> bool:
+                               font_size: int = 10, prs=None) -> bool:
     """
     Add analysis results from Excel as table to PowerPoint presentation.
     
@@ -55,6 +59,7 @@ def add_analysis_table_to_slide(pptx_file_path: str, excel_file_path: str,
     - table_height: float, table height in inches
     - font_name: str, font name for table text (default: "Arial")
     - font_size: int, font size in points (default: 10)
+    - prs: Presentation, shared deck (deck session mode); when given the file is neither loaded nor saved
     
     Returns:
     - bool: True if successful, False otherwise
@@ -70,12 +75,13 @@ def add_analysis_table_to_slide(pptx_file_path: str, excel_file_path: str,
             
         print(f"[INFO] Loaded {len(table_data)} rows of data")
         
-        # Step 2: Load presentation
-        if not os.path.exists(pptx_file_path):
-            print(f"[ERROR] PowerPoint file not found: {pptx_file_path}")
-            return False
-            
-        prs = Presentation(pptx_file_path)
+        # Step 2: Load presentation (unless a shared one is passed in)
+        save_to_disk = prs is None
+        if save_to_disk:
+            if not os.path.exists(pptx_file_path):
+                print(f"[ERROR] PowerPoint file not found: {pptx_file_path}")
+                return False
+            prs = Presentation(pptx_file_path)
         
         # Step 3: Get the specified slide
         if slide_number < 1 or slide_number > len(prs.slides):
@@ -121,7 +127,8 @@ def add_analysis_table_to_slide(pptx_file_path: str, excel_file_path: str,
                     cell.margin_bottom = Inches(0.05)
         
         # Step 6: Save presentation
-        prs.save(pptx_file_path)
+        if save_to_disk:
+            prs.save(pptx_file_path)
         print(f"[SUCCESS] Analysis table added to: {pptx_file_path}")
         print(f"[INFO] Font applied: {font_name}, Size: {font_size}pt")
         
@@ -134,7 +141,7 @@ def add_analysis_table_to_slide(pptx_file_path: str, excel_file_path: str,
 def run(project_name: str, pptx_file_path: str = None, excel_file_path: str = None,
         slide_number: int = 1, left_position: float = 2.0, top_position: float = 4.5,
         table_width: float = 5.0, table_height: float = 2.0,
-        font_name: str = "Arial", font_size: int = 10) -> Dict[str, Any]:
+        font_name: str = "Arial", font_size: int = 10, prs=None) -> Dict[str, Any]:
     """
     Run the analysis table addition with a given project name and optional parameters.
     
@@ -149,6 +156,7 @@ def run(project_name: str, pptx_file_path: str = None, excel_file_path: str = No
     - table_height: float, table height in inches
     - font_name: str, font name for table text
     - font_size: int, font size in points
+    - prs: Presentation, shared deck (deck session mode, optional)
     
     Returns:
     - dict: Contains success status, output file path, and table data
@@ -162,7 +170,7 @@ def run(project_name: str, pptx_file_path: str = None, excel_file_path: str = No
             excel_file_path = str(Path(f"resources/working_data/{project_name}_{timestamp}/processed_data/{project_name}_成交分析结果.xlsx"))
         
         # Verify files exist
-        if not os.path.exists(pptx_file_path):
+        if prs is None and not os.path.exists(pptx_file_path):
             print(f"[ERROR] PPTX file not found: {pptx_file_path}")
             return {"success": False, "output_file": pptx_file_path, "table_data": [], "error": f"PPTX file not found: {pptx_file_path}"}
         if not os.path.exists(excel_file_path):
@@ -179,7 +187,8 @@ def run(project_name: str, pptx_file_path: str = None, excel_file_path: str = No
             table_width=table_width,
             table_height=table_height,
             font_name=font_name,
-            font_size=font_size
+            font_size=font_size,
+            prs=prs
         )
         
         # Load table data for return
@@ -3,41 +3,50 @@
 """
 增强版：向 PPTX 添加表格（带大量 debug、单位兼容与自动 clamp）
 如果你在 pipeline 中修改参数却无效，先看 pipeline 日志里本脚本输出的 [DEBUG] 信息，确认 pipeline 真正调用了哪个脚本与参数。
+导入本模块没有副作用；依赖的实现在第一次调用 run() 时解析。
 """
 from typing import Any, Dict, List, Optional
 import os
 from datetime import datetime
 import inspect
 
-# 尝试导入新的 run 接口；若没有，再尝试老接口
+# add_table / extract 实现在第一次调用 run() 时才解析：新 run 接口优先，否则用老接口
 add_table_run = None
 add_table_func = None
 extract_run = None
 extract_func = None
+_impls_resolved = False
+
+
+def _resolve_impls() -> None:
+    global add_table_run, add_table_func, extract_run, extract_func, _impls_resolved
+    if _impls_resolved:
+        return
+    _impls_resolved = True
 
-try:
-    from utils.pptx_gen_add_table_to_slide import run as add_table_run
-    print("[DEBUG] Imported add_table.run (new API).")
-except Exception:
     try:
-        from utils.pptx_gen_add_table_to_slide import add_table_to_slide as add_table_func
-        print("[DEBUG] Imported add_table_to_slide (old API).")
+        from utils.pptx_gen_add_table_to_slide import run as add_table_run
+        print("[DEBUG] Imported add_table.run (new API).")
     except Exception:
-        add_table_run = None
-        add_table_func = None
-        print("[DEBUG] No add_table module found at import time.")
-
-try:
-    from utils.data_processor_extract_table_data import run as extract_run
-    print("[DEBUG] Imported extract.run.")
-except Exception:
+        try:
+            from utils.pptx_gen_add_table_to_slide import add_table_to_slide as add_table_func
+            print("[DEBUG] Imported add_table_to_slide (old API).")
+        except Exception:
+            add_table_run = None
+            add_table_func = None
+            print("[DEBUG] No add_table module found.")
+
     try:
-        from utils.data_processor_extract_table_data import create_table_data_for_presentation as extract_func
-        print("[DEBUG] Imported extract.create_table_data_for_presentation.")
+        from utils.data_processor_extract_table_data import run as extract_run
+        print("[DEBUG] Imported extract.run.")
     except Exception:
-        extract_run = None
-        extract_func = None
-        print("[DEBUG] No extract module found at import time.")
+        try:
+            from utils.data_processor_extract_table_data import create_table_data_for_presentation as extract_func
+            print("[DEBUG] Imported extract.create_table_data_for_presentation.")
+        except Exception:
+            extract_run = None
+            extract_func = None
+            print("[DEBUG] No extract module found.")
 
 
 def _normalize_extracted_table_data(extracted: Any) -> Optional[List[List[Any]]]:
@@ -73,14 +82,17 @@ def run(
     table_height: float = 3.0,
     timestamp: Optional[str] = None,
     table_data_override: Optional[List[List[Any]]] = None,
+    prs: Any = None,
 ) -> Dict[str, Any]:
     """
     Extract table data and add it to a PPTX file.
 
     left_position, top_position, table_width, table_height 的单位默认为英寸（inch）。
     本脚本会在调用 add_table 时同时把英寸与 EMU 两种表示都放入 task 里以提高兼容性。
+    prs: 共享的 Presentation 对象（deck session 模式）；传入时直接在内存中修改，不读写磁盘。
     """
     print(f"[DEBUG] run() called with project_name={project_name}, slide={slide_number}, left={left_position}, top={top_position}, width={table_width}, height={table_height}, timestamp={timestamp}")
+    _resolve_impls()
     if not timestamp:
         timestamp = datetime.now().strftime("%Y%m%d")
 
@@ -90,15 +102,18 @@ def run(
     pptx_file = pptx_file_path or os.path.join(base_dir, f"{project_name}_gemdale_housing_project_template.pptx")
     print(f"[DEBUG] Using pptx_file path: {pptx_file}")
 
-    if not os.path.exists(pptx_file):
+    if prs is None and not os.path.exists(pptx_file):
         msg = f"Input file not found: {pptx_file}"
         print(f"[ERROR] {msg}")
         return {"success": False, "error": msg, "pptx_file_path": pptx_file}
 
     # 读取 slide 宽度并检查 left_position 是否越界（自动 clamping）
     try:
-        from pptx import Presentation as PptxPresentation
-        prs_check = PptxPresentation(pptx_file)
+        if prs is not None:
+            prs_check = prs
+        else:
+            from pptx import Presentation as PptxPresentation
+            prs_check = PptxPresentation(pptx_file)
         slide_width_in = prs_check.slide_width / EMU_PER_INCH  # EMU -> 英寸
         print(f"[DEBUG] PPTX slide width (inches): {slide_width_in:.3f}\"")
         # 为安全保留 margin 英寸
@@ -176,11 +191,26 @@ def run(
     print(f"        slide: {task['slide_number']}, left_in={task['left_in']}\", left_emu={task['left_emu']}, width_in={task['width_in']}\", width_emu={task['width_emu']}")
     print(f"        rows={len(table_data)}, cols={(len(table_data[0]) if len(table_data)>0 else 0)}")
 
+    # deck session 模式下，add_table 实现必须支持 prs 参数，否则其写盘结果会被最终保存覆盖
+    if prs is not None:
+        impl = add_table_run or add_table_func
+        try:
+            accepts_prs = impl is not None and "prs" in inspect.signature(impl).parameters
+        except Exception:
+            accepts_prs = False
+        if not accepts_prs:
+            msg = "add_table module does not accept a shared Presentation (prs)"
+            print(f"[ERROR] {msg}")
+            return {"success": False, "error": msg, "pptx_file_path": pptx_file}
+
     # 调用新的 run-based add_table 接口（如果存在）
     if add_table_run:
         try:
             print("[DEBUG] Calling add_table.run with table_tasks (includes both inch & EMU values).")
-            add_res = add_table_run(project_name=project_name, pptx_file_path=pptx_file, table_tasks=[task], timestamp=timestamp)
+            add_kwargs = {"project_name": project_name, "pptx_file_path": pptx_file, "table_tasks": [task], "timestamp": timestamp}
+            if prs is not None:
+                add_kwargs["prs"] = prs
+            add_res = add_table_run(**add_kwargs)
             final_pptx = pptx_file
             if isinstance(add_res, dict):
                 for candidate_key in ("pptx_output_path", "pptx_file_path", "pptx_output", "output_path"):
@@ -221,6 +251,8 @@ def run(
                 "table_height": table_height,
                 "style": None,
             }
+            if prs is not None:
+                kwargs["prs"] = prs
 
             # 如果老函数接受 EMU 字段名字，则加上（提高兼容性）
             if 'left_emu' in param_names or 'left' in param_names:
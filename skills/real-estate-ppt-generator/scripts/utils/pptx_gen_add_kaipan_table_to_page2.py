@@ -7,16 +7,25 @@ Insert opening information table from an Excel file into the second slide of a P
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
-import pandas as pd
 import os
 from datetime import datetime
 
-def run(project_name):
+try:
+    from .data_processor_workbook_cache import read_excel_cached
+    from .pptx_gen_text_metrics import get_measurer
+except ImportError:
+    from data_processor_workbook_cache import read_excel_cached
+    from pptx_gen_text_metrics import get_measurer
+
+TABLE_FONT = "Calibri"  # theme font of the generated deck
+
+def run(project_name, prs=None):
     """
     Insert opening information table from an Excel file into the second slide of a PowerPoint presentation.
 
     Args:
         project_name (str): Name of the project.
+        prs (Presentation, optional): Shared deck (deck session mode); when given the file is neither loaded nor saved.
 
     Returns:
         dict: Contains status and output file path or error message.
@@ -27,7 +36,7 @@ def run(project_name):
     
     # Read Excel file
     try:
-        df = pd.read_excel(excel_file)
+        df = read_excel_cached(excel_file)
         print(f"成功读取 Excel 文件：{excel_file}")
     except FileNotFoundError:
         print(f"错误：Excel 文件 {excel_file} 未找到。")
@@ -36,16 +45,18 @@ def run(project_name):
         print(f"读取 Excel 文件时出错：{e}")
         return {"status": "error", "message": f"读取 Excel 文件时出错：{e}"}
     
-    # Load PowerPoint
-    try:
-        if os.path.exists(pptx_path):
-            prs = Presentation(pptx_path)
-        else:
-            print(f"错误：PowerPoint 文件 {pptx_path} 未找到。")
-            return {"status": "error", "message": f"PowerPoint 文件 {pptx_path} 未找到"}
-    except Exception as e:
-        print(f"加载 PowerPoint 时出错：{e}")
-        return {"status": "error", "message": f"加载 PowerPoint 时出错：{e}"}
+    # Load PowerPoint (deck session mode passes the shared prs in)
+    save_to_disk = prs is None
+    if save_to_disk:
+        try:
+            if os.path.exists(pptx_path):
+                prs = Presentation(pptx_path)
+            else:
+                print(f"错误：PowerPoint 文件 {pptx_path} 未找到。")
+                return {"status": "error", "message": f"PowerPoint 文件 {pptx_path} 未找到"}
+        except Exception as e:
+            print(f"加载 PowerPoint 时出错：{e}")
+            return {"status": "error", "message": f"加载 PowerPoint 时出错：{e}"}
     
     # Ensure at least 2 slides
     while len(prs.slides) < 2:
@@ -73,38 +84,24 @@ def run(project_name):
     header_font_pt = 11  # was 14
     data_font_pt = 9     # was 12
 
-    # Helper: effective character length (Chinese-wide chars count double)
-    def effective_char_count(s: str) -> int:
-        if s is None:
-            return 0
-        s = str(s)
-        cnt = 0
-        for ch in s:
-            # treat non-ASCII as wider (approx Chinese)
-            cnt += 2 if ord(ch) > 127 else 1
-        return cnt
-
-    # Estimate per-column width in inches based on max effective chars and font size
+    # Column widths from the glyph advances of the deck's theme font (cells keep the theme font)
+    header_measurer = get_measurer(TABLE_FONT, header_font_pt, bold=True)
+    data_measurer = get_measurer(TABLE_FONT, data_font_pt)
+
     col_widths_in = []
-    # Tunable coefficients:
-    char_width_coef = 0.55  # factor to convert (char * font_pt) -> inches (empirical)
-    padding_in = 0.18       # per-column padding (inches)
+    padding_in = 0.22       # cell margins (0.1" each side) plus a little slack
     min_col_width = 0.6     # minimum column width in inches
     max_col_width = initial_table_width_in * 0.7  # avoid a single column taking too much
 
     for col_idx in range(cols):
-        # header effective length
-        header = headers[col_idx]
-        header_eff = effective_char_count(header)
-        # data effective length (max among cells)
-        max_data_eff = 0
-        for row in table_data:
-            # protect if row shorter
-            val = row[col_idx] if col_idx < len(row) else ""
-            max_data_eff = max(max_data_eff, effective_char_count(val))
-        # compute two estimates (header and data) and take larger with corresponding font size
-        width_from_header = (header_eff * header_font_pt * char_width_coef) / 72.0
-        width_from_data = (max_data_eff * data_font_pt * char_width_coef) / 72.0
+        header = "" if headers[col_idx] is None else str(headers[col_idx])
+        width_from_header = header_measurer.width(header) / 72.0
+        # widest data cell (protect if row shorter)
+        width_from_data = max(
+            (data_measurer.width("" if col_idx >= len(row) or row[col_idx] is None else str(row[col_idx]))
+             for row in table_data),
+            default=0.0,
+        ) / 72.0
         est_w = max(width_from_header, width_from_data) + padding_in
         # clamp
         est_w = max(min_col_width, min(est_w, max_col_width))
@@ -180,7 +177,8 @@ def run(project_name):
 
     # Save PowerPoint
     try:
-        prs.save(pptx_path)
+        if save_to_disk:
+            prs.save(pptx_path)
         print(f"表格成功插入到 {pptx_path} 的第 2 页（中间靠下）。")
         return {"status": "success", "message": f"表格成功插入到 {pptx_path} 的第 2 页"}
     except Exception as e:
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Native PowerPoint charts instead of rasterized matplotlib pictures.
+
+- 第2页成交走势：成交套数为簇状柱形图（主坐标轴），成交均价（万/㎡）为折线图
+  （次坐标轴），图下方为图表自带的数据表；序列、颜色和价格轴范围与
+  data_processor_draw_table_picture.build_deal_chart 计算的完全相同
+- 第5页地域来源：从客户分析文本的「地域来源」板块解析各来源占比，生成饼图
+
+Charts are chart parts with embedded workbook data, so nothing is rendered,
+the deck stays small and a single number can be changed by editing the
+chart data instead of re-drawing a picture. python-pptx has no combo chart,
+so the price series are moved into a <c:lineChart> on secondary axes in
+the chart XML.
+"""
+
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pptx import Presentation
+from pptx.chart.axis import ValueAxis
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LABEL_POSITION, XL_LEGEND_POSITION, XL_MARKER_STYLE
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.util import Inches, Pt
+
+try:
+    from .data_processor_chart_renderer import CHART_H, SPACER_H, TABLE_H_PER_CHUNK, DealChart
+    from .data_processor_draw_table_picture import build_deal_chart
+    from .data_processor_workbook_cache import read_excel_cached
+    from .pptx_gen_add_picture_to_page2_lyf import add_title_above
+except ImportError:
+    from data_processor_chart_renderer import CHART_H, SPACER_H, TABLE_H_PER_CHUNK, DealChart
+    from data_processor_draw_table_picture import build_deal_chart
+    from data_processor_workbook_cache import read_excel_cached
+    from pptx_gen_add_picture_to_page2_lyf import add_title_above
+
+EMU_PER_INCH = 914400.0
+# axis ids of the secondary (price) axes; python-pptx numbers its own axes with random 8-digit ids
+SECONDARY_CAT_AX_ID = "50010"
+SECONDARY_VAL_AX_ID = "50020"
+ORIGIN_SECTION = "地域来源"
+_ORIGIN_SHARE = re.compile(r"([^，,、；;。\s:：]+?)\s*(\d+(?:\.\d+)?)\s*%")
+_NEXT_SECTION = re.compile(r"^\s*(?:\d+[.、．]|结论)")
+
+
+def _rgb(color) -> Optional[RGBColor]:
+    """(r, g, b) floats in 0-1 -> RGBColor; None stays None."""
+    if color is None:
+        return None
+    return RGBColor(*(int(round(c * 255)) for c in color[:3]))
+
+
+def _secondary_line_chart(chart, n_bar_series: int) -> Any:
+    """Move the series after the first n_bar_series into a lineChart on new secondary axes."""
+    plot_area = chart._chartSpace.chart.plotArea
+    bar_chart = plot_area.find(qn("c:barChart"))
+    line_chart = parse_xml(f'<c:lineChart {nsdecls("c")}><c:grouping val="standard"/>'
+                           f'<c:varyColors val="0"/></c:lineChart>')
+    for ser in bar_chart.findall(qn("c:ser"))[n_bar_series:]:
+        bar_chart.remove(ser)
+        invert = ser.find(qn("c:invertIfNegative"))
+        if invert is not None:  # bar-only element, not allowed in a line series
+            ser.remove(invert)
+        ser.append(parse_xml(f'<c:smooth {nsdecls("c")} val="0"/>'))
+        line_chart.append(ser)
+    line_chart.append(parse_xml(f'<c:marker {nsdecls("c")} val="1"/>'))
+    for ax_id in (SECONDARY_CAT_AX_ID, SECONDARY_VAL_AX_ID):
+        line_chart.append(parse_xml(f'<c:axId {nsdecls("c")} val="{ax_id}"/>'))
+    bar_chart.addnext(line_chart)
+
+    cat_ax = parse_xml(
+        f'<c:catAx {nsdecls("c")}><c:axId val="{SECONDARY_CAT_AX_ID}"/>'
+        f'<c:scaling><c:orientation val="minMax"/></c:scaling><c:delete val="1"/><c:axPos val="b"/>'
+        f'<c:majorTickMark val="none"/><c:minorTickMark val="none"/><c:tickLblPos val="nextTo"/>'
+        f'<c:crossAx val="{SECONDARY_VAL_AX_ID}"/><c:crosses val="autoZero"/><c:auto val="1"/>'
+        f'<c:lblAlgn val="ctr"/><c:lblOffset val="100"/><c:noMultiLvlLbl val="0"/></c:catAx>')
+    val_ax = parse_xml(
+        f'<c:valAx {nsdecls("c")}><c:axId val="{SECONDARY_VAL_AX_ID}"/>'
+        f'<c:scaling><c:orientation val="minMax"/></c:scaling><c:delete val="0"/><c:axPos val="r"/>'
+        f'<c:numFmt formatCode="0.00" sourceLinked="0"/><c:majorTickMark val="out"/>'
+        f'<c:minorTickMark val="none"/><c:tickLblPos val="nextTo"/><c:crossAx val="{SECONDARY_CAT_AX_ID}"/>'
+        f'<c:crosses val="max"/><c:crossBetween val="between"/></c:valAx>')
+    last_axis = plot_area.findall(qn("c:valAx"))[-1]
+    last_axis.addnext(cat_ax)
+    cat_ax.addnext(val_ax)
+    return val_ax
+
+
+def _add_data_table(chart) -> None:
+    """Chart data table with legend keys under the plot (replaces the matplotlib table)."""
+    plot_area = chart._chartSpace.chart.plotArea
+    d_table = parse_xml(f'<c:dTable {nsdecls("c")}><c:showHorzBorder val="1"/><c:showVertBorder val="1"/>'
+                        f'<c:showOutline val="1"/><c:showKeys val="1"/></c:dTable>')
+    plot_area.findall(qn("c:valAx"))[-1].addnext(d_table)
+
+
+def add_deal_chart(slide, deal_chart: DealChart, left_in: float, top_in: float,
+                   width_in: float, height_in: float, font_size_pt: int = 7):
+    """
+    Add the deal trend as a native combo chart.
+
+    Returns:
+    - the chart's GraphicFrame shape
+    """
+    chart_data = CategoryChartData(number_format="0")
+    chart_data.categories = deal_chart.x_labels
+    for name, values, _ in deal_chart.bars:
+        chart_data.add_series(name, [int(v) for v in values], number_format="0")
+    for name, values, _ in deal_chart.lines:
+        chart_data.add_series(name, [round(float(v), 2) for v in values], number_format="0.00")
+
+    frame = slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(left_in), Inches(top_in),
+                                   Inches(width_in), Inches(height_in), chart_data)
+    chart = frame.chart
+    chart.has_legend = False
+    chart.font.size = Pt(font_size_pt)
+
+    bar_plot = chart.plots[0]
+    bar_plot.gap_width = 30
+    bar_plot.overlap = 0
+    for series, (_, _, color) in zip(bar_plot.series, deal_chart.bars):
+        if color is not None:
+            series.format.fill.solid()
+            series.format.fill.fore_color.rgb = _rgb(color)
+
+    value_axis = chart.value_axis
+    value_axis.has_major_gridlines = True
+    value_axis.major_gridlines.format.line.color.rgb = RGBColor(0xE6, 0xE6, 0xE6)
+    value_axis.has_title = True
+    value_axis.axis_title.text_frame.text = "成交套数 (套)"
+
+    if deal_chart.lines:
+        price_axis = ValueAxis(_secondary_line_chart(chart, len(deal_chart.bars)))
+        price_axis.has_title = True
+        price_axis.axis_title.text_frame.text = "成交均价 (万/㎡)"
+        if deal_chart.price_ylim is not None:
+            price_axis.minimum_scale, price_axis.maximum_scale = deal_chart.price_ylim
+        for series, (_, _, color) in zip(chart.plots[1].series, deal_chart.lines):
+            series.smooth = False
+            series.marker.style = XL_MARKER_STYLE.CIRCLE
+            series.marker.size = 5
+            series.marker.format.fill.solid()
+            series.marker.format.fill.fore_color.rgb = RGBColor(0xFF, 0xFF, 0xFF)
+            if color is not None:
+                series.format.line.color.rgb = _rgb(color)
+                series.marker.format.line.color.rgb = _rgb(color)
+            series.format.line.width = Pt(1.5)
+    _add_data_table(chart)
+    return frame
+
+
+def parse_origin_shares(text: str) -> List[Tuple[str, float]]:
+    """
+    [(来源, 占比%), ...] from the 地域来源 block of a customer analysis, e.g.
+    "本地改善35%，5号线沿线40%，浦东/徐汇外溢20%，外省投资客5%。"
+    """
+    lines = text.splitlines()
+    start = next((i for i, line in enumerate(lines) if ORIGIN_SECTION in line), None)
+    if start is None:
+        return []
+    block = [lines[start].split(ORIGIN_SECTION, 1)[1]]
+    for line in lines[start + 1:]:
+        if _NEXT_SECTION.match(line):
+            break
+        block.append(line)
+    return [(label.strip("：:（）()"), float(share)) for label, share in _ORIGIN_SHARE.findall(" ".join(block))]
+
+
+def add_origin_pie(slide, shares: List[Tuple[str, float]], left_in: float, top_in: float,
+                   width_in: float, height_in: float, font_size_pt: int = 10):
+    """Add the 地域来源 shares as a native pie chart with percentage labels."""
+    chart_data = CategoryChartData(number_format='0.0"%"')
+    chart_data.categories = [label for label, _ in shares]
+    chart_data.add_series("地域来源占比", [share for _, share in shares])
+
+    frame = slide.shapes.add_chart(XL_CHART_TYPE.PIE, Inches(left_in), Inches(top_in),
+                                   Inches(width_in), Inches(height_in), chart_data)
+    chart = frame.chart
+    chart.font.size = Pt(font_size_pt)
+    chart.has_title = True
+    chart.chart_title.text_frame.text = "客户地域来源"
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.RIGHT
+    chart.legend.include_in_layout = False
+    plot = chart.plots[0]
+    plot.vary_by_categories = True
+    plot.has_data_labels = True
+    plot.data_labels.number_format = '0"%"'
+    plot.data_labels.number_format_is_linked = False
+    plot.data_labels.show_value = True
+    plot.data_labels.position = XL_LABEL_POSITION.OUTSIDE_END
+    return frame
+
+
+def _open_deck(project_name: str, timestamp: str, prs):
+    base = Path("resources") / "working_data" / f"{project_name}_{timestamp}" / "processed_data"
+    pptx_path = base / f"{project_name}_gemdale_housing_project_template.pptx"
+    if prs is None:
+        if not pptx_path.exists():
+            raise FileNotFoundError(f"PPTX file not found: {pptx_path}")
+        prs = Presentation(str(pptx_path))
+        return base, pptx_path, prs, True
+    return base, pptx_path, prs, False
+
+
+def _slide(prs, slide_number: int):
+    while slide_number > len(prs.slides):
+        prs.slides.add_slide(prs.slide_layouts[6])
+    return prs.slides[slide_number - 1]
+
+
+def run_deal_chart(project_name: str, timestamp: Optional[str] = None, prs=None, file_path: Optional[str] = None,
+                   slide_number: int = 2, left_in: float = 8.5, top_in: float = 2.8, width_in: float = 4.5,
+                   title_font_name: str = "Arial", title_font_size_pt: int = 12) -> Dict[str, Any]:
+    """
+    Add the native deal chart where the 成交结果分析混合图与表 picture would go (第2页).
+
+    Returns:
+    - dict: {"success", "output_file", "placement" | "error"}
+    """
+    try:
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d")
+        base, pptx_path, prs, save_to_disk = _open_deck(project_name, timestamp, prs)
+        file_path = Path(file_path or base / f"{project_name}_成交分析结果.xlsx")
+        if not file_path.exists():
+            return {"success": False, "error": f"找不到输入文件: {file_path}"}
+        deal_chart, info = build_deal_chart(read_excel_cached(file_path, sheet_name=0, engine="openpyxl"))
+        if deal_chart is None:
+            return {"success": False, "error": "时间列解析失败"}
+
+        # same footprint as the picture: height from the figure's aspect ratio
+        n = deal_chart.n_chunks
+        height_in = width_in * (CHART_H + SPACER_H + n * TABLE_H_PER_CHUNK + (n - 1) * 0.6) / 20.0
+        slide = _slide(prs, slide_number)
+        frame = add_deal_chart(slide, deal_chart, left_in, top_in, width_in, height_in)
+        add_title_above(slide, frame, f"{project_name}分户型销售情况", title_font_name, title_font_size_pt)
+
+        if save_to_disk:
+            prs.save(str(pptx_path))
+        print(f"[SUCCESS] Native deal chart added to slide {slide_number}")
+        return {"success": True, "output_file": str(pptx_path), **info,
+                "placement": {"left_in": left_in, "top_in": top_in, "width_in": width_in,
+                              "height_in": round(height_in, 3), "slide_index": slide_number}}
+    except Exception as e:
+        print(f"[ERROR] Failed to add native deal chart: {e}")
+        return {"success": False, "error": str(e)}
+
+
+def run_pie_chart(project_name: str, timestamp: Optional[str] = None, prs=None,
+                  text_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Add the native 地域来源 pie on the right of 第5页 (where the pie picture would go).
+
+    Returns:
+    - dict: {"success", "output_file", "shares", "placement" | "error"}
+    """
+    try:
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d")
+        base, pptx_path, prs, save_to_disk = _open_deck(project_name, timestamp, prs)
+        text_path = Path(text_path or base / f"{project_name}_客户分析.txt")
+        if not text_path.exists():
+            return {"success": False, "error": f"客户分析文本不存在: {text_path}"}
+        shares = parse_origin_shares(text_path.read_text(encoding="utf-8"))
+        if not shares:
+            return {"success": False, "error": f"客户分析文本中没有「{ORIGIN_SECTION}」占比"}
+
+        slide = _slide(prs, 5)
+        slide_width_in = prs.slide_width / EMU_PER_INCH
+        slide_height_in = prs.slide_height / EMU_PER_INCH
+        width_in = slide_width_in * 0.45
+        left_in = max(0.2, slide_width_in - width_in - 0.4)
+        top_in = 1.0
+        height_in = min(width_in * 0.75, slide_height_in - top_in - 0.6)
+        add_origin_pie(slide, shares, left_in, top_in, width_in, height_in)
+
+        if save_to_disk:
+            prs.save(str(pptx_path))
+        print("[SUCCESS] Native origin pie added to slide 5")
+        return {"success": True, "output_file": str(pptx_path), "shares": shares,
+                "placement": {"left_in": round(left_in, 3), "top_in": top_in, "width_in": round(width_in, 3),
+                              "height_in": round(height_in, 3), "slide_index": 5}}
+    except Exception as e:
+        print(f"[ERROR] Failed to add native pie chart: {e}")
+        return {"success": False, "error": str(e)}
+
+
+def run(project_name: str, timestamp: Optional[str] = None, prs=None) -> Dict[str, Any]:
+    """Both native charts; {"deal_chart": {...}, "pie_chart": {...}}."""
+    return {"deal_chart": run_deal_chart(project_name, timestamp, prs=prs),
+            "pie_chart": run_pie_chart(project_name, timestamp, prs=prs)}
+
+
+if __name__ == "__main__":
+    print(run("华发四季半岛"))
@@ -44,7 +44,8 @@ def insert_images_with_titles(
     title_font_name: str = "Arial",
     title_font_size_pt: int = 12,
     auto_add_slide_if_missing: bool = True,
-    output_suffix: str = ""
+    output_suffix: str = "",
+    prs=None
 ) -> bool:
     """
     Insert multiple images into a PPT slide with centered titles.
@@ -62,16 +63,18 @@ def insert_images_with_titles(
     - title_font_size_pt: int, font size for titles in points
     - auto_add_slide_if_missing: bool, whether to add blank slide if needed
     - output_suffix: str, unused since output is same as input
+    - prs: Presentation, shared deck (deck session mode); when given the file is neither loaded nor saved
     
     Returns:
     - bool: True if successful, False otherwise
     """
     try:
-        if not os.path.exists(pptx_file_path):
-            print(f"[ERROR] PPTX file not found: {pptx_file_path}")
-            return False
-
-        prs = Presentation(pptx_file_path)
+        save_to_disk = prs is None
+        if save_to_disk:
+            if not os.path.exists(pptx_file_path):
+                print(f"[ERROR] PPTX file not found: {pptx_file_path}")
+                return False
+            prs = Presentation(pptx_file_path)
 
         if slide_number < 1:
             print(f"[ERROR] Invalid slide number: {slide_number}")
@@ -91,8 +94,9 @@ def insert_images_with_titles(
 
         if count == 0:
             print("[WARNING] No valid images found, skipping insertion.")
-            prs.save(pptx_file_path)
-            print(f"[INFO] Saved PPT without images to: {pptx_file_path}")
+            if save_to_disk:
+                prs.save(pptx_file_path)
+                print(f"[INFO] Saved PPT without images to: {pptx_file_path}")
             return True
 
         page_w_in = prs.slide_width / EMU_PER_INCH
@@ -144,7 +148,8 @@ def insert_images_with_titles(
 
             print(f"[INFO] Inserted: {img_path} | left={tl_left_in:.2f}in, top={tl_top_in:.2f}in, w={real_img_w_in:.2f}in, h={real_img_h_in:.2f}in")
 
-        prs.save(pptx_file_path)
+        if save_to_disk:
+            prs.save(pptx_file_path)
         print(f"[SUCCESS] Saved PPT with images to: {pptx_file_path}")
         return True
 
@@ -164,7 +169,8 @@ def run(
     title_margin_in: float = 0.08,
     title_font_name: str = "Arial",
     title_font_size_pt: int = 12,
-    auto_add_slide_if_missing: bool = True
+    auto_add_slide_if_missing: bool = True,
+    prs=None
 ) -> Dict[str, Any]:
     """
     Run the image insertion with titles on page 3 for a given project name.
@@ -182,6 +188,7 @@ def run(
     - title_font_name: str, font name for titles
     - title_font_size_pt: int, font size for titles in points
     - auto_add_slide_if_missing: bool, whether to add blank slide if needed
+    - prs: Presentation, shared deck (deck session mode, optional)
     
     Returns:
     - dict: Contains success status, output file path, and image paths
@@ -195,7 +202,7 @@ def run(
                 str(Path(f"resources/images/room_style{i}.jpg")) for i in range(1, 6)
             ]
 
-        if not os.path.exists(pptx_file_path):
+        if prs is None and not os.path.exists(pptx_file_path):
             print(f"[ERROR] PPTX file not found: {pptx_file_path}")
             return {"success": False, "output_file": pptx_file_path, "image_paths": image_paths, "error": f"PPTX file not found: {pptx_file_path}"}
 
@@ -210,7 +217,8 @@ def run(
             title_margin_in=title_margin_in,
             title_font_name=title_font_name,
             title_font_size_pt=title_font_size_pt,
-            auto_add_slide_if_missing=auto_add_slide_if_missing
+            auto_add_slide_if_missing=auto_add_slide_if_missing,
+            prs=prs
         )
 
         return {
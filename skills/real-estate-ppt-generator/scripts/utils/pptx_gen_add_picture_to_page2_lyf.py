@@ -38,6 +38,38 @@ def _compute_left_top_by_anchor(left_in: float, top_in: float, w_in: float, h_in
         return left_in, top_in
 
 
+def add_title_above(slide, shape, text: str, font_name: str = "Arial", font_size_pt: int = 16,
+                    height_in: float = 0.45, margin_in: float = 0.08):
+    """Add a centered bold title textbox just above shape (picture or chart), as wide as it."""
+    title_height_emu = Inches(height_in)
+    title_margin_emu = Inches(margin_in)
+    title_top_emu = shape.top - title_height_emu - title_margin_emu
+    if title_top_emu < Inches(0.1):
+        title_top_emu = Inches(0.1)
+
+    textbox = slide.shapes.add_textbox(
+        shape.left,
+        title_top_emu,
+        shape.width,
+        title_height_emu
+    )
+    tf = textbox.text_frame
+    tf.clear()
+    p = tf.paragraphs[0]
+    p.text = text
+    p.alignment = PP_ALIGN.CENTER
+    # safe access to run
+    if len(p.runs) == 0:
+        # ensure at least one run exists
+        r = p.add_run()
+        r.text = p.text
+    run_obj = p.runs[0]
+    run_obj.font.name = font_name
+    run_obj.font.size = Pt(font_size_pt)
+    run_obj.font.bold = True
+    return textbox
+
+
 def insert_image_with_title(
     pptx_file_path: str,
     image_path: str,
@@ -52,16 +84,19 @@ def insert_image_with_title(
     title_height_in: float = 0.45,
     title_margin_in: float = 0.08,
     auto_add_slide_if_missing: bool = True,
-    output_file: Optional[str] = None
+    output_file: Optional[str] = None,
+    prs=None
 ) -> str:
     """
     Insert image and title into a PPT slide at absolute position.
+    If a shared ``prs`` is given (deck session mode) the file is neither loaded nor saved.
 
     Returns:
       pptx_file_path (string) if success, otherwise empty string.
     """
     try:
-        if not os.path.exists(pptx_file_path):
+        save_to_disk = prs is None
+        if save_to_disk and not os.path.exists(pptx_file_path):
             print(f"[ERROR] PPTX file not found: {pptx_file_path}")
             return ""
 
@@ -69,7 +104,8 @@ def insert_image_with_title(
             print(f"[ERROR] Image file not found: {image_path}")
             return ""
 
-        prs = Presentation(pptx_file_path)
+        if save_to_disk:
+            prs = Presentation(pptx_file_path)
 
         if slide_number < 1:
             print(f"[ERROR] Invalid slide number: {slide_number}")
@@ -112,40 +148,16 @@ def insert_image_with_title(
         pic.height = Inches(target_h_in)
 
         # title textbox above picture
-        title_height_emu = Inches(title_height_in)
-        title_margin_emu = Inches(title_margin_in)
-        title_top_emu = pic.top - title_height_emu - title_margin_emu
-        if title_top_emu < Inches(0.1):
-            title_top_emu = Inches(0.1)
-
-        textbox = slide.shapes.add_textbox(
-            pic.left,
-            title_top_emu,
-            pic.width,
-            title_height_emu
-        )
-        tf = textbox.text_frame
-        tf.clear()
-        p = tf.paragraphs[0]
-        p.text = f"{project_name}分户型销售情况"
-        p.alignment = PP_ALIGN.CENTER
-        # safe access to run
-        if len(p.runs) == 0:
-            # ensure at least one run exists
-            r = p.add_run()
-            r.text = p.text
-        run_obj = p.runs[0]
-        run_obj.font.name = title_font_name
-        run_obj.font.size = Pt(title_font_size_pt)
-        run_obj.font.bold = True
+        add_title_above(slide, pic, f"{project_name}分户型销售情况", title_font_name,
+                        title_font_size_pt, title_height_in, title_margin_in)
 
         # Use pptx_file_path as output path
         output_file = pptx_file_path
 
-        # Ensure parent exists
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-
-        prs.save(output_file)
+        if save_to_disk:
+            # Ensure parent exists
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            prs.save(output_file)
 
         slide_w_in = prs.slide_width / EMU_PER_INCH
         slide_h_in = prs.slide_height / EMU_PER_INCH
@@ -174,10 +186,12 @@ def run(
     title_height_in: float = 0.45,
     title_margin_in: float = 0.08,
     auto_add_slide_if_missing: bool = True,
-    timestamp: Optional[str] = None
+    timestamp: Optional[str] = None,
+    prs=None
 ) -> Dict[str, Any]:
     """
     Run the image and title insertion.
+    Pass ``prs`` to work on a shared in-memory deck (deck session mode).
 
     Returns:
       dict with keys: success (bool), output_file (str), image_path (str), input_pptx (str)
@@ -195,7 +209,7 @@ def run(
         if image_path is None:
             image_path = str(base_dir / f"{project_name}_成交结果分析混合图与表.png")
 
-        if not os.path.exists(pptx_file_path):
+        if prs is None and not os.path.exists(pptx_file_path):
             return {"success": False, "output_file": "", "image_path": image_path, "input_pptx": pptx_file_path, "error": f"PPTX file not found: {pptx_file_path}"}
         if not os.path.exists(image_path):
             return {"success": False, "output_file": "", "image_path": image_path, "input_pptx": pptx_file_path, "error": f"Image file not found: {image_path}"}
@@ -218,7 +232,8 @@ def run(
             title_height_in=title_height_in,
             title_margin_in=title_margin_in,
             auto_add_slide_if_missing=auto_add_slide_if_missing,
-            output_file=output_file
+            output_file=output_file,
+            prs=prs
         )
 
         if not result_path:
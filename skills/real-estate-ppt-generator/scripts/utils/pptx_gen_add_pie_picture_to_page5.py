@@ -16,7 +16,8 @@ import os
 # EMU per inch，用于将 pptx 单位转换回英寸显示（可选）
 EMU_PER_INCH = 914400.0
 
-def run(project_name: str, timestamp: str = None) -> Dict[str, Any]:
+def run(project_name: str, timestamp: str = None, prs=None) -> Dict[str, Any]:
+    # prs: 共享的 Presentation 对象（deck session 模式），传入时不读写 PPTX 文件
     try:
         if not timestamp:
             timestamp = datetime.now().strftime("%Y%m%d")
@@ -25,14 +26,16 @@ def run(project_name: str, timestamp: str = None) -> Dict[str, Any]:
         pptx_path = base / f"{project_name}_gemdale_housing_project_template.pptx"
         image_path = base / f"{project_name}_地域来源饼图.png"
 
-        if not pptx_path.exists():
+        save_to_disk = prs is None
+        if save_to_disk and not pptx_path.exists():
             return {"success": False, "error": f"PPTX 文件不存在: {pptx_path}", "pptx_path": str(pptx_path)}
 
         if not image_path.exists():
             return {"success": False, "error": f"饼图图片不存在: {image_path}", "image_path": str(image_path)}
 
         # 打开 PPT（修改原文件）
-        prs = Presentation(str(pptx_path))
+        if save_to_disk:
+            prs = Presentation(str(pptx_path))
 
         # 确保至少 5 页（index 4）
         while len(prs.slides) < 5:
@@ -81,7 +84,8 @@ def run(project_name: str, timestamp: str = None) -> Dict[str, Any]:
             actual_height_in = height_in
 
         # 覆盖保存
-        prs.save(str(pptx_path))
+        if save_to_disk:
+            prs.save(str(pptx_path))
 
         placement = {
             "left_in": round(left_in, 3),
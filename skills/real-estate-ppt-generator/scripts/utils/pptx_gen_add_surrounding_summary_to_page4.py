@@ -9,12 +9,13 @@ from pptx.util import Inches, Pt
 import os
 from datetime import datetime
 
-def run(project_name):
+def run(project_name, prs=None):
     """
     读取已生成的周边信息总结，插入到 PowerPoint 第四页上方。
     
     Args:
         project_name (str): 项目名称。
+        prs (Presentation, optional): 共享的 Presentation 对象（deck session 模式），传入时不读写 PPTX 文件。
     
     Returns:
         dict: {"status": "success/error", "message": "..."}
@@ -36,15 +37,17 @@ def run(project_name):
         print(f"读取文件时出错：{e}")
         return {"status": "error", "message": f"读取文件时出错：{e}"}
     
-    try:
-        if os.path.exists(pptx_path):
-            prs = Presentation(pptx_path)
-        else:
-            print(f"错误：PowerPoint 文件 {pptx_path} 未找到。")
-            return {"status": "error", "message": f"PowerPoint 文件 {pptx_path} 未找到"}
-    except Exception as e:
-        print(f"加载 PowerPoint 时出错：{e}")
-        return {"status": "error", "message": f"加载 PowerPoint 时出错：{e}"}
+    save_to_disk = prs is None
+    if save_to_disk:
+        try:
+            if os.path.exists(pptx_path):
+                prs = Presentation(pptx_path)
+            else:
+                print(f"错误：PowerPoint 文件 {pptx_path} 未找到。")
+                return {"status": "error", "message": f"PowerPoint 文件 {pptx_path} 未找到"}
+        except Exception as e:
+            print(f"加载 PowerPoint 时出错：{e}")
+            return {"status": "error", "message": f"加载 PowerPoint 时出错：{e}"}
     
     while len(prs.slides) < 4:
         prs.slides.add_slide(prs.slide_layouts[6])
@@ -72,7 +75,8 @@ def run(project_name):
                 p.level = 0
     
     try:
-        prs.save(pptx_path)
+        if save_to_disk:
+            prs.save(pptx_path)
         print(f"周边信息总结成功插入到 {pptx_path} 的第 4 页上方。")
         return {"status": "success", "message": f"周边信息总结成功插入到 {pptx_path} 的第 4 页上方"}
     except Exception as e:
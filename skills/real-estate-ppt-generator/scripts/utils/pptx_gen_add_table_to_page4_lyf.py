@@ -11,12 +11,13 @@ from pptx.dml.color import RGBColor
 import os
 from datetime import datetime
 
-def run(project_name):
+def run(project_name, prs=None):
     """
     从文本文件中提取装修详情，插入到 PowerPoint 第四页右下角，占约1/4内容。
     
     Args:
         project_name (str): 项目名称 (例如, '华发四季半岛')。
+        prs (Presentation, optional): 共享的 Presentation 对象（deck session 模式），传入时不读写 PPTX 文件。
     
     Returns:
         dict: 包含操作结果的字典。
@@ -99,14 +100,16 @@ def run(project_name):
         print("错误：未解析到任何装修数据，请检查输入文件内容。")
         return {"status": "error", "message": "未解析到任何装修数据"}
 
-    try:
-        if os.path.exists(pptx_path):
-            prs = Presentation(pptx_path)
-        else:
-            prs = Presentation()
-    except Exception as e:
-        print(f"加载 PowerPoint 时出错：{e}")
-        return {"status": "error", "message": f"加载 PowerPoint 时出错：{e}"}
+    save_to_disk = prs is None
+    if save_to_disk:
+        try:
+            if os.path.exists(pptx_path):
+                prs = Presentation(pptx_path)
+            else:
+                prs = Presentation()
+        except Exception as e:
+            print(f"加载 PowerPoint 时出错：{e}")
+            return {"status": "error", "message": f"加载 PowerPoint 时出错：{e}"}
     
     while len(prs.slides) < 4:
         prs.slides.add_slide(prs.slide_layouts[6])
@@ -150,7 +153,8 @@ def run(project_name):
             cell.fill.fore_color.rgb = RGBColor(240, 240, 240) if row_idx % 2 == 0 else RGBColor(255, 255, 255)
     
     try:
-        prs.save(pptx_path)
+        if save_to_disk:
+            prs.save(pptx_path)
         print(f"表格成功插入到 {pptx_path} 的第 4 页（右下角，靠右）。")
         return {"status": "success", "message": f"表格成功插入到 {pptx_path} 的第 4 页"}
     except Exception as e:
@@ -61,6 +61,7 @@ def insert_text_and_images(
     img_height_in: float = 1.0,
     total_width_in: float = 10.0,
     text_font_size_pt: int = 14,
+    prs=None,
 ) -> bool:
     """
     Insert text and images into a PPT slide.
@@ -78,19 +79,22 @@ def insert_text_and_images(
     - img_height_in: float, height of each image in inches
     - total_width_in: float, total width for image layout in inches
     - text_font_size_pt: int, font size for text in points
+    - prs: Presentation, shared deck (deck session mode); when given the file is neither loaded nor saved
     
     Returns:
     - bool: True if successful, False otherwise
     """
     try:
-        if not os.path.exists(pptx_file_path):
+        save_to_disk = prs is None
+        if save_to_disk and not os.path.exists(pptx_file_path):
             print(f"[ERROR] PPTX file not found: {pptx_file_path}")
             return False
         if not os.path.exists(txt_file_path):
             print(f"[ERROR] Text file not found: {txt_file_path}")
             return False
 
-        prs = Presentation(pptx_file_path)
+        if save_to_disk:
+            prs = Presentation(pptx_file_path)
 
         if slide_number < 1:
             print(f"[ERROR] Invalid slide number: {slide_number}")
@@ -108,8 +112,9 @@ def insert_text_and_images(
         analysis_data = parse_txt_file(txt_file_path)
         if not analysis_data:
             print("[WARNING] No analysis data parsed, saving PPT without changes.")
-            prs.save(pptx_file_path)
-            print(f"[INFO] Saved PPT without text/images to: {pptx_file_path}")
+            if save_to_disk:
+                prs.save(pptx_file_path)
+                print(f"[INFO] Saved PPT without text/images to: {pptx_file_path}")
             return True
 
         textbox = slide.shapes.add_textbox(
@@ -148,7 +153,8 @@ def insert_text_and_images(
                 else:
                     print(f"[WARNING] Image not found: {img_path}")
 
-        prs.save(pptx_file_path)
+        if save_to_disk:
+            prs.save(pptx_file_path)
         print(f"[SUCCESS] Saved PPT with text and images to: {pptx_file_path}")
         return True
 
@@ -169,7 +175,8 @@ def run(
     img_width_in: float = 1.5,
     img_height_in: float = 1.0,
     total_width_in: float = 10.0,
-    text_font_size_pt: int = 14
+    text_font_size_pt: int = 14,
+    prs=None
 ) -> Dict[str, Any]:
     """
     Run the text and image insertion on page 3 for a given project name.
@@ -188,6 +195,7 @@ def run(
     - img_height_in: float, height of each image in inches
     - total_width_in: float, total width for image layout in inches
     - text_font_size_pt: int, font size for text in points
+    - prs: Presentation, shared deck (deck session mode, optional)
     
     Returns:
     - dict: Contains success status, output file path, and analysis data
@@ -199,7 +207,7 @@ def run(
         if txt_file_path is None:
             txt_file_path = str(Path(f"resources/working_data/{project_name}_{timestamp}/processed_data/{project_name}_户型分析.txt"))
 
-        if not os.path.exists(pptx_file_path):
+        if prs is None and not os.path.exists(pptx_file_path):
             print(f"[ERROR] PPTX file not found: {pptx_file_path}")
             return {"success": False, "output_file": pptx_file_path, "analysis_data": [], "error": f"PPTX file not found: {pptx_file_path}"}
         if not os.path.exists(txt_file_path):
@@ -219,7 +227,8 @@ def run(
             img_width_in=img_width_in,
             img_height_in=img_height_in,
             total_width_in=total_width_in,
-            text_font_size_pt=text_font_size_pt
+            text_font_size_pt=text_font_size_pt,
+            prs=prs
         )
 
         return {
@@ -8,13 +8,14 @@ from pptx import Presentation
 from pptx.util import Inches, Pt
 import os
 
-def run(project_name: str, timestamp: str) -> None:
+def run(project_name: str, timestamp: str, prs=None) -> None:
     """
     Insert customer analysis text from a text file into the 5th slide of a PowerPoint presentation.
 
     Args:
         project_name (str): Name of the project.
         timestamp (str): Timestamp in YYYYMMDD format.
+        prs (Presentation, optional): Shared deck (deck session mode); when given the file is neither loaded nor saved.
 
     Returns:
         None
@@ -29,8 +30,10 @@ def run(project_name: str, timestamp: str) -> None:
     with open(txt_path, "r", encoding="utf-8") as f:
         content = f.read()
 
-    # 打开 ppt
-    prs = Presentation(ppt_path)
+    # 打开 ppt（deck session 模式下使用共享对象）
+    save_to_disk = prs is None
+    if save_to_disk:
+        prs = Presentation(ppt_path)
 
     # 确保至少有 5 页
     if len(prs.slides) < 5:
@@ -54,8 +57,9 @@ def run(project_name: str, timestamp: str) -> None:
     p.font.size = Pt(14)
 
     # 保存输出
-    prs.save(output_path)
-    print(f"✅ 已生成文件: {output_path}")
+    if save_to_disk:
+        prs.save(output_path)
+        print(f"✅ 已生成文件: {output_path}")
 
 if __name__ == "__main__":
     # 示例调用
@@ -3,19 +3,39 @@
 Gemdale Slide Master Generator (updated)
 Creates a PowerPoint presentation template with consistent branding
 Changed: default slides reduced to 5 and page titles updated per user's request.
+
+The deck is built once per template version with a placeholder for the
+project name and cloned for every project (see pptx_gen_slide_master_cache).
 """
 
+import pptx
 from pptx import Presentation
 from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
+from pptx.enum.text import MSO_AUTO_SIZE, PP_ALIGN
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.dml.color import RGBColor
 from PIL import Image
+import io
 import os
+import re
+import zipfile
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
 
+try:
+    from .pipeline_stage_cache import file_digest
+    from .pptx_gen_slide_master_cache import cache_enabled, clone_deck, template_key, template_parts
+except ImportError:
+    from pipeline_stage_cache import file_digest
+    from pptx_gen_slide_master_cache import cache_enabled, clone_deck, template_key, template_parts
+
+TEMPLATE_VERSION = "1"  # bump whenever the slide design below changes
+PROJECT_NAME_TOKEN = "{{project_name}}"
+SLIDE_WIDTH = Inches(13.33)
+SLIDE_HEIGHT = Inches(7.5)
+_CONTROL_CHARS = re.compile(r"[\x00-\x1f\x7f]")  # python-pptx rewrites these when setting text
+
 
 def create_slide_with_header_footer(prs, slide, slide_num, total_slides, header_image_path=None):
     """
@@ -156,8 +176,8 @@ def create_gemdale_slide_master_template():
     prs = Presentation()
     
     # Set 16:9 aspect ratio (13.33" x 7.5")
-    prs.slide_width = Inches(13.33)
-    prs.slide_height = Inches(7.5)
+    prs.slide_width = SLIDE_WIDTH
+    prs.slide_height = SLIDE_HEIGHT
     
     return prs
 
@@ -237,12 +257,42 @@ def create_slides(prs, project_name: str, num_slides: int = 5, header_image_path
         title_para.font.bold = True
         
         # Ensure text fits properly in the frame
-        title_shape.text_frame.auto_size = True
+        title_shape.text_frame.auto_size = MSO_AUTO_SIZE.SHAPE_TO_FIT_TEXT
     
     return prs
 
 
-def run(project_name: str, header_image_path: str = None, num_slides: int = 5, output_file: str = None) -> Dict[str, Any]:
+def build_deck(project_name: str, num_slides: int = 5, header_image_path: str = None):
+    """Build the branded deck from scratch."""
+    prs = create_gemdale_slide_master_template()
+    return create_slides(prs, project_name=project_name, num_slides=num_slides, header_image_path=header_image_path)
+
+
+def cloned_deck_bytes(project_name: str, num_slides: int = 5, header_image_path: str = None,
+                      compression: int = zipfile.ZIP_STORED) -> bytes:
+    """
+    The deck for project_name cloned from the cached template (built on first use).
+
+    compression: ZIP_STORED for the in-memory deck session hand-off, ZIP_DEFLATED
+    when the package is written to disk as is.
+
+    Returns:
+    - bytes: .pptx package
+    """
+    key = template_key(TEMPLATE_VERSION, pptx.__version__, num_slides,
+                       file_digest(header_image_path) if header_image_path else None, datetime.now().year)
+
+    def build() -> bytes:
+        print("[INFO] Building slide master template (cached for later projects)")
+        buffer = io.BytesIO()
+        build_deck(PROJECT_NAME_TOKEN, num_slides, header_image_path).save(buffer)
+        return buffer.getvalue()
+
+    return clone_deck(template_parts(key, build), {PROJECT_NAME_TOKEN: project_name}, compression)
+
+
+def run(project_name: str, header_image_path: str = None, num_slides: int = 5, output_file: str = None,
+        session=None) -> Dict[str, Any]:
     """
     Run the slide master creation with a given project name and optional parameters.
     
@@ -251,14 +301,12 @@ def run(project_name: str, header_image_path: str = None, num_slides: int = 5, o
     - header_image_path: str, path to header image (optional)
     - num_slides: int, number of slides to create (default: 5)
     - output_file: str, output PPTX file path (optional)
+    - session: DeckSession, if given the deck is attached to the session and not saved here
     
     Returns:
     - dict: Contains the output file path and slide count
     """
     try:
-        # Create the base presentation
-        prs = create_gemdale_slide_master_template()
-        
         # Check for header image
         if header_image_path is None:
             header_image_path = "./resources/images/gemdale_header.png"
@@ -268,8 +316,15 @@ def run(project_name: str, header_image_path: str = None, num_slides: int = 5, o
             print(f"[INFO] No header image found, using placeholder: {header_image_path}")
             header_image_path = None
         
-        # Create slides with consistent branding
-        prs = create_slides(prs, project_name=project_name, num_slides=num_slides, header_image_path=header_image_path)
+        # Create slides with consistent branding (cloned from the cached template when possible)
+        if cache_enabled() and not _CONTROL_CHARS.search(project_name):
+            # 交给 deck session 的包只在内存中打开，不压缩；直接写盘的包按常规压缩
+            compression = zipfile.ZIP_STORED if session is not None else zipfile.ZIP_DEFLATED
+            deck_bytes = cloned_deck_bytes(project_name, num_slides, header_image_path, compression)
+            prs = None
+        else:
+            deck_bytes = None
+            prs = build_deck(project_name, num_slides, header_image_path)
         
         # Set output file path
         timestamp = datetime.now().strftime("%Y%m%d")
@@ -281,19 +336,24 @@ def run(project_name: str, header_image_path: str = None, num_slides: int = 5, o
             output_file = Path(output_file)
             output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Save the presentation
-        prs.save(output_file)
+        # Save the presentation (deck session mode defers saving to the pipeline)
+        if session is not None:
+            session.attach(prs if prs is not None else Presentation(io.BytesIO(deck_bytes)), output_file)
+        elif prs is not None:
+            prs.save(output_file)
+        else:
+            output_file.write_bytes(deck_bytes)
         
         print("[OK] Successfully created presentation template!")
         print(f"[FILE] {output_file}")
-        size_width = prs.slide_width // 914400
-        size_height = prs.slide_height // 914400
+        size_width = SLIDE_WIDTH // 914400
+        size_height = SLIDE_HEIGHT // 914400
         print(f"[SIZE] {size_width}x{size_height} inches (16:9)")
-        print(f"[SLIDES] {len(prs.slides)}")
+        print(f"[SLIDES] {num_slides}")
         
         return {
             "output_file": str(output_file),
-            "slide_count": len(prs.slides),
+            "slide_count": num_slides,
             "slide_size": f"{size_width}x{size_height} inches"
         }
     
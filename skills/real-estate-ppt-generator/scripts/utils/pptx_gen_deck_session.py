@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Deck session: keep one in-memory Presentation for the whole pipeline.
+
+The slide master step attaches the freshly built deck to the session, every
+pptx_gen_* step receives the shared ``prs`` object instead of re-opening the
+file, and the pipeline serializes the deck exactly once at the end.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class DeckSession:
+    """Holds the shared Presentation object and its target path."""
+
+    def __init__(self, pptx_path: Optional[str] = None):
+        """
+        Parameters:
+        - pptx_path: str, path the deck is loaded from / saved to (optional until attach)
+        """
+        self.pptx_path = str(pptx_path) if pptx_path else None
+        self._prs = None
+        self.save_count = 0
+
+    @property
+    def prs(self):
+        """Return the shared Presentation, loading it from disk on first use."""
+        if self._prs is None:
+            if not self.pptx_path or not os.path.exists(self.pptx_path):
+                raise FileNotFoundError(f"PPTX file not found: {self.pptx_path}")
+            from pptx import Presentation  # imported on first use; single-stage runs may never need it
+
+            self._prs = Presentation(self.pptx_path)
+        return self._prs
+
+    @property
+    def is_open(self) -> bool:
+        return self._prs is not None
+
+    def attach(self, prs, pptx_path: Optional[str] = None) -> None:
+        """Use an already built Presentation (e.g. from the slide master step)."""
+        self._prs = prs
+        if pptx_path:
+            self.pptx_path = str(pptx_path)
+
+    def save(self) -> Dict[str, Any]:
+        """
+        Serialize the shared deck once.
+
+        Returns:
+        - dict: {"success": bool, "output_file": str, "error": str (on failure)}
+        """
+        if self._prs is None:
+            msg = "deck session has no presentation to save"
+            print(f"[ERROR] {msg}")
+            return {"success": False, "output_file": self.pptx_path or "", "error": msg}
+        try:
+            output_file = Path(self.pptx_path)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            self._prs.save(str(output_file))
+            self.save_count += 1
+            print(f"[OK] Deck session saved: {output_file}")
+            return {"success": True, "output_file": str(output_file), "slide_count": len(self._prs.slides)}
+        except Exception as e:
+            print(f"[ERROR] Failed to save deck session: {e}")
+            return {"success": False, "output_file": self.pptx_path or "", "error": str(e)}
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prebuilt deck templates, cloned in memory per project.
+
+A template deck (the Gemdale master with its 5 branded slides) only depends
+on the template version, the header image and the slide count, so it is
+built once, with a placeholder token where the project name goes, and kept
+as its package parts (part name -> bytes):
+
+- in memory for the life of the process
+- on disk under ``resources/working_data/.cache/slide_master/<key>.pptx``
+  so other processes and later runs skip building it too
+
+Cloning writes a new package from the cached parts: parts without the token
+are copied byte for byte, and only the parts that contain it (the slide XML)
+get the project name. Parts are stored uncompressed, so a clone is a
+memory copy plus CRC. The pipeline compresses the deck when it saves the
+final file. Set ``SLIDE_MASTER_CACHE=off`` to build every deck from scratch.
+"""
+
+import hashlib
+import io
+import os
+import threading
+import zipfile
+from typing import Any, Callable, Dict
+from xml.sax.saxutils import escape
+
+DEFAULT_CACHE_DIR = os.path.join("resources", "working_data", ".cache", "slide_master")
+
+_parts: Dict[str, Dict[str, bytes]] = {}
+_lock = threading.Lock()
+
+
+def cache_enabled() -> bool:
+    return os.getenv("SLIDE_MASTER_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+
+def template_key(*components: Any) -> str:
+    """Cache key of a template from everything it depends on (version, inputs, options)."""
+    return hashlib.sha256("|".join(map(str, components)).encode("utf-8")).hexdigest()[:32]
+
+
+def _read_parts(data: bytes) -> Dict[str, bytes]:
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        return {info.filename: z.read(info.filename) for info in z.infolist()}
+
+
+def template_parts(key: str, build: Callable[[], bytes], cache_dir: str = DEFAULT_CACHE_DIR) -> Dict[str, bytes]:
+    """
+    Package parts of the template for key, building it with build() only on a cache miss.
+
+    Parameters:
+    - key: str, template_key() of the template
+    - build: callable returning the saved template deck as bytes
+
+    Returns:
+    - dict: part name -> bytes, in package order (shared; do not modify)
+    """
+    with _lock:
+        parts = _parts.get(key)
+        if parts is not None:
+            return parts
+        path = os.path.join(cache_dir, f"{key}.pptx")
+        data = None
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                parts = _read_parts(data)
+            except (OSError, zipfile.BadZipFile) as e:
+                print(f"[WARN] 模板缓存损坏，重新生成: {e}")
+                parts = None
+        if parts is None:
+            data = build()
+            parts = _read_parts(data)
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                print(f"[WARN] 模板缓存写入失败: {e}")
+        _parts[key] = parts
+        return parts
+
+
+def clone_deck(parts: Dict[str, bytes], replacements: Dict[str, str], compression: int = zipfile.ZIP_STORED) -> bytes:
+    """
+    A new .pptx from template parts with placeholder tokens replaced (XML-escaped) in the parts containing them.
+
+    Parameters:
+    - parts: dict, template_parts() result
+    - replacements: dict, token -> text
+    - compression: zipfile constant; ZIP_STORED (default) for packages that are only
+      opened in memory, ZIP_DEFLATED for packages written to disk
+
+    Returns:
+    - bytes: the deck package
+    """
+    encoded = [(token.encode("utf-8"), escape(text).encode("utf-8")) for token, text in replacements.items()]
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", compression) as z:
+        for name, data in parts.items():
+            if name.endswith(".xml"):
+                for token, text in encoded:
+                    if token in data:
+                        data = data.replace(token, text)
+            z.writestr(name, data)
+    return out.getvalue()
+
+
+def clear_memory_cache() -> None:
+    with _lock:
+        _parts.clear()
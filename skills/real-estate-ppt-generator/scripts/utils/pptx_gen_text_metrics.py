@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Measure and wrap text with font glyph advance tables.
+
+Same module as skills/pptx/scripts/text_metrics.py (the skills ship
+separately); keep the two in sync.
+
+PIL measures every string through FreeType layout, and word-by-word wrapping
+does that once per word. This module instead reads each font's horizontal
+advances once. It uses cmap + hmtx via fontTools, or PIL per character when
+fontTools is not installed. The advances are kept as an em-unit array indexed
+by code point (BMP). Strings are then measured and wrapped with plain array
+lookups against a cached per-(font, size) width table.
+
+Fonts are looked up by the name the presentation uses (Arial, Calibri,
+微软雅黑, 思源黑体, ...) in the process-wide font registry (pptx_gen_font_registry.py),
+which knows file, family and full names including those of .ttc faces.
+Characters the font has no glyph for are measured with an East Asian font,
+the way PowerPoint substitutes them. When no font file can be found, wide
+characters count as 1 em and all others as 0.55 em.
+
+Usage:
+    from .pptx_gen_text_metrics import get_measurer
+
+    measurer = get_measurer("微软雅黑", 12)
+    width_pt = measurer.width("项目名称 Project")
+    lines = measurer.wrap(text, max_width_pt)
+"""
+
+import re
+import unicodedata
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .pptx_gen_font_registry import find_face, load_image_font
+except ImportError:
+    from pptx_gen_font_registry import find_face, load_image_font
+
+TABLE_SIZE = 0x10000  # advances are tabulated for the Basic Multilingual Plane
+WIDE_EM = 1.0
+NARROW_EM = 0.55
+
+# Presentation font names -> other names (or font file name stems) of the same font
+FONT_ALIASES: Dict[str, List[str]] = {
+    "微软雅黑": ["Microsoft YaHei", "msyh"],
+    "microsoft yahei": ["msyh"],
+    "思源黑体": ["Source Han Sans SC", "SourceHanSansSC", "SourceHanSans", "Noto Sans CJK SC", "NotoSansCJK"],
+    "source han sans sc": ["SourceHanSansSC", "SourceHanSans", "NotoSansCJK"],
+    "noto sans cjk sc": ["NotoSansCJKsc", "NotoSansCJK", "SourceHanSans"],
+    "宋体": ["SimSun", "simsun"],
+    "黑体": ["SimHei", "simhei"],
+    "等线": ["DengXian", "Deng"],
+    "苹方": ["PingFang"],
+}
+# Tried in order for characters the requested font has no glyph for
+EAST_ASIAN_FALLBACKS = ("微软雅黑", "思源黑体", "等线", "苹方", "SimHei", "WenQuanYi Micro Hei",
+                        "Arial Unicode MS")
+BOLD_SUFFIXES = (" Bold", "-Bold", "bd")
+
+# Break opportunities: runs of spaces, words, and single East Asian characters
+_TOKENS = re.compile(r" +|[^ \u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]+|.", re.S)
+
+
+@lru_cache(maxsize=None)
+def find_font_face(font_name: str, bold: bool = False) -> Optional[Tuple[str, int]]:
+    """Get the font file and face index for a font name (bold face when asked and available).
+
+    Args:
+        font_name: Name of the font (e.g., 'Arial', 'Calibri', '微软雅黑')
+        bold: Look for the bold face first
+
+    Returns:
+        (path, face index within a .ttc collection), or None if not found
+    """
+    candidates = [font_name] + FONT_ALIASES.get(font_name.lower(), [])
+    if bold:
+        bold_candidates = [c + suffix for c in candidates for suffix in BOLD_SUFFIXES]
+        return find_face(bold_candidates, fuzzy=False) or find_font_face(font_name)
+    return find_face(candidates)
+
+
+def find_font(font_name: str, bold: bool = False) -> Optional[str]:
+    """Get the font file path for a font name, or None if not found."""
+    face = find_font_face(font_name, bold)
+    return face[0] if face else None
+
+
+def find_font_file(candidates: Iterable[str], fuzzy: bool = True) -> Optional[str]:
+    """First font file whose name matches a candidate exactly, then one that contains it."""
+    face = find_face(candidates, fuzzy)
+    return face[0] if face else None
+
+
+def _is_wide(code_point: int) -> bool:
+    return unicodedata.east_asian_width(chr(code_point)) in ("W", "F")
+
+
+@lru_cache(maxsize=None)
+def _heuristic_table() -> array:
+    """Advances (em) without any font file: wide characters 1 em, the rest 0.55 em."""
+    table = array("f", (WIDE_EM if _is_wide(cp) else NARROW_EM for cp in range(TABLE_SIZE)))
+    for cp in (0x200B, 0x200C, 0x200D, 0xFEFF):  # zero-width characters
+        table[cp] = 0.0
+    return table
+
+
+def _load_advances(path: str, index: int = 0) -> Dict[int, float]:
+    """Code point -> advance (em) of every character the font maps."""
+    try:
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        return _load_advances_pil(path, index)
+    font = TTFont(path, fontNumber=index, lazy=True)
+    try:
+        units_per_em = font["head"].unitsPerEm
+        metrics = font["hmtx"].metrics
+        cmap = font.getBestCmap() or {}
+        return {cp: metrics[glyph][0] / units_per_em for cp, glyph in cmap.items() if glyph in metrics}
+    finally:
+        font.close()
+
+
+def _load_advances_pil(path: str, index: int = 0) -> Dict[int, float]:
+    """PIL fallback: PIL cannot list the mapped characters, so only Latin and punctuation are measured."""
+    size = 1000
+    font = load_image_font(path, size, index)
+    advances = {cp: font.getlength(chr(cp)) / size for cp in range(0x20, 0x250)}
+    advances.update({cp: font.getlength(chr(cp)) / size for cp in range(0x2000, 0x2070)})
+    return advances
+
+
+@lru_cache(maxsize=None)
+def _em_table(face: Optional[Tuple[str, int]], fallback: Optional[Tuple[str, int]]) -> array:
+    """Fully resolved advances (em) per BMP code point: font, then East Asian fallback, then heuristic."""
+    table = array("f", _heuristic_table())
+    for font_face in (fallback, face):
+        if not font_face:
+            continue
+        path, index = font_face
+        try:
+            advances = _load_advances(path, index)
+        except Exception as e:
+            print(f"[WARN] 读取字体 {path} 失败: {e}")
+            continue
+        for cp, advance in advances.items():
+            if cp < TABLE_SIZE:
+                table[cp] = advance
+    return table
+
+
+@lru_cache(maxsize=None)
+def east_asian_fallback() -> Optional[Tuple[str, int]]:
+    """Font face used for characters the requested font does not cover."""
+    for name in EAST_ASIAN_FALLBACKS:
+        face = find_font_face(name)
+        if face:
+            return face
+    return None
+
+
+class TextMeasurer:
+    """Widths (points) of strings set in one font at one size."""
+
+    def __init__(self, font_name: str, size_pt: float, bold: bool = False):
+        self.font_name = font_name
+        self.size_pt = size_pt
+        self.face = find_font_face(font_name, bold)
+        self.font_path = self.face[0] if self.face else None
+        em = _em_table(self.face, east_asian_fallback())
+        self._widths = array("d", (advance * size_pt for advance in em))
+
+    def char_width(self, char: str) -> float:
+        cp = ord(char)
+        if cp < TABLE_SIZE:
+            return self._widths[cp]
+        return (WIDE_EM if _is_wide(cp) else NARROW_EM) * self.size_pt
+
+    def width(self, text: str) -> float:
+        """Advance width of text in points (no kerning)."""
+        try:
+            return sum(map(self._widths.__getitem__, map(ord, text)))
+        except IndexError:  # characters outside the BMP
+            return sum(map(self.char_width, text))
+
+    def wrap(self, text: str, max_width: float) -> List[str]:
+        """Greedy line breaking at spaces and East Asian characters; overlong words break anywhere.
+
+        Trailing spaces may hang past the margin, as in PowerPoint.
+        """
+        if not text or self.width(text) <= max_width:
+            return [text]
+
+        lines: List[str] = []
+        line, line_width = "", 0.0
+        spaces, spaces_width = "", 0.0
+        for token in _TOKENS.findall(text):
+            token_width = self.width(token)
+            if token[0] == " ":
+                if line or not lines:
+                    spaces, spaces_width = spaces + token, spaces_width + token_width
+                continue
+            if line and line_width + spaces_width + token_width > max_width:
+                lines.append(line)
+                line, line_width, spaces, spaces_width = "", 0.0, "", 0.0
+            if not line and token_width > max_width:
+                for char in token:
+                    char_width = self.char_width(char)
+                    if line and line_width + char_width > max_width:
+                        lines.append(line)
+                        line, line_width = "", 0.0
+                    line, line_width = line + char, line_width + char_width
+                continue
+            line, line_width = line + spaces + token, line_width + spaces_width + token_width
+            spaces, spaces_width = "", 0.0
+        if line or not lines:
+            lines.append(line)
+        return lines
+
+    def line_count(self, text: str, max_width: float) -> int:
+        """Lines text takes in a box max_width points wide (explicit line breaks included)."""
+        return sum(len(self.wrap(line, max_width)) for line in text.split("\n"))
+
+
+@lru_cache(maxsize=256)
+def get_measurer(font_name: str, size_pt: float, bold: bool = False) -> TextMeasurer:
+    """Shared measurer per (font, size, weight); font files are read once per process."""
+    return TextMeasurer(font_name, size_pt, bold)
+
+
+def text_width(text: str, font_name: str, size_pt: float, bold: bool = False) -> float:
+    """Width of text in points."""
+    return get_measurer(font_name, size_pt, bold).width(text)